@@ -4,12 +4,29 @@ Provides REST API endpoints for:
 - Data analysis reports
 - Interactive Q&A using spaCy NLP
 - Chart data generation
+
+Run ``python app.py`` for the development server. Under a multi-worker WSGI
+server use the factory, e.g. ``gunicorn -w 4 "app:create_app()"``; set
+``CENSUS_DATA_MMAP=1`` so that every worker memory-maps the same cached
+column files instead of holding a private copy of the datasets.
+
+Set ``CENSUS_TRACE=<path>`` to record startup and training spans; the Chrome
+trace and a summary table are written when the process exits.
 """
-from flask import Flask, jsonify, request
+import atexit
+import bisect
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import Flask, g, jsonify, request
+from werkzeug.datastructures import MultiDict
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
-import json
 from pathlib import Path
 import sys
 import io
@@ -26,32 +43,473 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.data_analysis import load_datasets, compute_district_metrics
 from src.ml_models import MLModelManager, train_all_models
+from src.model_registry import ModelRegistry, training_key
+from src.lookup_index import DistrictLookupIndex
+from src.aggregation_cube import build_district_cube
+from src.downsampling import grid_downsample
+from src.qa_engine import QAEngine
+from src import tracing
+from src.tracing import span, traced
+from src.query_engine import (
+    QUESTION_BANK, QUESTIONS_BY_ID, QueryEngine, QuerySpecError, normalise_question_id, parse_query, table_to_dict
+)
 
 app = Flask(__name__)
 CORS(app)
 
+if tracing.is_enabled():
+    atexit.register(tracing.finish)
+
 # Global data storage
 data_bundle = None
 district_metrics = None
+district_index = None
+district_cube = None
+qa_engine = None
+query_engine = None
+question_results = None
+question_results_lock = threading.Lock()
 ml_manager = None
 ml_results = None
+model_registry = None
+model_key = None
+
+
+class TrainingStatus:
+    """Thread-safe progress record for the background model training job."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = 'pending'  # pending -> training -> ready | failed
+        self.current_job = None
+        self.completed_jobs = 0
+        self.total_jobs = 0
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.source = None  # 'registry' or 'training' once ready
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def update(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def progress(self, job, completed, total):
+        """``train_all_models`` progress callback."""
+        self.update(current_job=job, completed_jobs=completed, total_jobs=total)
+
+    def snapshot(self):
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                'state': self.state,
+                'current_job': self.current_job,
+                'completed_jobs': self.completed_jobs,
+                'total_jobs': self.total_jobs,
+                'progress': (self.completed_jobs / self.total_jobs) if self.total_jobs else 0.0,
+                'elapsed_seconds': round(end - self.started_at, 2) if self.started_at else None,
+                'source': self.source,
+                'error': self.error
+            }
+
+
+training_status = TrainingStatus()
+
+
+class CachedResponse:
+    """A serialized response body plus its strong ETag."""
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+
+class ResponseCache:
+    """LRU cache of serialized GET responses.
+    
+    Entries are keyed by route, query arguments and the version of what the
+    response was computed from: ``data`` responses by the data version, ``ml``
+    responses by the data and model versions. Bumping a version (on reload or
+    retrain) drops the entries that depended on it.
+    """
+
+    def __init__(self, max_entries=512):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+        self.versions = {'data': 0, 'ml': 0}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, scope, path, args):
+        versions = (self.versions['data'],) if scope == 'data' else (self.versions['data'], self.versions['ml'])
+        return (scope, versions, path, tuple(sorted(args.items(multi=True))))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope):
+        """Bump ``scope``'s version; ``data`` also invalidates ``ml`` entries."""
+        with self._lock:
+            self.versions[scope] += 1
+            scopes = ('data', 'ml') if scope == 'data' else ('ml',)
+            for key in [key for key in self._entries if key[0] in scopes]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'versions': dict(self.versions)
+            }
+
+
+response_cache = ResponseCache()
+
+def cached_response(scope='data'):
+    """Serve a GET endpoint from ``response_cache`` with a strong ETag.
+    
+    Only 200 responses are cached, so 503s while models train and error
+    responses are always recomputed. ``If-None-Match`` is answered with 304.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = response_cache.key(scope, request.path, request.args)
+            return serve_cached(key, lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
+
+def serve_cached(key, produce):
+    """Answer from ``response_cache`` under ``key``, calling ``produce`` on a miss."""
+    entry = response_cache.get(key)
+    g.response_cache_hit = entry is not None
+    if entry is None:
+        response = app.make_response(produce())
+        if response.status_code != 200:
+            return response
+        entry = CachedResponse(response.get_data(), response.mimetype)
+        response_cache.put(key, entry)
+    response = app.response_class(entry.body, mimetype=entry.mimetype)
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+# Fixed histogram bounds: latency in seconds, payload sizes in bytes.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Counts of observations per fixed bucket, plus their sum and count."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # the last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
 
+    def quantile(self, q):
+        """Estimate the ``q`` quantile by interpolating within its bucket.
+        
+        Same estimate as Prometheus' ``histogram_quantile``; values in the
+        +Inf bucket are reported as the largest finite bound.
+        """
+        rank = q * self.count
+        cumulative = 0
+        for position, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if position == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[position - 1] if position else 0.0
+                upper = self.bounds[position]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return float('nan')
+
+
+class RouteMetrics:
+    """Counters and histograms for one (route, method) pair."""
+
+    def __init__(self):
+        self.statuses = {}
+        self.errors = 0
+        self.request_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_size = Histogram(PAYLOAD_BUCKETS)
+
+
+def _prometheus_labels(**labels):
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _prometheus_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class RequestMetrics:
+    """Per-route request counts, errors, payload sizes and latency histograms.
+    
+    Routes are keyed by their URL rule (``/api/state/<state_name>``), not the
+    concrete path, so the number of series stays bounded. A request counts as
+    an error when it answers with a 5xx status. Each process keeps its own
+    counters, so under a multi-worker server every worker reports separately.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, route, method, status, seconds, request_bytes, response_bytes, cache_hit=None):
+        with self._lock:
+            metrics = self._routes.get((route, method))
+            if metrics is None:
+                metrics = self._routes[(route, method)] = RouteMetrics()
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            if status >= 500:
+                metrics.errors += 1
+            metrics.request_bytes += request_bytes
+            metrics.latency.observe(seconds)
+            metrics.response_size.observe(response_bytes)
+            if cache_hit is not None:
+                if cache_hit:
+                    metrics.cache_hits += 1
+                else:
+                    metrics.cache_misses += 1
+
+    def render_prometheus(self, cache_stats):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(f'{sample_name}{labels} {_prometheus_value(value)}' for sample_name, labels, value in samples)
+
+        def histogram_samples(name, attribute):
+            for (route, method), metrics in routes:
+                histogram = getattr(metrics, attribute)
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else _prometheus_value(bound)
+                    yield f'{name}_bucket', _prometheus_labels(route=route, method=method, le=le), cumulative
+                yield f'{name}_sum', _prometheus_labels(route=route, method=method), histogram.sum
+                yield f'{name}_count', _prometheus_labels(route=route, method=method), histogram.count
+
+        with self._lock:
+            routes = sorted(self._routes.items())
+            family('census_http_requests_total', 'counter', 'Requests handled, by route, method and status code.', [
+                ('census_http_requests_total', _prometheus_labels(route=route, method=method, status=status), count)
+                for (route, method), metrics in routes for status, count in sorted(metrics.statuses.items())
+            ])
+            family('census_http_request_errors_total', 'counter', 'Requests answered with a 5xx status.', [
+                ('census_http_request_errors_total', _prometheus_labels(route=route, method=method), metrics.errors)
+                for (route, method), metrics in routes
+            ])
+            family('census_http_request_duration_seconds', 'histogram', 'Request latency in seconds.',
+                   histogram_samples('census_http_request_duration_seconds', 'latency'))
+            family('census_http_request_duration_quantile_seconds', 'gauge',
+                   'p50/p95/p99 request latency estimated from the latency histogram.', [
+                ('census_http_request_duration_quantile_seconds',
+                 _prometheus_labels(route=route, method=method, quantile=quantile), metrics.latency.quantile(quantile))
+                for (route, method), metrics in routes for quantile in LATENCY_QUANTILES
+            ])
+            family('census_http_response_size_bytes', 'histogram', 'Response body size in bytes.',
+                   histogram_samples('census_http_response_size_bytes', 'response_size'))
+            family('census_http_request_size_bytes_total', 'counter', 'Request body bytes received.', [
+                ('census_http_request_size_bytes_total', _prometheus_labels(route=route, method=method), metrics.request_bytes)
+                for (route, method), metrics in routes
+            ])
+            family('census_http_response_cache_lookups_total', 'counter', 'Response cache lookups, by route and result.', [
+                ('census_http_response_cache_lookups_total', _prometheus_labels(route=route, method=method, result=result), count)
+                for (route, method), metrics in routes if metrics.cache_hits or metrics.cache_misses
+                for result, count in (('hit', metrics.cache_hits), ('miss', metrics.cache_misses))
+            ])
+
+        family('census_response_cache_hits_total', 'counter', 'Response cache hits.',
+               [('census_response_cache_hits_total', '', cache_stats['hits'])])
+        family('census_response_cache_misses_total', 'counter', 'Response cache misses.',
+               [('census_response_cache_misses_total', '', cache_stats['misses'])])
+        family('census_response_cache_hit_ratio', 'gauge', 'Share of response cache lookups that were hits.',
+               [('census_response_cache_hit_ratio', '', cache_stats['hit_rate'])])
+        family('census_response_cache_entries', 'gauge', 'Responses currently cached.',
+               [('census_response_cache_entries', '', cache_stats['entries'])])
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record the finished request in ``request_metrics``."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        request_metrics.observe(
+            request.url_rule.rule if request.url_rule is not None else '<unmatched>',
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            request.content_length or 0,
+            response.calculate_content_length() or 0,
+            g.get('response_cache_hit')
+        )
+    return response
+
+@app.teardown_request
+def record_unhandled_error(exc):
+    """Count requests whose exception escaped the view (after_request never ran)."""
+    started = g.pop('request_started', None)
+    if started is not None and exc is not None:
+        request_metrics.observe(
+            request.url_rule.rule if request.url_rule is not None else '<unmatched>',
+            request.method, 500, time.perf_counter() - started, request.content_length or 0, 0
+        )
+
+def get_model_registry_dir(data_dir):
+    """Model registry location (``CENSUS_MODEL_REGISTRY`` or ``<data>/.cache/models``)."""
+    configured = os.environ.get('CENSUS_MODEL_REGISTRY')
+    return Path(configured) if configured else data_dir / '.cache' / 'models'
+
+def get_training_parallelism():
+    """(process-pool workers, estimator n_jobs) from ``CENSUS_TRAINING_WORKERS``/``CENSUS_MODEL_N_JOBS``."""
+    workers = os.environ.get('CENSUS_TRAINING_WORKERS')
+    n_jobs = os.environ.get('CENSUS_MODEL_N_JOBS')
+    return (int(workers) if workers else None), (int(n_jobs) if n_jobs else None)
+
+def use_mmap_datasets():
+    """Whether datasets should be memory-mapped from the shared column cache."""
+    return os.environ.get('CENSUS_DATA_MMAP', '').lower() in ('1', 'true', 'yes')
+
+@traced()
 def initialize_data():
     """Load datasets on startup."""
-    global data_bundle, district_metrics, ml_manager, ml_results
+    global data_bundle, district_metrics, district_index, district_cube, qa_engine, query_engine, question_results, model_registry, model_key
     try:
         data_dir = Path(__file__).parent.parent
-        data_bundle = load_datasets(data_dir)
+        data_bundle = load_datasets(data_dir, mmap=use_mmap_datasets())
         district_metrics = compute_district_metrics(data_bundle.district)
+        with span('build_lookup_index'):
+            district_index = DistrictLookupIndex(district_metrics)
+        with span('build_district_cube'):
+            district_cube = build_district_cube(district_metrics)
+        with span('build_qa_engine'):
+            qa_engine = QAEngine(district_metrics, district_cube)
+        # Housing is only loaded once a query needs it
+        query_engine = QueryEngine(housing_df=lambda: data_bundle.housing, district_cube=district_cube)
+        question_results = None
+        response_cache.invalidate('data')
         print("✓ Data loaded successfully")
-        
-        # Train ML models
-        print("⏳ Training ML models...")
-        ml_results, ml_manager = train_all_models(district_metrics)
-        print("✓ ML models trained successfully")
+        if data_bundle.memory_report is not None:
+            print(data_bundle.memory_report.to_string(index=False))
     except Exception as e:
         print(f"✗ Error loading data: {e}")
         raise
+    
+    model_registry = ModelRegistry(get_model_registry_dir(data_dir))
+    model_key = training_key(district_metrics)
+    if not load_models_from_registry():
+        start_model_training()
+
+@traced()
+def load_models_from_registry():
+    """Warm-start from a saved model set matching the current data and settings."""
+    global ml_manager, ml_results
+    loaded = model_registry.load(model_key)
+    if loaded is None:
+        return False
+    ml_results, ml_manager = loaded
+    response_cache.invalidate('ml')
+    now = time.time()
+    training_status.update(
+        state='ready', source='registry', started_at=now, finished_at=now,
+        completed_jobs=len(ml_results), total_jobs=len(ml_results)
+    )
+    print(f"✓ ML models loaded from registry ({model_key})")
+    return True
+
+def train_models_in_background():
+    """Train ML models; publishes ``ml_results``/``ml_manager`` when done."""
+    global ml_manager, ml_results
+    training_status.update(state='training', started_at=time.time(), finished_at=None, error=None)
+    print("⏳ Training ML models in the background...")
+    try:
+        max_workers, n_jobs = get_training_parallelism()
+        results, manager = train_all_models(
+            district_metrics,
+            progress_callback=training_status.progress,
+            max_workers=max_workers,
+            n_jobs=n_jobs
+        )
+    except Exception as e:
+        training_status.update(state='failed', error=str(e), finished_at=time.time())
+        print(f"✗ Error training ML models: {e}")
+        return
+    ml_manager = manager
+    ml_results = results
+    response_cache.invalidate('ml')
+    training_status.update(state='ready', source='training', current_job=None, finished_at=time.time())
+    print("✓ ML models trained successfully")
+    try:
+        model_registry.save(model_key, results, manager)
+        model_registry.prune(keep=3)
+    except OSError as e:
+        print(f"✗ Could not save models to the registry: {e}")
+
+def start_model_training():
+    """Start model training on a daemon thread so the API can serve data immediately."""
+    worker = threading.Thread(target=train_models_in_background, name='ml-training', daemon=True)
+    worker.start()
+    return worker
+
+def ml_not_ready_response():
+    """503 response carrying training progress for ``/api/ml/*`` endpoints."""
+    response = jsonify({
+        'error': 'ML models not trained yet',
+        'training': training_status.snapshot()
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '5'
+    return response
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -61,29 +519,59 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: data endpoints can serve once datasets are loaded.
+    
+    Model training progress is reported alongside but does not gate readiness;
+    ``/api/ml/*`` endpoints answer 503 on their own until models are ready.
+    """
+    data_ready = district_metrics is not None
+    return jsonify({
+        'ready': data_ready,
+        'data_loaded': data_ready,
+        'models_ready': training_status.ready,
+        'training': training_status.snapshot()
+    }), (200 if data_ready else 503)
+
+@app.route('/api/ml/status', methods=['GET'])
+def get_ml_status():
+    """Get background model training progress."""
+    return jsonify(training_status.snapshot())
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Per-route request and response cache metrics in Prometheus text format."""
+    return app.response_class(
+        request_metrics.render_prometheus(response_cache.stats()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
 @app.route('/api/overview', methods=['GET'])
+@cached_response('data')
 def get_overview():
     """Get overview statistics of the datasets."""
     try:
         district_df = data_bundle.district
-        housing_df = data_bundle.housing
+        # Shape comes from cache/CSV metadata; the housing frame itself is never needed here.
+        housing_rows, housing_columns = data_bundle.housing_shape
         
         overview = {
             'district_data': {
                 'total_rows': int(district_df.shape[0]),
                 'total_columns': int(district_df.shape[1]),
-                'total_population': int(district_df['Population'].sum()),
+                'total_population': int(district_cube.total('Population')),
                 'total_states': int(district_df['State name'].nunique()),
                 'total_districts': int(district_df['District name'].nunique())
             },
             'housing_data': {
-                'total_rows': int(housing_df.shape[0]),
-                'total_columns': int(housing_df.shape[1])
+                'total_rows': int(housing_rows),
+                'total_columns': int(housing_columns)
             },
             'key_metrics': {
-                'avg_literacy_rate': float(district_metrics['Literacy_Rate'].mean()),
-                'avg_sex_ratio': float(district_metrics['Sex_Ratio'].mean()),
-                'avg_urbanisation': float(district_metrics['Urbanisation_Rate'].mean())
+                'avg_literacy_rate': float(district_cube.overall_mean('Literacy_Rate')),
+                'avg_sex_ratio': float(district_cube.overall_mean('Sex_Ratio')),
+                'avg_urbanisation': float(district_cube.overall_mean('Urbanisation_Rate'))
             }
         }
         
@@ -92,14 +580,15 @@ def get_overview():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/demographics', methods=['GET'])
+@cached_response('data')
 def get_demographics():
     """Get demographic analysis data."""
     try:
         # Top 10 states by population
-        top_states = district_metrics.groupby('State name')['Population'].sum().nlargest(10)
+        top_states = district_cube.sum('state', 'Population').nlargest(10)
         
         # Sex ratio by state
-        sex_ratio_by_state = district_metrics.groupby('State name')['Sex_Ratio'].mean().sort_values(ascending=False).head(15)
+        sex_ratio_by_state = district_cube.mean('state', 'Sex_Ratio').sort_values(ascending=False).head(15)
         
         # Literacy rate distribution
         literacy_bins = pd.cut(district_metrics['Literacy_Rate'], bins=[0, 50, 70, 85, 100])
@@ -125,6 +614,7 @@ def get_demographics():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/housing', methods=['GET'])
+@cached_response('data')
 def get_housing():
     """Get housing and infrastructure analysis data."""
     try:
@@ -139,14 +629,14 @@ def get_housing():
         asset_data = {}
         for col in asset_columns:
             if col in district_metrics.columns:
-                rate = (district_metrics[col].sum() / district_metrics['Households'].sum()) * 100
+                rate = (district_cube.total(col) / district_cube.total('Households')) * 100
                 asset_data[col.replace('Households_with_', '')] = float(rate)
         
         # Sanitation facilities
-        sanitation_avg = float(100 - district_metrics['Sanitation_Gap'].mean())
+        sanitation_avg = float(100 - district_cube.overall_mean('Sanitation_Gap'))
         
         # Urbanisation by state
-        urban_by_state = district_metrics.groupby('State name')['Urbanisation_Rate'].mean().sort_values(ascending=False).head(10)
+        urban_by_state = district_cube.mean('state', 'Urbanisation_Rate').sort_values(ascending=False).head(10)
         
         housing = {
             'asset_access': asset_data,
@@ -162,18 +652,19 @@ def get_housing():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/workforce', methods=['GET'])
+@cached_response('data')
 def get_workforce():
     """Get workforce and economic analysis data."""
     try:
         # Worker participation by state
-        worker_by_state = district_metrics.groupby('State name')['Worker_Participation_Rate'].mean().sort_values(ascending=False).head(15)
+        worker_by_state = district_cube.mean('state', 'Worker_Participation_Rate').sort_values(ascending=False).head(15)
         
         # Literacy vs workforce correlation
         literacy_workforce_corr = float(district_metrics[['Literacy_Rate', 'Worker_Participation_Rate']].corr().iloc[0, 1])
         
         # Male vs Female workers
-        total_male_workers = int(district_metrics['Male_Workers'].sum())
-        total_female_workers = int(district_metrics['Female_Workers'].sum())
+        total_male_workers = int(district_cube.total('Male_Workers'))
+        total_female_workers = int(district_cube.total('Female_Workers'))
         
         workforce = {
             'worker_participation_by_state': {
@@ -191,51 +682,75 @@ def get_workforce():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+SCATTER_POINT_BUDGET = 200
+MAX_SCATTER_POINTS = 5000
+
+def build_plotly_figure(chart_type, points=SCATTER_POINT_BUDGET):
+    """Build the Plotly figure for ``chart_type``; ``None`` for unknown types."""
+    if chart_type == 'population_map':
+        # Top states population
+        top_states = district_cube.sum('state', 'Population').nlargest(15).reset_index()
+        fig = px.bar(top_states, x='State name', y='Population', 
+                    title='Top 15 States by Population',
+                    labels={'Population': 'Total Population', 'State name': 'State'})
+        fig.update_layout(xaxis_tickangle=-45)
+        
+    elif chart_type == 'literacy_scatter':
+        # Literacy vs Worker Participation
+        # Deterministic grid downsample that keeps the extremes of both axes
+        positions = grid_downsample(
+            district_metrics['Literacy_Rate'].to_numpy(),
+            district_metrics['Worker_Participation_Rate'].to_numpy(),
+            budget=points
+        )
+        sample_data = district_metrics.iloc[positions]
+        fig = px.scatter(sample_data, x='Literacy_Rate', y='Worker_Participation_Rate',
+                       color='Urbanisation_Rate', size='Population',
+                       hover_data=['District name', 'State name'],
+                       title='Literacy Rate vs Worker Participation',
+                       labels={'Literacy_Rate': 'Literacy Rate (%)', 
+                              'Worker_Participation_Rate': 'Worker Participation Rate (%)',
+                              'Urbanisation_Rate': 'Urbanisation Rate (%)'})
+        
+    elif chart_type == 'sex_ratio_box':
+        # Sex ratio distribution by region
+        top_states = district_cube.sum('state', 'Population').nlargest(10).index
+        filtered_data = district_metrics[district_metrics['State name'].isin(top_states)]
+        fig = px.box(filtered_data, x='State name', y='Sex_Ratio',
+                    title='Sex Ratio Distribution by Top 10 States',
+                    labels={'Sex_Ratio': 'Sex Ratio (Females per 1000 Males)', 'State name': 'State'})
+        fig.update_layout(xaxis_tickangle=-45)
+        
+    elif chart_type == 'urbanisation_pie':
+        # Urban vs Rural households
+        urban = district_cube.total('Urban_Households')
+        rural = district_cube.total('Rural_Households')
+        fig = go.Figure(data=[go.Pie(labels=['Urban', 'Rural'], 
+                                    values=[urban, rural],
+                                    hole=0.3)])
+        fig.update_layout(title='Urban vs Rural Households Distribution')
+        
+    else:
+        return None
+    
+    return fig
+
 @app.route('/api/charts/plotly/<chart_type>', methods=['GET'])
+@cached_response('data')
 def get_plotly_chart(chart_type):
-    """Generate Plotly charts for interactive visualization."""
+    """Generate Plotly charts for interactive visualization.
+    
+    The figure JSON from ``fig.to_json`` is sent as-is (Plotly picks orjson
+    when it is installed) and cached per chart type and data version.
+    ``?points=N`` sets the point budget of ``literacy_scatter``.
+    """
     try:
-        if chart_type == 'population_map':
-            # Top states population
-            top_states = district_metrics.groupby('State name')['Population'].sum().nlargest(15).reset_index()
-            fig = px.bar(top_states, x='State name', y='Population', 
-                        title='Top 15 States by Population',
-                        labels={'Population': 'Total Population', 'State name': 'State'})
-            fig.update_layout(xaxis_tickangle=-45)
-            
-        elif chart_type == 'literacy_scatter':
-            # Literacy vs Worker Participation
-            sample_data = district_metrics.sample(min(200, len(district_metrics)))
-            fig = px.scatter(sample_data, x='Literacy_Rate', y='Worker_Participation_Rate',
-                           color='Urbanisation_Rate', size='Population',
-                           hover_data=['District name', 'State name'],
-                           title='Literacy Rate vs Worker Participation',
-                           labels={'Literacy_Rate': 'Literacy Rate (%)', 
-                                  'Worker_Participation_Rate': 'Worker Participation Rate (%)',
-                                  'Urbanisation_Rate': 'Urbanisation Rate (%)'})
-            
-        elif chart_type == 'sex_ratio_box':
-            # Sex ratio distribution by region
-            top_states = district_metrics.groupby('State name')['Population'].sum().nlargest(10).index
-            filtered_data = district_metrics[district_metrics['State name'].isin(top_states)]
-            fig = px.box(filtered_data, x='State name', y='Sex_Ratio',
-                        title='Sex Ratio Distribution by Top 10 States',
-                        labels={'Sex_Ratio': 'Sex Ratio (Females per 1000 Males)', 'State name': 'State'})
-            fig.update_layout(xaxis_tickangle=-45)
-            
-        elif chart_type == 'urbanisation_pie':
-            # Urban vs Rural households
-            urban = district_metrics['Urban_Households'].sum()
-            rural = district_metrics['Rural_Households'].sum()
-            fig = go.Figure(data=[go.Pie(labels=['Urban', 'Rural'], 
-                                        values=[urban, rural],
-                                        hole=0.3)])
-            fig.update_layout(title='Urban vs Rural Households Distribution')
-            
-        else:
+        points = min(max(request.args.get('points', SCATTER_POINT_BUDGET, type=int), 1), MAX_SCATTER_POINTS)
+        fig = build_plotly_figure(chart_type, points=points)
+        if fig is None:
             return jsonify({'error': 'Invalid chart type'}), 400
         
-        return jsonify(json.loads(fig.to_json()))
+        return app.response_class(fig.to_json(), mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -249,127 +764,84 @@ def question_answer():
         if not question:
             return jsonify({'error': 'Question is required'}), 400
         
-        # Simple keyword-based Q&A system (can be enhanced with spaCy NER and dependency parsing)
+        # Tokenized intent matching (spaCy lemmas when available) over precomputed answers
         response = process_question(question)
         
         return jsonify(response)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def process_question(question):
-    """Process natural language questions about the dataset."""
-    
-    # Keywords for different types of queries
-    population_keywords = ['population', 'people', 'inhabitants', 'residents']
-    literacy_keywords = ['literacy', 'literate', 'education', 'educated']
-    state_keywords = ['state', 'states', 'top states', 'which state']
-    worker_keywords = ['worker', 'workers', 'employment', 'workforce', 'working']
-    housing_keywords = ['housing', 'house', 'homes', 'households']
-    internet_keywords = ['internet', 'connectivity', 'online']
-    urban_keywords = ['urban', 'city', 'cities', 'urbanisation', 'urbanization']
-    
-    response = {
-        'answer': '',
-        'type': 'text',  # 'text', 'table', or 'chart'
-        'data': None
-    }
-    
-    # Total population queries
-    if any(kw in question for kw in population_keywords) and 'total' in question:
-        total_pop = district_metrics['Population'].sum()
-        response['answer'] = f"The total population across all districts is {total_pop:,}."
-        response['type'] = 'text'
-    
-    # Top states by population
-    elif any(kw in question for kw in population_keywords) and any(kw in question for kw in state_keywords):
-        top_states = district_metrics.groupby('State name')['Population'].sum().nlargest(10)
-        response['answer'] = "Here are the top 10 states by population:"
-        response['type'] = 'table'
-        response['data'] = {
-            'headers': ['State', 'Population'],
-            'rows': [[state, f"{pop:,}"] for state, pop in top_states.items()]
-        }
-    
-    # Literacy rate queries
-    elif any(kw in question for kw in literacy_keywords):
-        if 'highest' in question or 'top' in question:
-            top_literacy = district_metrics.nlargest(10, 'Literacy_Rate')[['District name', 'State name', 'Literacy_Rate']]
-            response['answer'] = "Districts with highest literacy rates:"
-            response['type'] = 'table'
-            response['data'] = {
-                'headers': ['District', 'State', 'Literacy Rate (%)'],
-                'rows': [[row['District name'], row['State name'], f"{row['Literacy_Rate']:.2f}"] 
-                        for _, row in top_literacy.iterrows()]
-            }
-        elif 'average' in question or 'mean' in question:
-            avg_literacy = district_metrics['Literacy_Rate'].mean()
-            response['answer'] = f"The average literacy rate across all districts is {avg_literacy:.2f}%."
-            response['type'] = 'text'
-        else:
-            avg_literacy = district_metrics['Literacy_Rate'].mean()
-            response['answer'] = f"The average literacy rate is {avg_literacy:.2f}%. The literacy rate ranges from {district_metrics['Literacy_Rate'].min():.2f}% to {district_metrics['Literacy_Rate'].max():.2f}%."
-            response['type'] = 'text'
-    
-    # Worker/employment queries
-    elif any(kw in question for kw in worker_keywords):
-        if 'male' in question and 'female' in question:
-            male_workers = district_metrics['Male_Workers'].sum()
-            female_workers = district_metrics['Female_Workers'].sum()
-            response['answer'] = f"Total male workers: {male_workers:,}\nTotal female workers: {female_workers:,}\nGender ratio: {(female_workers/male_workers)*100:.2f}% (female to male)"
-            response['type'] = 'text'
-        else:
-            avg_participation = district_metrics['Worker_Participation_Rate'].mean()
-            response['answer'] = f"The average worker participation rate is {avg_participation:.2f}%."
-            response['type'] = 'text'
-    
-    # Internet connectivity queries
-    elif any(kw in question for kw in internet_keywords):
-        internet_households = district_metrics['Households_with_Internet'].sum()
-        total_households = district_metrics['Households'].sum()
-        internet_rate = (internet_households / total_households) * 100
-        response['answer'] = f"Internet penetration: {internet_rate:.2f}% of households have internet access ({internet_households:,} out of {total_households:,} households)."
-        response['type'] = 'text'
+def get_question_results():
+    """Evaluate the whole question bank once per data load (loads housing on first use)."""
+    global question_results
+    with question_results_lock:
+        if question_results is None:
+            question_results = query_engine.run()
+        return question_results
+
+@app.route('/api/questions', methods=['GET'])
+@cached_response('data')
+def list_questions():
+    """List the question bank with the kind of answer each question has."""
+    return jsonify({
+        'questions': [
+            {'id': spec.id, 'question': spec.question, 'output': spec.output, 'kind': spec.kind}
+            for spec in QUESTION_BANK
+        ]
+    })
+
+@app.route('/api/questions/<question_id>', methods=['GET'])
+@cached_response('data')
+def get_question(question_id):
+    """Answer one question-bank entry from the precomputed results."""
+    try:
+        question_id = normalise_question_id(question_id)
+        if question_id not in QUESTIONS_BY_ID:
+            return jsonify({'error': 'Question not found'}), 404
+        
+        return jsonify(get_question_results()[question_id].to_dict())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/query', methods=['GET', 'POST'])
+def run_query():
+    """Run an ad-hoc aggregation spec (JSON body, or ``?spec=<json>`` on GET).
     
-    # Urbanisation queries
-    elif any(kw in question for kw in urban_keywords):
-        if 'state' in question:
-            urban_by_state = district_metrics.groupby('State name')['Urbanisation_Rate'].mean().sort_values(ascending=False).head(10)
-            response['answer'] = "Top 10 states by urbanisation rate:"
-            response['type'] = 'table'
-            response['data'] = {
-                'headers': ['State', 'Urbanisation Rate (%)'],
-                'rows': [[state, f"{rate:.2f}"] for state, rate in urban_by_state.items()]
-            }
+    The spec names the dataset, dimensions (state/district/rural_urban),
+    measures (sum/mean/rate/share/count), filters, sort and limit; see
+    ``src.query_engine.parse_query``. Results are cached by normalized spec.
+    """
+    try:
+        if request.method == 'POST':
+            spec = request.get_json(silent=True)
         else:
-            avg_urban = district_metrics['Urbanisation_Rate'].mean()
-            response['answer'] = f"The average urbanisation rate is {avg_urban:.2f}%."
-            response['type'] = 'text'
-    
-    # Housing queries
-    elif any(kw in question for kw in housing_keywords):
-        total_households = district_metrics['Households'].sum()
-        response['answer'] = f"Total households in the dataset: {total_households:,}"
-        response['type'] = 'text'
+            spec = json.loads(request.args.get('spec', '{}'))
+        query = parse_query(spec)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Number of states/districts
-    elif 'how many' in question:
-        if 'state' in question:
-            num_states = district_metrics['State name'].nunique()
-            response['answer'] = f"The dataset covers {num_states} states/union territories."
-            response['type'] = 'text'
-        elif 'district' in question:
-            num_districts = district_metrics['District name'].nunique()
-            response['answer'] = f"The dataset covers {num_districts} districts."
-            response['type'] = 'text'
+    def produce():
+        try:
+            table = query_engine.run_adhoc(query)
+        except QuerySpecError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+        return jsonify({'query': json.loads(query.normalized()), 'row_count': len(table), **table_to_dict(table)})
     
-    # Default response
-    else:
-        response['answer'] = "I can help you with questions about:\n• Population statistics\n• Literacy rates\n• Worker participation\n• Internet connectivity\n• Urbanisation rates\n• Housing data\n\nTry asking: 'What is the total population?' or 'Which states have the highest literacy rate?'"
-        response['type'] = 'text'
+    key = response_cache.key('data', request.path, MultiDict({'spec': query.normalized()}))
+    return serve_cached(key, produce)
+
+def process_question(question):
+    """Process natural language questions about the dataset.
     
-    return response
+    Matching and answers come from the precomputed ``qa_engine``; no
+    aggregation runs per question.
+    """
+    return qa_engine.answer(question)
 
 @app.route('/api/states', methods=['GET'])
+@cached_response('data')
 def get_states():
     """Get list of all states."""
     try:
@@ -379,21 +851,26 @@ def get_states():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/state/<state_name>', methods=['GET'])
+@cached_response('data')
 def get_state_details(state_name):
     """Get detailed information about a specific state."""
     try:
-        state_data = district_metrics[district_metrics['State name'] == state_name]
+        resolved = district_index.resolve_state(state_name)
         
-        if state_data.empty:
-            return jsonify({'error': 'State not found'}), 404
+        if resolved is None:
+            return jsonify({
+                'error': 'State not found',
+                'suggestions': [name for name, _ in district_index.states.similar(state_name, min_similarity=0.2)]
+            }), 404
         
+        state_data = district_index.state_frame(resolved)
         details = {
-            'state_name': state_name,
+            'state_name': resolved,
             'total_districts': int(state_data['District name'].nunique()),
-            'total_population': int(state_data['Population'].sum()),
-            'avg_literacy_rate': float(state_data['Literacy_Rate'].mean()),
-            'avg_sex_ratio': float(state_data['Sex_Ratio'].mean()),
-            'avg_urbanisation': float(state_data['Urbanisation_Rate'].mean()),
+            'total_population': int(district_cube.sum('state', 'Population')[resolved]),
+            'avg_literacy_rate': float(district_cube.mean('state', 'Literacy_Rate')[resolved]),
+            'avg_sex_ratio': float(district_cube.mean('state', 'Sex_Ratio')[resolved]),
+            'avg_urbanisation': float(district_cube.mean('state', 'Urbanisation_Rate')[resolved]),
             'districts': state_data[['District name', 'Population', 'Literacy_Rate']].to_dict('records')
         }
         
@@ -404,11 +881,12 @@ def get_state_details(state_name):
 # ==================== ML ENDPOINTS ====================
 
 @app.route('/api/ml/overview', methods=['GET'])
+@cached_response('ml')
 def get_ml_overview():
     """Get overview of all ML models and their performance."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         overview = {
             'models_trained': len(ml_results),
@@ -450,79 +928,92 @@ def get_ml_overview():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/literacy-prediction', methods=['GET'])
+@cached_response('ml')
 def get_literacy_prediction_details():
     """Get detailed results of literacy prediction model."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         return jsonify(ml_results['literacy_prediction'])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/internet-prediction', methods=['GET'])
+@cached_response('ml')
 def get_internet_prediction_details():
     """Get detailed results of internet penetration prediction model."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         return jsonify(ml_results['internet_prediction'])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/sanitation-classification', methods=['GET'])
+@cached_response('ml')
 def get_sanitation_classification_details():
     """Get detailed results of sanitation risk classification model."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         return jsonify(ml_results['sanitation_classification'])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/clustering', methods=['GET'])
+@cached_response('ml')
 def get_clustering_details():
     """Get detailed results of district clustering."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         return jsonify(ml_results['district_clustering'])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/anomalies', methods=['GET'])
+@cached_response('ml')
 def get_anomalies():
     """Get list of detected anomalous districts."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         return jsonify(ml_results['anomaly_detection'])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/pca', methods=['GET'])
+@cached_response('ml')
 def get_pca_analysis():
     """Get PCA analysis results for visualization."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         return jsonify(ml_results['pca_analysis'])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/recommendations/<district_name>', methods=['GET'])
+@cached_response('ml')
 def get_district_recommendations(district_name):
     """Get policy recommendations for a specific district."""
     try:
-        if ml_manager is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
+        
+        # Accept a census district code as well as a (possibly misspelt) name
+        if district_name.isdigit() and int(district_name) in district_index.code_positions:
+            position = district_index.code_positions[int(district_name)]
+            return jsonify(ml_manager.policy_recommendations_at(district_metrics, position))
         
-        recommendations = ml_manager.generate_policy_recommendations(district_metrics, district_name)
+        resolved = district_index.resolve_district(district_name)
+        recommendations = ml_manager.generate_policy_recommendations(district_metrics, resolved or district_name)
         return jsonify(recommendations)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -531,8 +1022,8 @@ def get_district_recommendations(district_name):
 def predict_literacy():
     """Predict literacy rate for given features."""
     try:
-        if ml_manager is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         data = request.get_json()
         features = data.get('features', {})
@@ -546,36 +1037,106 @@ def predict_literacy():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+ARROW_MIMETYPES = ('application/vnd.apache.arrow.stream', 'application/vnd.apache.arrow.file')
+
+def read_batch_rows():
+    """Parse a batch prediction payload into a DataFrame of feature rows.
+    
+    Accepts a JSON array of feature objects (or ``{"rows": [...]}``), a CSV
+    body or ``file`` upload, or an Arrow IPC stream/file (requires pyarrow).
+    Raises ``ValueError`` for unreadable or empty payloads.
+    """
+    upload = request.files.get('file')
+    mimetype = (upload.mimetype if upload else request.mimetype) or ''
+    filename = (upload.filename or '') if upload else ''
+    body = upload.read() if upload else request.get_data()
+    
+    if mimetype in ARROW_MIMETYPES or filename.endswith(('.arrow', '.feather')):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ValueError('Arrow payloads require the optional pyarrow package')
+        reader = pa.ipc.open_stream if mimetype == ARROW_MIMETYPES[0] else pa.ipc.open_file
+        rows = reader(pa.BufferReader(body)).read_all().to_pandas()
+    elif mimetype in ('text/csv', 'application/csv') or filename.endswith('.csv'):
+        rows = pd.read_csv(io.BytesIO(body))
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('rows')
+        if not isinstance(data, list):
+            raise ValueError('Expected a JSON array of feature objects, a CSV upload or an Arrow stream')
+        rows = pd.DataFrame(data)
+    
+    if rows.empty:
+        raise ValueError('No rows to score')
+    return rows
+
+def batch_prediction_response(predict, value_name):
+    """Score a batch payload with ``predict`` and return a JSON response."""
+    if not training_status.ready:
+        return ml_not_ready_response()
+    
+    try:
+        rows = read_batch_rows()
+        predictions = predict(rows)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        value_name: predictions.tolist(),
+        'count': int(len(predictions))
+    })
+
+@app.route('/api/ml/predict-literacy/batch', methods=['POST'])
+def predict_literacy_batch():
+    """Predict literacy rates for many feature rows in one vectorized call."""
+    try:
+        return batch_prediction_response(lambda rows: ml_manager.predict_literacy_batch(rows), 'predicted_literacy_rates')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ml/predict-internet/batch', methods=['POST'])
+def predict_internet_batch():
+    """Predict internet penetration for many feature rows in one vectorized call."""
+    try:
+        return batch_prediction_response(lambda rows: ml_manager.predict_internet_batch(rows), 'predicted_internet_penetration')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ml/predict-cluster/batch', methods=['POST'])
+def predict_cluster_batch():
+    """Assign clusters to many feature rows in one vectorized call."""
+    try:
+        return batch_prediction_response(lambda rows: ml_manager.get_district_cluster_batch(rows), 'clusters')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/ml/top-recommendations', methods=['GET'])
+@cached_response('ml')
 def get_top_recommendations():
     """Get top districts needing interventions based on priority scores."""
     try:
-        if ml_manager is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
-        
-        # Get recommendations for all districts
-        all_recommendations = []
-        for district_name in district_metrics['District name'].unique()[:50]:  # Limit to 50 for performance
-            rec = ml_manager.generate_policy_recommendations(district_metrics, district_name)
-            if 'error' not in rec:
-                all_recommendations.append(rec)
+        if not training_status.ready:
+            return ml_not_ready_response()
         
-        # Sort by priority score
-        all_recommendations.sort(key=lambda x: x['priority_score'], reverse=True)
+        # Scores every district in one vectorized pass (cached until the data changes)
+        top_recommendations, total_analyzed = ml_manager.top_policy_recommendations(district_metrics, limit=20)
         
         return jsonify({
-            'top_priority_districts': all_recommendations[:20],
-            'total_analyzed': len(all_recommendations)
+            'top_priority_districts': top_recommendations,
+            'total_analyzed': total_analyzed
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ml/cluster-comparison', methods=['GET'])
+@cached_response('ml')
 def get_cluster_comparison():
     """Get comparison of different clusters."""
     try:
-        if ml_results is None:
-            return jsonify({'error': 'ML models not trained yet'}), 503
+        if not training_status.ready:
+            return ml_not_ready_response()
         
         cluster_data = ml_results['district_clustering']['cluster_profiles']
         
@@ -589,6 +1150,11 @@ def get_cluster_comparison():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def create_app():
+    """Application factory for WSGI servers: load data, then return the app."""
+    initialize_data()
+    return app
+
 if __name__ == '__main__':
     initialize_data()
     app.run(debug=True, port=5000)
@@ -0,0 +1,201 @@
+"""Precomputed rollups of the census frames along the administrative hierarchy.
+
+A cube holds, for every level of the hierarchy (India, state, district and,
+for the housing data, tehsil and town/village), the sum and the non-missing
+count of every numeric column, plus the number of rows in each group. Only
+additive quantities are stored; rates are derived on read, either
+sum-then-divide over two columns (``ratio``) or as the mean of a
+district-level rate (``mean``, i.e. its stored sum over its count). Readers
+therefore index small pre-aggregated frames instead of regrouping raw rows.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+NATIONAL_LABEL = "INDIA"
+
+DISTRICT_HIERARCHY: Dict[str, Tuple[str, ...]] = {
+    "india": (),
+    "state": ("State name",),
+    "district": ("State name", "District code"),
+}
+
+DISTRICT_LABELS: Tuple[str, ...] = ("District name",)
+
+# The HLPCA file repeats each area once per Rural/Urban/Total split, so every
+# housing level is keyed by that flag as well as by the location codes.
+HOUSING_HIERARCHY: Dict[str, Tuple[str, ...]] = {
+    "india": ("Rural/Urban",),
+    "state": ("State Code", "Rural/Urban"),
+    "district": ("State Code", "District Code", "Rural/Urban"),
+    "tehsil": ("State Code", "District Code", "Tehsil Code", "Rural/Urban"),
+    "town": ("State Code", "District Code", "Tehsil Code", "Town Code/Village code", "Rural/Urban"),
+}
+
+HOUSING_LABELS: Tuple[str, ...] = ("State Name", "District Name", "Tehsil Name", "Area Name")
+HOUSING_UNAGGREGATED: Tuple[str, ...] = ("Ward No",)
+
+Columns = Union[str, Sequence[str]]
+
+
+@dataclass(frozen=True)
+class CubeLevel:
+    """Sums, non-missing counts and row counts for one hierarchy level."""
+
+    name: str
+    keys: Tuple[str, ...]
+    sums: pd.DataFrame
+    counts: pd.DataFrame
+    rows: pd.Series
+    labels: Optional[pd.DataFrame] = None
+
+
+class AggregationCube:
+    """Read-only access to a set of ``CubeLevel`` rollups."""
+
+    def __init__(self, levels: Dict[str, CubeLevel]):
+        self.levels = levels
+
+    def level(self, name: str) -> CubeLevel:
+        try:
+            return self.levels[name]
+        except KeyError:
+            raise KeyError(f"unknown cube level {name!r}; available: {', '.join(self.levels)}") from None
+
+    def sum(self, level: str, columns: Columns) -> Union[pd.Series, pd.DataFrame]:
+        """Summed values of ``columns`` per group of ``level``."""
+
+        return self.level(level).sums[columns]
+
+    def count(self, level: str, columns: Columns) -> Union[pd.Series, pd.DataFrame]:
+        """Non-missing counts of ``columns`` per group of ``level``."""
+
+        return self.level(level).counts[columns]
+
+    def rows(self, level: str) -> pd.Series:
+        return self.level(level).rows
+
+    def mean(self, level: str, columns: Columns) -> Union[pd.Series, pd.DataFrame]:
+        """Mean of the underlying rows per group (e.g. the average district rate)."""
+
+        cube_level = self.level(level)
+        return cube_level.sums[columns] / cube_level.counts[columns]
+
+    def ratio(self, level: str, numerator: str, denominator: str, scale: float = 100.0) -> pd.Series:
+        """Sum-then-divide rate per group: ``sum(numerator) / sum(denominator) * scale``."""
+
+        sums = self.level(level).sums
+        return sums[numerator] / sums[denominator] * scale
+
+    def total(self, column: str) -> object:
+        """National sum of ``column`` as a scalar."""
+
+        return self.sum("india", column).sum()
+
+    def overall_mean(self, columns: Columns) -> Union[float, pd.Series]:
+        """Mean of ``columns`` over every underlying row, pooled across ``india`` groups."""
+
+        india = self.level("india")
+        return india.sums[columns].sum() / india.counts[columns].sum()
+
+
+def _numeric_columns(df: pd.DataFrame, keys: Sequence[str]) -> List[str]:
+    return [
+        column for column in df.columns
+        if column not in keys
+        and pd.api.types.is_numeric_dtype(df[column].dtype)
+        and not pd.api.types.is_bool_dtype(df[column].dtype)
+    ]
+
+
+def _widen(values: pd.DataFrame) -> pd.DataFrame:
+    # Accumulate narrow storage types (float32 percentages, downcast integer
+    # counts) at full width so totals neither lose precision nor overflow.
+    widened = {}
+    for column in values.columns:
+        series = values[column]
+        if pd.api.types.is_float_dtype(series.dtype):
+            widened[column] = series.astype(np.float64)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            widened[column] = series.astype(np.int64)
+        else:
+            widened[column] = series
+    return pd.DataFrame(widened, index=values.index)
+
+
+def _build_level(
+    df: pd.DataFrame,
+    name: str,
+    keys: Tuple[str, ...],
+    value_columns: List[str],
+    label_columns: Sequence[str] = (),
+) -> CubeLevel:
+    values = _widen(df[value_columns])
+    if not keys:
+        index = pd.Index([NATIONAL_LABEL], name="Level")
+        return CubeLevel(
+            name=name,
+            keys=keys,
+            # Built column by column so integer totals are not upcast to float.
+            sums=pd.DataFrame({column: [values[column].sum()] for column in value_columns}, index=index),
+            counts=pd.DataFrame({column: [values[column].count()] for column in value_columns}, index=index),
+            rows=pd.Series([len(df)], index=index),
+        )
+
+    grouped = pd.concat([df[list(keys)], values], axis=1).groupby(list(keys), observed=True, sort=True)
+    labels = None
+    present_labels = [column for column in label_columns if column in df.columns and column not in keys]
+    if present_labels:
+        labels = df[list(keys) + present_labels].groupby(list(keys), observed=True, sort=True).first()
+    return CubeLevel(
+        name=name,
+        keys=keys,
+        sums=grouped[value_columns].sum(),
+        counts=grouped[value_columns].count(),
+        rows=grouped.size(),
+        labels=labels,
+    )
+
+
+def build_cube(
+    df: pd.DataFrame,
+    hierarchy: Dict[str, Tuple[str, ...]],
+    value_columns: Optional[Sequence[str]] = None,
+    label_columns: Sequence[str] = (),
+) -> AggregationCube:
+    """Roll ``df`` up to every level in ``hierarchy`` (level name -> group keys).
+
+    Levels whose key columns are missing from ``df`` are skipped. By default
+    every numeric column that is not a key is aggregated.
+    """
+
+    all_keys = {key for keys in hierarchy.values() for key in keys}
+    columns = list(value_columns) if value_columns is not None else _numeric_columns(df, all_keys)
+    levels = {
+        name: _build_level(df, name, keys, columns, label_columns)
+        for name, keys in hierarchy.items()
+        if all(key in df.columns for key in keys)
+    }
+    return AggregationCube(levels)
+
+
+def build_district_cube(district_df: pd.DataFrame) -> AggregationCube:
+    """Cube over the district frame, including any derived per-district rates.
+
+    Summing the derived rates alongside the raw counts keeps both kinds of
+    state figure available: ``ratio`` for population-weighted rates and
+    ``mean`` for the average of district rates.
+    """
+
+    return build_cube(district_df, DISTRICT_HIERARCHY, label_columns=DISTRICT_LABELS)
+
+
+def build_housing_cube(housing_df: pd.DataFrame) -> AggregationCube:
+    """Cube over the HLPCA frame, keyed by its location codes and Rural/Urban flag."""
+
+    codes = {key for keys in HOUSING_HIERARCHY.values() for key in keys} | set(HOUSING_UNAGGREGATED)
+    return build_cube(housing_df, HOUSING_HIERARCHY, _numeric_columns(housing_df, codes), HOUSING_LABELS)
@@ -8,30 +8,119 @@ root (after installing dependencies) with:
     python src/data_analysis.py --data-dir . --output-dir reports
 
 Both ``--data-dir`` and ``--output-dir`` are optional and default to the
-project root and ``reports/`` respectively.
+project root and ``reports/`` respectively. Parsed CSVs are cached in a
+columnar format under ``<data-dir>/.cache`` (override with ``--cache-dir`` or
+disable with ``--no-cache``).
+
+The analysis runs as a pipeline of cached stages (``ANALYSIS_STAGES``): a
+rerun only executes stages whose code or inputs changed, ``--force [STAGE
+...]`` reruns stages regardless and ``--only STAGE ...`` limits the run to
+some stages. With ``--per-state`` it writes one report per state (with its
+own figures) under ``<output-dir>/states/`` instead, rendering the states in
+parallel worker processes.
+
+``--trace [PATH]`` (or ``CENSUS_TRACE=PATH``) records the wall time, CPU time
+and peak memory of every stage, figure and state report, prints a summary
+table and writes a Chrome trace file (see ``src/tracing.py``).
 """
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+import csv
+import os
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 
-sns.set_theme(style="whitegrid")
+if __package__ in (None, ""):
+    # Running as ``python src/data_analysis.py``: make ``src.*`` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.aggregation_cube import AggregationCube, build_district_cube, build_housing_cube
+from src.query_engine import QUESTION_BANK, QueryEngine, QueryResult
+from src.derived_metrics import DERIVED_METRICS, aggregate_derived_metrics, compute_derived_metrics
+from src.figures import FigureSpec, render_figures
+from src.lookup_index import normalize_name
+from src.pipeline import Pipeline, PipelineError, Stage, StageRun
+from src.tracing import DEFAULT_TRACE_PATH, call_traced, get_tracer, traced
+import src.tracing
+import src.aggregation_cube
+import src.derived_metrics
+import src.query_engine
+from src.dataset_cache import cached_frame_shape, load_cached_frame, read_manifest, store_frame
+from src.schema import (
+    DISTRICT_SCHEMA,
+    HOUSING_SCHEMA,
+    SCHEMA_VERSION,
+    FrameSchema,
+    apply_schema,
+    frame_memory,
+    memory_report,
+)
+
+DEFAULT_CACHE_DIRNAME = ".cache"
+SOURCE_FILES = ("india-districts-census-2011.csv", "india_census_housing-hlpca-full.csv", "hlpca-colnames.csv")
 
 
 @dataclass
 class DatasetBundle:
-    """Container for the three core datasets used in the analysis."""
+    """Container for the three core datasets used in the analysis.
+
+    The housing frame is produced by ``housing_loader`` on first access of
+    ``housing``; ``housing_shape`` answers row/column counts from cheap
+    metadata without forcing that load. ``memory_usage`` maps each loaded
+    dataset to its (parsed, stored) footprint in bytes.
+    """
 
     district: pd.DataFrame
-    housing: pd.DataFrame
     colmap: Dict[str, str]
+    housing_loader: Optional[Callable[[], pd.DataFrame]] = field(default=None, repr=False)
+    housing_shape_loader: Optional[Callable[[], Tuple[int, int]]] = field(default=None, repr=False)
+    memory_usage: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    _housing: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
+    _housing_shape: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def housing(self) -> pd.DataFrame:
+        if self._housing is None:
+            with self._lock:
+                if self._housing is None:
+                    if self.housing_loader is None:
+                        raise ValueError("This bundle has no housing dataset attached")
+                    self._housing = self.housing_loader()
+        return self._housing
+
+    @property
+    def housing_loaded(self) -> bool:
+        return self._housing is not None
+
+    @property
+    def housing_shape(self) -> Tuple[int, int]:
+        if self._housing is not None:
+            return self._housing.shape
+        if self._housing_shape is None:
+            if self.housing_shape_loader is None:
+                return self.housing.shape
+            self._housing_shape = self.housing_shape_loader()
+        return self._housing_shape
+
+    @property
+    def memory_report(self) -> Optional[pd.DataFrame]:
+        if not self.memory_usage:
+            return None
+        return memory_report(
+            before={name: usage[0] for name, usage in self.memory_usage.items()},
+            after={name: usage[1] for name, usage in self.memory_usage.items()},
+        )
 
 
 def load_hlpca_mapping(mapping_path: Path) -> Dict[str, str]:
@@ -50,8 +139,100 @@ def load_hlpca_mapping(mapping_path: Path) -> Dict[str, str]:
     return mapping
 
 
-def load_datasets(data_dir: Path) -> DatasetBundle:
-    """Load all CSV artefacts into memory."""
+def csv_shape(path: Path) -> Tuple[int, int]:
+    """Row and column counts of a CSV from its header and a newline count.
+
+    Much cheaper than parsing; assumes no quoted field spans several lines,
+    which holds for the census extracts.
+    """
+
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        header = next(csv.reader(fh), [])
+
+    newlines = 0
+    last_byte = b"\n"
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            newlines += block.count(b"\n")
+            last_byte = block[-1:]
+    lines = newlines + (0 if last_byte == b"\n" else 1)
+    return max(lines - 1, 0), len(header)
+
+
+def _load_with_cache(
+    name: str,
+    sources: List[Path],
+    reader: Callable[[], pd.DataFrame],
+    cache_dir: Optional[Path],
+    mmap: bool = False,
+    schema: Optional[FrameSchema] = None,
+) -> Tuple[pd.DataFrame, int]:
+    """Return a frame from the columnar cache, parsing and storing it on a miss.
+
+    Freshly parsed frames are converted to ``schema`` before being cached. The
+    second element of the result is the frame's memory footprint as parsed,
+    before any schema conversion (remembered in the cache manifest). In
+    ``mmap`` mode a freshly parsed frame is re-opened from the cache after
+    being stored, so the caller always receives the shared, mapped copy.
+    """
+
+    key = {"schema": SCHEMA_VERSION if schema is not None else None}
+    if cache_dir is not None:
+        cached = load_cached_frame(cache_dir, name, sources, key=key, mmap=mmap)
+        if cached is not None:
+            manifest = read_manifest(cache_dir, name) or {}
+            return cached, int(manifest.get("meta", {}).get("parsed_bytes", frame_memory(cached)))
+
+    df = reader()
+    parsed_bytes = frame_memory(df)
+    if schema is not None:
+        df = apply_schema(df, schema)
+    if cache_dir is not None:
+        try:
+            store_frame(cache_dir, name, df, sources, key=key, meta={"parsed_bytes": parsed_bytes})
+        except (OSError, ValueError) as exc:
+            warnings.warn(f"Could not cache the {name} dataset: {exc}")
+        else:
+            if mmap:
+                mapped = load_cached_frame(cache_dir, name, sources, key=key, mmap=True)
+                if mapped is not None:
+                    return mapped, parsed_bytes
+    return df, parsed_bytes
+
+
+def read_housing_csv(housing_path: Path, colmap: Dict[str, str]) -> pd.DataFrame:
+    """Parse the housing CSV and apply the HLPCA column descriptions."""
+
+    housing_df = pd.read_csv(housing_path)
+    renamed_columns = {col: colmap[col] for col in housing_df.columns if col in colmap}
+    return housing_df.rename(columns=renamed_columns)
+
+
+@traced()
+def load_datasets(
+    data_dir: Path,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    mmap: bool = False,
+    compact: bool = True,
+    lazy_housing: bool = True,
+) -> DatasetBundle:
+    """Load all CSV artefacts into memory.
+
+    With ``compact=True`` (the default) frames are stored using the declared
+    schemas in ``src/schema.py`` (narrow integers, float32 percentages and
+    categorical names); ``DatasetBundle.memory_report`` compares the parsed
+    and stored footprints. With ``lazy_housing=True`` (the default) the housing
+    CSV is only loaded when ``bundle.housing`` is first read, so callers that
+    need just its shape, or that stream it with ``stream_housing_highlights``,
+    never pay for it.
+
+    Parsed frames are kept in a columnar cache (``<data_dir>/.cache`` unless
+    ``cache_dir`` is given) and reused until a source file changes. With
+    ``mmap=True`` the frames are memory-mapped read-only from that cache, so
+    several processes loading the same data share its pages; string columns
+    are then returned as categoricals. ``mmap`` is ignored without the cache.
+    """
 
     district_path = data_dir / "india-districts-census-2011.csv"
     housing_path = data_dir / "india_census_housing-hlpca-full.csv"
@@ -61,14 +242,53 @@ def load_datasets(data_dir: Path) -> DatasetBundle:
         missing = [path.name for path in (district_path, housing_path, mapping_path) if not path.exists()]
         raise FileNotFoundError(f"Missing required input files: {', '.join(missing)}")
 
-    district_df = pd.read_csv(district_path)
-    housing_df = pd.read_csv(housing_path)
     colmap = load_hlpca_mapping(mapping_path)
-
-    renamed_columns = {col: colmap[col] for col in housing_df.columns if col in colmap}
-    housing_df = housing_df.rename(columns=renamed_columns)
-
-    return DatasetBundle(district=district_df, housing=housing_df, colmap=colmap)
+    if not use_cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = data_dir / DEFAULT_CACHE_DIRNAME
+
+    district_df, district_parsed = _load_with_cache(
+        "district",
+        [district_path],
+        lambda: pd.read_csv(district_path),
+        cache_dir,
+        mmap,
+        DISTRICT_SCHEMA if compact else None,
+    )
+    housing_sources = [housing_path, mapping_path]
+    housing_schema = HOUSING_SCHEMA if compact else None
+
+    def load_housing() -> pd.DataFrame:
+        housing_df, housing_parsed = _load_with_cache(
+            "housing",
+            housing_sources,
+            lambda: read_housing_csv(housing_path, colmap),
+            cache_dir,
+            mmap,
+            housing_schema,
+        )
+        bundle.memory_usage["housing"] = (housing_parsed, frame_memory(housing_df))
+        return housing_df
+
+    def housing_shape() -> Tuple[int, int]:
+        if cache_dir is not None:
+            key = {"schema": SCHEMA_VERSION if housing_schema is not None else None}
+            shape = cached_frame_shape(cache_dir, "housing", housing_sources, key=key)
+            if shape is not None:
+                return shape
+        return csv_shape(housing_path)
+
+    bundle = DatasetBundle(
+        district=district_df,
+        colmap=colmap,
+        housing_loader=load_housing,
+        housing_shape_loader=housing_shape,
+        memory_usage={"district": (district_parsed, frame_memory(district_df))},
+    )
+    if not lazy_housing:
+        bundle.housing  # noqa: B018 - force the eager load
+    return bundle
 
 
 def summarise_dataframe(df: pd.DataFrame) -> Dict[str, object]:
@@ -84,21 +304,19 @@ def summarise_dataframe(df: pd.DataFrame) -> Dict[str, object]:
     return summary
 
 
-def compute_district_metrics(district_df: pd.DataFrame) -> pd.DataFrame:
-    """Augment the district dataset with derived indicators."""
+@traced()
+def compute_district_metrics(
+    district_df: pd.DataFrame,
+    metrics: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Augment the district dataset with derived indicators.
 
-    df = district_df.copy()
+    ``metrics`` names entries of ``DERIVED_METRICS`` (default: all of them).
+    Base columns are shared with ``district_df`` (which may be memory-mapped)
+    rather than copied; only the derived columns are newly allocated.
+    """
 
-    with np.errstate(divide="ignore", invalid="ignore"):
-        df["Sex_Ratio"] = (df["Female"] / df["Male"]) * 1000
-        df["Literacy_Rate"] = (df["Literate"] / df["Population"]) * 100
-        df["Worker_Participation_Rate"] = (df["Workers"] / df["Population"]) * 100
-        df["Urbanisation_Rate"] = (df["Urban_Households"] / df["Households"]) * 100
-        df["Internet_Penetration"] = (df["Households_with_Internet"] / df["Households"]) * 100
-        df["Mobile_Phone_Access"] = (df["Households_with_Telephone_Mobile_Phone"] / df["Households"]) * 100
-        df["Sanitation_Gap"] = 100 - (df["Having_latrine_facility_within_the_premises_Total_Households"] / df["Households"] * 100)
-
-    return df
+    return pd.concat([district_df, compute_derived_metrics(district_df, metrics)], axis=1)
 
 
 def select_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -108,27 +326,29 @@ def select_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
     return numeric_df
 
 
-def compute_state_level_insights(district_df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Aggregate district metrics to state level for comparison."""
+@traced()
+def compute_state_level_insights(
+    district_df: pd.DataFrame,
+    cube: Optional[AggregationCube] = None,
+) -> Dict[str, pd.Series]:
+    """Aggregate district metrics to state level for comparison.
+
+    Reads the state level of ``cube`` (built from ``district_df`` if omitted).
+    """
 
-    grouped = district_df.groupby("State name", dropna=False)
+    if cube is None:
+        cube = build_district_cube(district_df)
 
-    sums = grouped[[
-        "Population",
-        "Literate",
-        "Households",
-        "Households_with_Internet",
-        "Having_latrine_facility_within_the_premises_Total_Households",
-    ]].sum()
+    pop_by_state = cube.sum("state", "Population").sort_values(ascending=False)
 
-    pop_by_state = sums["Population"].sort_values(ascending=False)
+    rates = aggregate_derived_metrics(cube, "state", ["Literacy_Rate", "Internet_Penetration", "Sanitation_Gap"])
 
-    literacy_by_state = (sums["Literate"] / sums["Population"] * 100).sort_values(ascending=False)
+    # Left unnamed so the report tables label the column "Value".
+    literacy_by_state = rates["Literacy_Rate"].rename(None).sort_values(ascending=False)
 
-    internet_by_state = (sums["Households_with_Internet"] / sums["Households"] * 100).sort_values(ascending=False)
+    internet_by_state = rates["Internet_Penetration"].rename(None).sort_values(ascending=False)
 
-    sanitation_gap = (100 - (sums["Having_latrine_facility_within_the_premises_Total_Households"] /
-                             sums["Households"] * 100)).sort_values()
+    sanitation_gap = rates["Sanitation_Gap"].rename(None).sort_values()
 
     return {
         "population": pop_by_state,
@@ -138,24 +358,148 @@ def compute_state_level_insights(district_df: pd.DataFrame) -> Dict[str, pd.Seri
     }
 
 
-def compute_housing_highlights(housing_df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Summarise notable distributions from the housing dataset."""
+HOUSING_MIX_PREFIXES: Dict[str, str] = {
+    "roof_mix": "material_roof",
+    "wall_mix": "material_wall",
+    "cooking_mix": "cooking_",
+}
+
+DEFAULT_HOUSING_CHUNKSIZE = 50_000
 
-    roof_columns = [col for col in housing_df.columns if col.lower().startswith("material_roof")]
-    wall_columns = [col for col in housing_df.columns if col.lower().startswith("material_wall")]
-    cooking_columns = [col for col in housing_df.columns if col.lower().startswith("cooking_")]
 
-    roof_mix = housing_df[roof_columns].mean().sort_values(ascending=False)
-    wall_mix = housing_df[wall_columns].mean().sort_values(ascending=False)
-    cooking_mix = housing_df[cooking_columns].mean().sort_values(ascending=False)
+def housing_mix_columns(columns: Iterable[str]) -> Dict[str, List[str]]:
+    """Group housing columns into the roof, wall and cooking-fuel mixes."""
 
+    columns = list(columns)
     return {
-        "roof_mix": roof_mix,
-        "wall_mix": wall_mix,
-        "cooking_mix": cooking_mix,
+        mix: [col for col in columns if col.lower().startswith(prefix)]
+        for mix, prefix in HOUSING_MIX_PREFIXES.items()
     }
 
 
+@traced()
+def compute_housing_highlights(
+    housing_df: pd.DataFrame,
+    cube: Optional[AggregationCube] = None,
+) -> Dict[str, pd.Series]:
+    """Summarise notable distributions from the housing dataset.
+
+    With a housing ``cube`` the means are read from its national level
+    (accumulated in float64) rather than recomputed over ``housing_df``.
+    """
+
+    mixes = housing_mix_columns(housing_df.columns)
+    if cube is not None:
+        return {mix: cube.overall_mean(columns).sort_values(ascending=False) for mix, columns in mixes.items()}
+    return {
+        mix: housing_df[columns].mean().sort_values(ascending=False)
+        for mix, columns in mixes.items()
+    }
+
+
+class HousingAccumulator:
+    """Fold housing chunks into running per-column statistics.
+
+    Keeps, for every numeric column, the sum, the count of non-missing values
+    and the sum of squares, so means and standard deviations match the
+    in-memory ``DataFrame.mean``/``std`` results without holding the data.
+    Row-level bookkeeping for ``summarise_dataframe`` parity (missing values,
+    duplicate rows) is folded in as well; duplicate detection keeps one 64-bit
+    hash per row, which is the only state that grows with the input.
+    """
+
+    def __init__(self) -> None:
+        self.columns: List[str] = []
+        self.rows = 0
+        self._sums: Optional[pd.Series] = None
+        self._counts: Optional[pd.Series] = None
+        self._squares: Optional[pd.Series] = None
+        self._missing: Optional[pd.Series] = None
+        self._row_hashes: List[np.ndarray] = []
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if not self.columns:
+            self.columns = list(chunk.columns)
+        numeric = chunk.select_dtypes(include=[np.number]).astype(np.float64)
+        sums = numeric.sum()
+        counts = numeric.count()
+        squares = (numeric ** 2).sum()
+        missing = chunk.isna().sum()
+        if self._sums is None:
+            self._sums, self._counts, self._squares, self._missing = sums, counts, squares, missing
+        else:
+            self._sums = self._sums.add(sums, fill_value=0)
+            self._counts = self._counts.add(counts, fill_value=0)
+            self._squares = self._squares.add(squares, fill_value=0)
+            self._missing = self._missing.add(missing, fill_value=0)
+        self._row_hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+        self.rows += len(chunk)
+
+    def mean(self, columns: Optional[List[str]] = None) -> pd.Series:
+        if self._sums is None:
+            return pd.Series(dtype=float)
+        sums = self._sums if columns is None else self._sums[columns]
+        counts = self._counts if columns is None else self._counts[columns]
+        return sums / counts.where(counts > 0)
+
+    def std(self, columns: Optional[List[str]] = None) -> pd.Series:
+        """Sample standard deviation (ddof=1), as ``DataFrame.std`` reports."""
+
+        if self._sums is None:
+            return pd.Series(dtype=float)
+        cols = list(self._sums.index) if columns is None else columns
+        counts = self._counts[cols]
+        mean = self._sums[cols] / counts
+        variance = (self._squares[cols] - counts * mean ** 2) / (counts - 1).where(counts > 1)
+        return np.sqrt(variance.clip(lower=0))
+
+    def highlights(self) -> Dict[str, pd.Series]:
+        return {
+            mix: self.mean(columns).sort_values(ascending=False)
+            for mix, columns in housing_mix_columns(self.columns).items()
+        }
+
+    def summary(self) -> Dict[str, object]:
+        hashes = np.concatenate(self._row_hashes) if self._row_hashes else np.empty(0, dtype=np.uint64)
+        missing = self._missing.astype(int) if self._missing is not None else pd.Series(dtype=int)
+        return {
+            "rows": self.rows,
+            "columns": len(self.columns),
+            "duplicate_rows": int(len(hashes) - len(np.unique(hashes))),
+            "missing_values": missing[missing > 0].sort_values(ascending=False),
+        }
+
+
+def iter_housing_chunks(
+    housing_path: Path,
+    colmap: Dict[str, str],
+    chunksize: int = DEFAULT_HOUSING_CHUNKSIZE,
+) -> Iterable[pd.DataFrame]:
+    """Yield the housing CSV in ``chunksize``-row frames with HLPCA names applied."""
+
+    for chunk in pd.read_csv(housing_path, chunksize=chunksize):
+        renamed_columns = {col: colmap[col] for col in chunk.columns if col in colmap}
+        yield chunk.rename(columns=renamed_columns)
+
+
+@traced()
+def stream_housing_highlights(
+    housing_path: Path,
+    colmap: Dict[str, str],
+    chunksize: int = DEFAULT_HOUSING_CHUNKSIZE,
+) -> Tuple[Dict[str, pd.Series], Dict[str, object]]:
+    """Bounded-memory equivalent of ``compute_housing_highlights``.
+
+    Reads the housing CSV ``chunksize`` rows at a time and returns the
+    highlight mixes together with a ``summarise_dataframe``-style summary.
+    """
+
+    accumulator = HousingAccumulator()
+    for chunk in iter_housing_chunks(housing_path, colmap, chunksize):
+        accumulator.update(chunk)
+    return accumulator.highlights(), accumulator.summary()
+
+
 def save_series_table(series: pd.Series, top_n: int = 10) -> pd.DataFrame:
     """Convert a series into a tidy dataframe for reporting."""
 
@@ -163,167 +507,16 @@ def save_series_table(series: pd.Series, top_n: int = 10) -> pd.DataFrame:
 
 
 def build_question_bank() -> pd.DataFrame:
-    """Craft a catalogue of analytical questions and expected outputs."""
+    """Craft a catalogue of analytical questions and expected outputs.
 
-    questions: List[Dict[str, str]] = [
-        {
-            "Question": "Which states contribute the highest share of India's total population?",
-            "Output": "Table",
-            "Description": "Rank states by population using aggregated district totals.",
-        },
-        {
-            "Question": "How does literacy rate correlate with worker participation at the district level?",
-            "Output": "Scatter plot",
-            "Description": "Plot literacy percentage against worker participation rate with an urbanisation colour scale.",
-        },
-        {
-            "Question": "What is the distribution of roof materials across rural housing stock?",
-            "Output": "Bar chart",
-            "Description": "Summarise the mean share of roof material categories (rural subset).",
-        },
-        {
-            "Question": "Which districts face the largest sanitation gaps (lack of in-premise latrines)?",
-            "Output": "Table",
-            "Description": "Sort districts by sanitation gap metric derived from latrine coverage.",
-        },
-        {
-            "Question": "How is internet access spread across states when normalised by total households?",
-            "Output": "Bar chart",
-            "Description": "Compute household-weighted internet penetration per state.",
-        },
-        {
-            "Question": "Which cooking fuels dominate urban households compared to rural ones?",
-            "Output": "Grouped bar chart",
-            "Description": "Contrast mean cooking fuel shares split by Rural/Urban flag.",
-        },
-        {
-            "Question": "How does asset ownership (TV, mobile, internet, vehicle) vary by state?",
-            "Output": "Stacked bar chart",
-            "Description": "Aggregate asset ownership percentages per state and display comparisons.",
-        },
-        {
-            "Question": "Which districts have the highest female-to-male sex ratio?",
-            "Output": "Table",
-            "Description": "List top districts by computed sex ratio indicator.",
-        },
-        {
-            "Question": "Where is the gap between rural and urban literacy widest?",
-            "Output": "Bar chart",
-            "Description": "Calculate literacy difference between rural and urban households per district/state.",
-        },
-        {
-            "Question": "What share of households live in dilapidated dwellings across states?",
-            "Output": "Heatmap",
-            "Description": "Summarise dilapidated household percentage by Rural/Urban and state.",
-        },
-        {
-            "Question": "Which districts report the highest proportion of households using LPG/PNG for cooking?",
-            "Output": "Table",
-            "Description": "Rank districts by LPG/PNG adoption using housing dataset percentages.",
-        },
-        {
-            "Question": "How does internet access relate to literacy at the state level?",
-            "Output": "Scatter plot",
-            "Description": "Plot state-level literacy versus internet penetration with bubble size for population.",
-        },
-        {
-            "Question": "Which states have the largest marginal worker populations?",
-            "Output": "Bar chart",
-            "Description": "Sum marginal workers per state from district census data.",
-        },
-        {
-            "Question": "How prevalent are non-permanent wall materials across districts?",
-            "Output": "Choropleth map",
-            "Description": "Map percentage of non-brick/concrete wall materials to highlight vulnerability.",
-        },
-        {
-            "Question": "What percentage of households access drinking water within premises versus away?",
-            "Output": "Stacked bar chart",
-            "Description": "Aggregate water-source proximity categories by state.",
-        },
-        {
-            "Question": "Which districts have the highest concentration of Scheduled Tribe populations?",
-            "Output": "Table",
-            "Description": "Rank districts by share of ST population in total population.",
-        },
-        {
-            "Question": "How does rural electrification compare with urban electrification by state?",
-            "Output": "Dual line chart",
-            "Description": "Track electricity access percentages for rural vs urban households per state.",
-        },
-        {
-            "Question": "Where are machine-made tiles most prevalent as roof material?",
-            "Output": "Table",
-            "Description": "Identify top regions by mean share of machine-made tiles in housing records.",
-        },
-        {
-            "Question": "Which states demonstrate the highest female literacy rates?",
-            "Output": "Bar chart",
-            "Description": "Calculate female literacy share relative to female population per state.",
-        },
-        {
-            "Question": "How does household size distribution vary between rural and urban areas?",
-            "Output": "Violin plot",
-            "Description": "Visualise household size categories split by Rural/Urban flag.",
-        },
-        {
-            "Question": "What is the relationship between tele-density and internet adoption?",
-            "Output": "Scatter plot",
-            "Description": "Plot mobile phone access against internet penetration at state level.",
-        },
-        {
-            "Question": "Which districts rely heavily on kerosene or other traditional fuels for cooking?",
-            "Output": "Table",
-            "Description": "Highlight districts where non-clean fuels exceed a chosen threshold.",
-        },
-        {
-            "Question": "How many households lack bathing facilities within premises across states?",
-            "Output": "Horizontal bar chart",
-            "Description": "Aggregate counts of households without bathing facility and normalise by totals.",
-        },
-        {
-            "Question": "Where is the urbanisation rate growing fastest relative to household counts?",
-            "Output": "Line chart",
-            "Description": "Trend urban household ratios when multi-year data becomes available (placeholder for future).",
-        },
-        {
-            "Question": "Which districts exhibit the highest percentage of graduate-educated residents?",
-            "Output": "Table",
-            "Description": "Rank districts by share of graduate-level education among literate population.",
-        },
-        {
-            "Question": "How does household asset ownership cluster together?",
-            "Output": "Clustered heatmap",
-            "Description": "Perform hierarchical clustering on asset access percentages per state.",
-        },
-        {
-            "Question": "What is the distribution of households by dwelling condition (good, livable, dilapidated)?",
-            "Output": "Pie chart",
-            "Description": "Visualise overall share of dwelling conditions across India.",
-        },
-        {
-            "Question": "Which states have the lowest workforce participation among women?",
-            "Output": "Bar chart",
-            "Description": "Compute female worker participation as share of female population per state.",
-        },
-        {
-            "Question": "How do separate kitchen facilities vary with fuel types?",
-            "Output": "Mosaic plot",
-            "Description": "Cross-tabulate kitchen availability with primary cooking fuel categories.",
-        },
-        {
-            "Question": "Where is the reliance on hand pumps for drinking water highest?",
-            "Output": "Table",
-            "Description": "Identify districts with the greatest share of hand-pump usage in water sources.",
-        },
-        {
-            "Question": "Which districts show the highest proportion of alternative latrine arrangements?",
-            "Output": "Table",
-            "Description": "Rank based on alternative latrine facility usage (e.g., pit, service, open drain).",
-        },
-    ]
+    The questions are declared, together with the queries that answer them,
+    in ``src.query_engine.QUESTION_BANK``.
+    """
 
-    return pd.DataFrame(questions)
+    return pd.DataFrame([
+        {"Question": spec.question, "Output": spec.output, "Description": spec.description}
+        for spec in QUESTION_BANK
+    ])
 
 
 def create_output_dir(output_dir: Path) -> Path:
@@ -333,78 +526,79 @@ def create_output_dir(output_dir: Path) -> Path:
     return output_dir
 
 
-def plot_top_states_by_population(pop_series: pd.Series, output_dir: Path) -> Path:
-    plt.figure(figsize=(10, 6))
+def top_states_population_figure(pop_series: pd.Series) -> FigureSpec:
     top = pop_series.head(10)[::-1]
-    sns.barplot(x=top.values / 1_000_000, y=top.index, palette="crest")
-    plt.xlabel("Population (millions)")
-    plt.ylabel("State")
-    plt.title("Top 10 States by Total Population")
-    output_path = output_dir / "top_states_population.png"
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150)
-    plt.close()
-    return output_path
+    return FigureSpec(
+        "top_states_population.png",
+        "Top states by total population",
+        "barh",
+        pd.Series(top.values / 1_000_000, index=top.index),
+        {"palette": "crest", "xlabel": "Population (millions)", "ylabel": "State", "title": "Top 10 States by Total Population"},
+        figsize=(10, 6),
+    )
 
 
-def plot_literacy_vs_workers(district_df: pd.DataFrame, output_dir: Path) -> Path:
-    plt.figure(figsize=(8, 6))
-    sns.scatterplot(
-        data=district_df,
-        x="Literacy_Rate",
-        y="Worker_Participation_Rate",
-        hue="Urbanisation_Rate",
-        palette="viridis",
-        alpha=0.6,
+def literacy_vs_workers_figure(district_df: pd.DataFrame) -> FigureSpec:
+    return FigureSpec(
+        "literacy_vs_workforce.png",
+        "Literacy vs workforce participation",
+        "scatter",
+        district_df[["Literacy_Rate", "Worker_Participation_Rate", "Urbanisation_Rate"]],
+        {
+            "x": "Literacy_Rate",
+            "y": "Worker_Participation_Rate",
+            "hue": "Urbanisation_Rate",
+            "palette": "viridis",
+            "alpha": 0.6,
+            "legend_title": "Urbanisation (%)",
+            "legend_loc": "lower right",
+            "xlabel": "Literacy rate (%)",
+            "ylabel": "Worker participation rate (%)",
+            "title": "District-level literacy vs. workforce participation",
+        },
+        figsize=(8, 6),
     )
-    plt.xlabel("Literacy rate (%)")
-    plt.ylabel("Worker participation rate (%)")
-    plt.title("District-level literacy vs. workforce participation")
-    plt.legend(title="Urbanisation (%)", loc="lower right", frameon=True)
-    output_path = output_dir / "literacy_vs_workforce.png"
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150)
-    plt.close()
-    return output_path
 
 
-def plot_roof_material_mix(roof_mix: pd.Series, output_dir: Path) -> Path:
-    plt.figure(figsize=(9, 5))
-    top = roof_mix.head(8)
-    sns.barplot(x=top.values, y=top.index, palette="flare")
-    plt.xlabel("Average share across records (%)")
-    plt.ylabel("Roof material")
-    plt.title("Most common roof materials")
-    output_path = output_dir / "roof_material_mix.png"
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150)
-    plt.close()
-    return output_path
+def roof_material_mix_figure(roof_mix: pd.Series) -> FigureSpec:
+    return FigureSpec(
+        "roof_material_mix.png",
+        "Most common roof materials",
+        "barh",
+        roof_mix.head(8),
+        {"palette": "flare", "xlabel": "Average share across records (%)", "ylabel": "Roof material", "title": "Most common roof materials"},
+        figsize=(9, 5),
+    )
 
 
-def plot_asset_access(district_df: pd.DataFrame, output_dir: Path) -> Path:
+def asset_access_figure(
+    district_df: pd.DataFrame,
+    cube: Optional[AggregationCube] = None,
+) -> FigureSpec:
+    if cube is None:
+        cube = build_district_cube(district_df)
     asset_cols = {
         "Television": "Households_with_Television",
         "Mobile phone": "Households_with_Telephone_Mobile_Phone",
         "Internet": "Households_with_Internet",
         "Car / Jeep / Van": "Households_with_Car_Jeep_Van",
     }
-    aggregated = district_df.groupby("State name").agg({col: "sum" for col in asset_cols.values()})
-    aggregated["Households"] = district_df.groupby("State name")["Households"].sum()
-    for label, col in asset_cols.items():
-        aggregated[label] = aggregated[col] / aggregated["Households"] * 100
+    aggregated = pd.DataFrame({label: cube.ratio("state", col, "Households") for label, col in asset_cols.items()})
     share_df = aggregated[["Television", "Mobile phone", "Internet", "Car / Jeep / Van"]].mean().sort_values(ascending=False)
 
-    plt.figure(figsize=(8, 5))
-    sns.barplot(x=share_df.values, y=share_df.index, palette="magma")
-    plt.xlabel("Average state-level household access (%)")
-    plt.ylabel("Asset")
-    plt.title("Average household access to key assets")
-    output_path = output_dir / "household_asset_access.png"
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150)
-    plt.close()
-    return output_path
+    return FigureSpec(
+        "household_asset_access.png",
+        "Average household access to key assets",
+        "barh",
+        share_df,
+        {
+            "palette": "magma",
+            "xlabel": "Average state-level household access (%)",
+            "ylabel": "Asset",
+            "title": "Average household access to key assets",
+        },
+        figsize=(8, 5),
+    )
 
 
 def build_markdown_section(title: str, body: Iterable[str]) -> List[str]:
@@ -414,6 +608,7 @@ def build_markdown_section(title: str, body: Iterable[str]) -> List[str]:
     return lines
 
 
+@traced()
 def generate_markdown_report(
     bundle: DatasetBundle,
     district_enriched: pd.DataFrame,
@@ -421,13 +616,21 @@ def generate_markdown_report(
     housing_highlights: Dict[str, pd.Series],
     plots: List[Tuple[str, Path]],
     output_path: Path,
+    housing_summary: Optional[Dict[str, object]] = None,
+    question_results: Optional[Dict[str, QueryResult]] = None,
 ) -> Path:
-    """Persist a Markdown summary of the analysis."""
+    """Persist a Markdown summary of the analysis.
+
+    ``housing_summary`` replaces ``summarise_dataframe(bundle.housing)`` when
+    the housing data was streamed rather than loaded. ``question_results``
+    (from ``QueryEngine.run``) adds the answers to the question bank.
+    """
 
     lines: List[str] = ["# India Census & Housing Deep-dive", ""]
 
     district_summary = summarise_dataframe(bundle.district)
-    housing_summary = summarise_dataframe(bundle.housing)
+    if housing_summary is None:
+        housing_summary = summarise_dataframe(bundle.housing)
 
     overview_lines = [
         "The analysis integrates district-level census indicators with the high-resolution housing stock dataset,",
@@ -436,6 +639,12 @@ def generate_markdown_report(
         f"* District dataset: {district_summary['rows']:,} rows × {district_summary['columns']} columns",
         f"* Housing dataset: {housing_summary['rows']:,} rows × {housing_summary['columns']} columns",
     ]
+    if bundle.memory_report is not None:
+        overview_lines.extend([
+            "",
+            "In-memory footprint as parsed versus with the compact storage schema:",
+            bundle.memory_report.to_markdown(index=False),
+        ])
     lines.extend(build_markdown_section("Overview", overview_lines))
 
     top_population = save_series_table(state_insights["population"], top_n=10)
@@ -472,6 +681,12 @@ def generate_markdown_report(
     ]
     lines.extend(build_markdown_section("Exploratory question bank (30 prompts)", question_lines))
 
+    if question_results:
+        answer_lines: List[str] = []
+        for question_id, result in question_results.items():
+            answer_lines.extend([f"### {question_id.upper()}. {result.spec.question}", "", result.to_markdown(), ""])
+        lines.extend(build_markdown_section("Question bank answers", answer_lines))
+
     if district_summary["missing_values"].empty and housing_summary["missing_values"].empty:
         data_quality_lines = ["No missing values detected in the supplied datasets."]
     else:
@@ -494,31 +709,425 @@ def generate_markdown_report(
     return output_path
 
 
-def run_analysis(data_dir: Path, output_dir: Path) -> Tuple[Path, List[Path]]:
-    bundle = load_datasets(data_dir)
-    output_dir = create_output_dir(output_dir)
+def _source_stats(data_dir: Path) -> List[Tuple[str, int, int]]:
+    """Name, size and modification time of the input CSVs (cheap change detection)."""
 
-    district_enriched = compute_district_metrics(bundle.district)
-    state_insights = compute_state_level_insights(district_enriched)
-    housing_highlights = compute_housing_highlights(bundle.housing)
-
-    plot_paths = [
-        ("Top states by total population", plot_top_states_by_population(state_insights["population"], output_dir)),
-        ("Literacy vs workforce participation", plot_literacy_vs_workers(district_enriched, output_dir)),
-        ("Most common roof materials", plot_roof_material_mix(housing_highlights["roof_mix"], output_dir)),
-        ("Average household access to key assets", plot_asset_access(district_enriched, output_dir)),
-    ]
+    stats = []
+    for name in SOURCE_FILES:
+        stat = (data_dir / name).stat()
+        stats.append((name, stat.st_size, stat.st_mtime_ns))
+    return stats
+
+
+def _stage_bundle(
+    sources: List[Tuple[str, int, int]],
+    data_dir: Path,
+    cache_dir: Optional[Path],
+    use_cache: bool,
+    compact: bool,
+) -> DatasetBundle:
+    return load_datasets(data_dir, cache_dir=cache_dir, use_cache=use_cache, compact=compact)
+
+
+def _stage_district_metrics(bundle: DatasetBundle) -> pd.DataFrame:
+    return compute_district_metrics(bundle.district)
 
-    report_path = generate_markdown_report(
+
+def _stage_housing(
+    bundle: DatasetBundle,
+    data_dir: Path,
+    stream_housing: bool,
+    chunksize: int,
+) -> Dict[str, object]:
+    """Housing highlights, summary and (unless streamed) cube."""
+
+    if stream_housing:
+        highlights, summary = stream_housing_highlights(
+            data_dir / "india_census_housing-hlpca-full.csv",
+            bundle.colmap,
+            chunksize=chunksize,
+        )
+        return {"highlights": highlights, "summary": summary, "cube": None}
+    cube = build_housing_cube(bundle.housing)
+    return {
+        "highlights": compute_housing_highlights(bundle.housing, cube=cube),
+        "summary": summarise_dataframe(bundle.housing),
+        "cube": cube,
+    }
+
+
+def _stage_questions(district_cube: AggregationCube, housing: Dict[str, object]) -> Dict[str, QueryResult]:
+    # Housing questions are skipped when the housing data was only streamed.
+    return QueryEngine(district_cube=district_cube, housing_cube=housing["cube"]).run()
+
+
+def _stage_figures(
+    state_insights: Dict[str, pd.Series],
+    district_enriched: pd.DataFrame,
+    district_cube: AggregationCube,
+    housing: Dict[str, object],
+    output_dir: Path,
+    figure_workers: Optional[int],
+    force_figures: bool,
+) -> List[Tuple[str, Path]]:
+    figures = render_figures(
+        [
+            top_states_population_figure(state_insights["population"]),
+            literacy_vs_workers_figure(district_enriched),
+            roof_material_mix_figure(housing["highlights"]["roof_mix"]),
+            asset_access_figure(district_enriched, cube=district_cube),
+        ],
+        create_output_dir(output_dir),
+        max_workers=figure_workers,
+        force=force_figures,
+    )
+    return [(figure.spec.caption, figure.path) for figure in figures]
+
+
+def _stage_report(
+    bundle: DatasetBundle,
+    district_enriched: pd.DataFrame,
+    state_insights: Dict[str, pd.Series],
+    housing: Dict[str, object],
+    figures: List[Tuple[str, Path]],
+    question_results: Dict[str, QueryResult],
+    output_dir: Path,
+    stream_housing: bool,
+) -> Path:
+    if not stream_housing:
+        # The memory table lists housing only once it is loaded; the housing
+        # stage may have been served from the cache without loading it.
+        bundle.housing  # noqa: B018
+    return generate_markdown_report(
         bundle=bundle,
         district_enriched=district_enriched,
         state_insights=state_insights,
-        housing_highlights=housing_highlights,
-        plots=plot_paths,
-        output_path=output_dir / "analysis_summary.md",
+        housing_highlights=housing["highlights"],
+        plots=figures,
+        output_path=create_output_dir(output_dir) / "analysis_summary.md",
+        housing_summary=housing["summary"],
+        question_results=question_results,
+    )
+
+
+ANALYSIS_STAGES: List[Stage] = [
+    Stage("sources", _source_stats, ("data_dir",), cache=False),
+    Stage(
+        "bundle", _stage_bundle, ("sources", "data_dir", "cache_dir", "use_cache", "compact"),
+        cache=False, by_key=True,
+    ),
+    Stage(
+        "district_metrics", _stage_district_metrics, ("bundle",),
+        code=(_stage_district_metrics, compute_district_metrics, src.derived_metrics),
+    ),
+    Stage("district_cube", build_district_cube, ("district_metrics",), code=(src.aggregation_cube,)),
+    Stage(
+        "state_insights", compute_state_level_insights, ("district_metrics", "district_cube"),
+        code=(compute_state_level_insights, src.derived_metrics, src.aggregation_cube),
+    ),
+    Stage(
+        "housing", _stage_housing, ("bundle", "data_dir", "stream_housing", "chunksize"),
+        code=(_stage_housing, compute_housing_highlights, stream_housing_highlights, HousingAccumulator,
+              housing_mix_columns, summarise_dataframe, src.aggregation_cube),
+    ),
+    Stage(
+        "questions", _stage_questions, ("district_cube", "housing"),
+        code=(_stage_questions, src.query_engine, src.aggregation_cube),
+    ),
+    Stage(
+        "figures", _stage_figures,
+        ("state_insights", "district_metrics", "district_cube", "housing", "output_dir", "figure_workers", "force_figures"),
+        # Always run: render_figures skips PNGs whose content key is unchanged.
+        cache=False,
+    ),
+    Stage(
+        "report", _stage_report,
+        ("bundle", "district_metrics", "state_insights", "housing", "figures", "questions", "output_dir", "stream_housing"),
+        code=(_stage_report, generate_markdown_report, build_markdown_section, save_series_table,
+              build_question_bank, summarise_dataframe, src.query_engine, src.aggregation_cube),
+    ),
+]
+
+
+def run_analysis(
+    data_dir: Path,
+    output_dir: Path,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    compact: bool = True,
+    stream_housing: bool = False,
+    chunksize: int = DEFAULT_HOUSING_CHUNKSIZE,
+    figure_workers: Optional[int] = None,
+    force_figures: bool = False,
+    force: Union[bool, Iterable[str]] = (),
+    only: Optional[Iterable[str]] = None,
+    progress: Optional[Callable[[StageRun], None]] = None,
+) -> Tuple[Optional[Path], List[Path]]:
+    """Run the analysis pipeline (``ANALYSIS_STAGES``) into ``output_dir``.
+
+    Stage outputs are cached under ``<cache_dir>/pipeline`` (no stage cache
+    with ``use_cache=False``) and a rerun only executes stages whose code or
+    inputs changed; ``force`` reruns the named stages (``True``: all of
+    them). ``only`` restricts the run to the named stages and what they
+    depend on; the report path is ``None`` and the figure list empty unless
+    "report" and "figures" are named. Figures whose inputs are unchanged are not redrawn
+    (see ``src.figures.render_figures``).
+    """
+
+    stage_cache = None
+    if use_cache:
+        stage_cache = (cache_dir if cache_dir is not None else data_dir / DEFAULT_CACHE_DIRNAME) / "pipeline"
+    pipeline = Pipeline(ANALYSIS_STAGES, cache_dir=stage_cache)
+    params = {
+        "data_dir": data_dir,
+        "output_dir": output_dir,
+        "cache_dir": cache_dir,
+        "use_cache": use_cache,
+        "compact": compact,
+        "stream_housing": stream_housing,
+        "chunksize": chunksize,
+        "figure_workers": figure_workers,
+        "force_figures": force_figures,
+    }
+    targets = list(only) if only is not None else ["figures", "report"]
+    values = pipeline.run(params, targets=targets, force=force, progress=progress)
+
+    return values.get("report"), [path for _, path in values.get("figures") or []]
+
+
+@dataclass
+class StateReportContext:
+    """Aggregates shared by every per-state report, built once in the parent.
+
+    ``state_rates`` and ``national_rates`` hold the sum-then-divide values of
+    ``DERIVED_METRICS``; ``housing_mixes`` maps each highlight mix to a frame
+    of per-state means (indexed by district-data state name), pooled over the
+    Rural/Urban/Total records like the national highlights.
+    """
+
+    district_enriched: pd.DataFrame
+    state_rates: pd.DataFrame
+    national_rates: pd.Series
+    housing_mixes: Dict[str, pd.DataFrame]
+    housing_rows: pd.Series
+    output_dir: Path
+
+
+@dataclass
+class StateReportResult:
+    state: str
+    report_path: Path
+    districts: int
+    figures_rendered: int
+    figures_total: int
+    seconds: float
+
+
+def state_slug(state: str) -> str:
+    """Directory name for a state's report ("NCT OF DELHI" -> "nct_of_delhi")."""
+
+    return normalize_name(state).replace(" ", "_")
+
+
+def housing_state_names(district_df: pd.DataFrame, housing_cube: AggregationCube) -> pd.Series:
+    """District-data state name for every housing ``State Code``.
+
+    The HLPCA file spells several states differently ("ODISHA" vs "ORISSA"),
+    so states are matched through the census district codes both files share.
+    """
+
+    districts = housing_cube.level("district").sums.index.to_frame(index=False)
+    names = districts["District Code"].map(district_df.groupby("District code")["State name"].first())
+    return names.groupby(districts["State Code"].to_numpy()).first()
+
+
+@traced()
+def build_state_report_context(
+    district_enriched: pd.DataFrame,
+    district_cube: AggregationCube,
+    housing_cube: AggregationCube,
+    output_dir: Path,
+) -> StateReportContext:
+    state_level = housing_cube.level("state")
+    names = housing_state_names(district_enriched, housing_cube)
+    codes = state_level.sums.index.get_level_values("State Code")
+    # Pool each state's Rural/Urban/Total records before dividing.
+    sums = state_level.sums.groupby(codes).sum().rename(index=names)
+    counts = state_level.counts.groupby(codes).sum().rename(index=names)
+    rows = state_level.rows.groupby(codes).sum().rename(index=names)
+
+    return StateReportContext(
+        district_enriched=district_enriched,
+        state_rates=aggregate_derived_metrics(district_cube, "state"),
+        national_rates=aggregate_derived_metrics(district_cube, "india").iloc[0],
+        housing_mixes={
+            mix: sums[columns] / counts[columns]
+            for mix, columns in housing_mix_columns(state_level.sums.columns).items()
+        },
+        housing_rows=rows,
+        output_dir=output_dir,
     )
 
-    return report_path, [path for _, path in plot_paths]
+
+def top_districts_population_figure(districts: pd.DataFrame, state: str) -> FigureSpec:
+    top = districts.set_index("District name")["Population"].nlargest(10)[::-1]
+    return FigureSpec(
+        "top_districts_population.png",
+        "Top districts by total population",
+        "barh",
+        # Plain labels: a categorical index would draw every district in India.
+        pd.Series(top.values / 1_000_000, index=top.index.astype(str)),
+        {"palette": "crest", "xlabel": "Population (millions)", "ylabel": "District", "title": f"{state}: most populous districts"},
+        figsize=(10, 6),
+    )
+
+
+@traced(category="state")
+def generate_state_report(state: str, context: StateReportContext) -> StateReportResult:
+    """Write ``<output_dir>/states/<slug>/`` with the state's report and figures."""
+
+    started = time.perf_counter()
+    output_dir = create_output_dir(context.output_dir / "states" / state_slug(state))
+    districts = context.district_enriched[context.district_enriched["State name"] == state]
+    by_district = districts.set_index("District name")
+    mixes = {
+        mix: frame.loc[state].sort_values(ascending=False) if state in frame.index else pd.Series(dtype=float)
+        for mix, frame in context.housing_mixes.items()
+    }
+
+    figure_specs = [top_districts_population_figure(districts, state), literacy_vs_workers_figure(districts)]
+    if not mixes["roof_mix"].empty:
+        figure_specs.append(roof_material_mix_figure(mixes["roof_mix"]))
+    figures = render_figures(figure_specs, output_dir, max_workers=1)
+
+    lines: List[str] = [f"# {state}: Census & Housing Summary", ""]
+    lines.extend(build_markdown_section("Overview", [
+        f"* Districts: {len(districts):,}",
+        f"* Population: {int(districts['Population'].sum()):,}",
+        f"* Households: {int(districts['Households'].sum()):,}",
+        f"* Housing records: {int(context.housing_rows.get(state, 0)):,}",
+    ]))
+
+    indicators = pd.DataFrame({
+        "Indicator": [DERIVED_METRICS[name].label for name in context.state_rates.columns],
+        state: context.state_rates.loc[state].to_numpy(),
+        "India": context.national_rates.to_numpy(),
+    }).round(2)
+    lines.extend(build_markdown_section("Key indicators", [
+        "State values are household- or population-weighted (sum-then-divide), compared with India as a whole.",
+        "",
+        indicators.to_markdown(index=False),
+    ]))
+
+    district_lines = [
+        "Most populous districts:",
+        save_series_table(by_district["Population"].sort_values(ascending=False)).to_markdown(index=False),
+        "",
+        "Top literacy leaders:",
+        save_series_table(by_district["Literacy_Rate"].sort_values(ascending=False).rename(None)).to_markdown(index=False),
+        "",
+        "Highest internet penetration:",
+        save_series_table(by_district["Internet_Penetration"].sort_values(ascending=False).rename(None)).to_markdown(index=False),
+        "",
+        "Lowest sanitation gap:",
+        save_series_table(by_district["Sanitation_Gap"].sort_values().rename(None)).to_markdown(index=False),
+    ]
+    lines.extend(build_markdown_section("District comparisons", district_lines))
+
+    if all(mix.empty for mix in mixes.values()):
+        housing_lines = ["No housing records matched this state."]
+    else:
+        housing_lines = [
+            "Average composition across the state's housing records:", mixes["roof_mix"].head(10).round(2).to_markdown(), "",
+            "Most prevalent wall materials:", mixes["wall_mix"].head(10).round(2).to_markdown(), "",
+            "Cooking fuel mix highlights:", mixes["cooking_mix"].head(10).round(2).to_markdown(),
+        ]
+    lines.extend(build_markdown_section("Housing fabric & amenities", housing_lines))
+
+    plot_lines = ["Generated visualisations:"]
+    plot_lines.extend([f"* {figure.spec.caption}: {figure.path.name}" for figure in figures])
+    lines.extend(build_markdown_section("Figure index", plot_lines))
+
+    report_path = output_dir / "report.md"
+    report_path.write_text("\n".join(lines), encoding="utf-8")
+    return StateReportResult(
+        state=state,
+        report_path=report_path,
+        districts=len(districts),
+        figures_rendered=sum(figure.rendered for figure in figures),
+        figures_total=len(figures),
+        seconds=time.perf_counter() - started,
+    )
+
+
+_worker_state_context: Optional[StateReportContext] = None
+
+
+def _init_state_worker(context: StateReportContext) -> None:
+    """Process-pool initializer: receive the shared aggregates once per worker."""
+    global _worker_state_context
+    _worker_state_context = context
+
+
+def _run_state_report(state: str) -> StateReportResult:
+    return generate_state_report(state, _worker_state_context)
+
+
+def run_state_reports(
+    data_dir: Path,
+    output_dir: Path,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    compact: bool = True,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[StateReportResult, int, int], None]] = None,
+) -> Tuple[Path, List[StateReportResult]]:
+    """Write one report per state under ``<output_dir>/states/`` plus an index.
+
+    Metrics and both cubes are built once; the per-state reports are then
+    rendered in a process pool of ``max_workers`` (default: the CPU count;
+    1 renders in-process). ``progress(result, completed, total)`` is called
+    as each report finishes.
+    """
+
+    bundle = load_datasets(data_dir, cache_dir=cache_dir, use_cache=use_cache, compact=compact)
+    output_dir = create_output_dir(output_dir)
+
+    district_enriched = compute_district_metrics(bundle.district)
+    context = build_state_report_context(
+        district_enriched,
+        build_district_cube(district_enriched),
+        build_housing_cube(bundle.housing),
+        output_dir,
+    )
+    states = sorted(district_enriched["State name"].unique())
+
+    results: List[StateReportResult] = []
+    workers = min(max_workers or os.cpu_count() or 1, len(states))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_state_worker, initargs=(context,)) as pool:
+            futures = [pool.submit(call_traced, _run_state_report, state) for state in states]
+            for completed, future in enumerate(as_completed(futures), start=1):
+                result, events = future.result()
+                get_tracer().merge(events)
+                results.append(result)
+                if progress is not None:
+                    progress(results[-1], completed, len(states))
+    else:
+        for completed, state in enumerate(states, start=1):
+            results.append(generate_state_report(state, context))
+            if progress is not None:
+                progress(results[-1], completed, len(states))
+    results.sort(key=lambda result: result.state)
+
+    index = pd.DataFrame({
+        "State": [result.state for result in results],
+        "Districts": [result.districts for result in results],
+        "Report": [f"[{state_slug(result.state)}/report.md]({state_slug(result.state)}/report.md)" for result in results],
+    })
+    index_path = output_dir / "states" / "index.md"
+    index_path.write_text("\n".join(["# State reports", "", index.to_markdown(index=False), ""]), encoding="utf-8")
+    return index_path, results
 
 
 def parse_args() -> argparse.Namespace:
@@ -535,17 +1144,145 @@ def parse_args() -> argparse.Namespace:
         default=Path(__file__).resolve().parents[1] / "reports",
         help="Directory to write generated reports and figures (default: ./reports).",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for the columnar dataset cache (default: <data-dir>/.cache).",
+    )
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="Keep pandas' default dtypes instead of the compact storage schema.",
+    )
+    parser.add_argument(
+        "--stream-housing",
+        action="store_true",
+        help="Read the housing CSV in chunks instead of loading it whole (bounded memory).",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_HOUSING_CHUNKSIZE,
+        help=f"Rows per chunk with --stream-housing (default: {DEFAULT_HOUSING_CHUNKSIZE:,}).",
+    )
+    parser.add_argument(
+        "--figure-workers",
+        type=int,
+        default=None,
+        help="Processes used to render figures (default: CPU count; 1 renders in-process).",
+    )
+    parser.add_argument(
+        "--force-figures",
+        action="store_true",
+        help="Redraw every figure even if its inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--force",
+        nargs="*",
+        metavar="STAGE",
+        default=None,
+        help="Rerun the named pipeline stages even if cached (all stages when given no names).",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="STAGE",
+        default=None,
+        help=f"Run only these stages and their dependencies ({', '.join(stage.name for stage in ANALYSIS_STAGES)}).",
+    )
+    parser.add_argument(
+        "--per-state",
+        action="store_true",
+        help="Write one report per state under <output-dir>/states/ instead of the national report.",
+    )
+    parser.add_argument(
+        "--state-workers",
+        type=int,
+        default=None,
+        help="Processes rendering per-state reports with --per-state (default: CPU count).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always parse the CSV files and skip reading or writing the dataset cache.",
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        type=Path,
+        const=Path(DEFAULT_TRACE_PATH),
+        default=None,
+        metavar="PATH",
+        help=f"Record stage timings and memory peaks to a Chrome trace file (default: {DEFAULT_TRACE_PATH}).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    report_path, figures = run_analysis(args.data_dir.resolve(), args.output_dir.resolve())
+    if args.trace is not None:
+        src.tracing.enable(args.trace)
+    if args.per_state:
+        run_per_state(args)
+        src.tracing.finish()
+        return
+
+    def progress(run: StageRun) -> None:
+        print(f"  {run.name:<18} {run.status:<7} {run.seconds:.3f}s")
+
+    try:
+        report_path, figures = run_analysis(
+            args.data_dir.resolve(),
+            args.output_dir.resolve(),
+            cache_dir=args.cache_dir.resolve() if args.cache_dir else None,
+            use_cache=not args.no_cache,
+            compact=not args.no_compact,
+            stream_housing=args.stream_housing,
+            chunksize=args.chunksize,
+            figure_workers=args.figure_workers,
+            force_figures=args.force_figures,
+            force=True if args.force == [] else (args.force or ()),
+            only=args.only,
+            progress=progress,
+        )
+    except PipelineError as exc:
+        sys.exit(f"error: {exc}")
 
     print("Analysis complete.")
-    print(f"Markdown report: {report_path}")
+    if report_path is not None:
+        print(f"Markdown report: {report_path}")
     for fig in figures:
         print(f"Figure saved: {fig}")
+    src.tracing.finish()
+
+
+def run_per_state(args: argparse.Namespace) -> None:
+    def progress(result: StateReportResult, completed: int, total: int) -> None:
+        print(
+            f"[{completed:>2}/{total}] {result.state}: {result.seconds:.2f}s "
+            f"({result.figures_rendered}/{result.figures_total} figures drawn)"
+        )
+
+    started = time.perf_counter()
+    index_path, results = run_state_reports(
+        args.data_dir.resolve(),
+        args.output_dir.resolve(),
+        cache_dir=args.cache_dir.resolve() if args.cache_dir else None,
+        use_cache=not args.no_cache,
+        compact=not args.no_compact,
+        max_workers=args.state_workers,
+        progress=progress,
+    )
+    elapsed = time.perf_counter() - started
+    figures = sum(result.figures_rendered for result in results)
+
+    print("Per-state analysis complete.")
+    print(f"State index: {index_path}")
+    print(
+        f"{len(results)} reports in {elapsed:.2f}s ({len(results) / elapsed:.2f} reports/s, "
+        f"{figures} figures drawn, {sum(result.seconds for result in results):.2f}s of report time)"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+"""Columnar on-disk cache for the parsed census datasets.
+
+Each cached frame lives in its own directory holding one ``.npy`` file per
+column plus a ``manifest.json`` that records column names, dtypes and a
+fingerprint (size, modification time and SHA-256) of the source files the
+frame was parsed from. String columns are dictionary-encoded as integer codes
+and a unicode category array, so every file can be read back with
+``numpy.load`` without unpickling anything.
+
+A cache entry is only reused while its recorded sources still match the files
+on disk; any change in size or content forces a re-parse and a rewrite.
+
+Entries can also be opened memory-mapped (``mmap=True``): numeric columns and
+string codes are then backed read-only by the page cache, so every process
+that maps the same entry shares one physical copy of the data.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+_HASH_BLOCK_BYTES = 1 << 20
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in 1 MiB blocks."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_sources(paths: Iterable[Path]) -> List[Dict[str, Any]]:
+    """Fingerprint source files by name, size, mtime and content hash."""
+
+    described = []
+    for path in paths:
+        stat = path.stat()
+        described.append({
+            "name": path.name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_digest(path),
+        })
+    return described
+
+
+def sources_match(recorded: List[Dict[str, Any]], paths: List[Path]) -> bool:
+    """Check recorded fingerprints against the current files.
+
+    Size and mtime are compared first; the content hash is only recomputed
+    when the size matches but the mtime moved (e.g. after a copy or touch).
+    """
+
+    if len(recorded) != len(paths):
+        return False
+    for entry, path in zip(recorded, paths):
+        if entry.get("name") != path.name:
+            return False
+        stat = path.stat()
+        if stat.st_size != entry.get("size"):
+            return False
+        if stat.st_mtime_ns != entry.get("mtime_ns") and file_digest(path) != entry.get("sha256"):
+            return False
+    return True
+
+
+def _codes_dtype(n_categories: int) -> np.dtype:
+    # Match the width pandas itself picks for categorical codes, so that
+    # ``Categorical.from_codes`` can wrap mapped codes without casting them.
+    for candidate in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(candidate).max:
+            return np.dtype(candidate)
+    return np.dtype(np.int64)
+
+
+def _encode_strings(values: pd.Series) -> Dict[str, np.ndarray]:
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    if len(uniques) and pd.api.types.infer_dtype(uniques, skipna=True) != "string":
+        raise ValueError(f"column {values.name!r} mixes strings with other types")
+    return {
+        "codes": codes.astype(_codes_dtype(len(uniques))),
+        "categories": np.asarray(uniques, dtype=str),
+    }
+
+
+def store_frame(
+    cache_dir: Path,
+    name: str,
+    df: pd.DataFrame,
+    sources: List[Path],
+    key: Optional[Dict[str, Any]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Write ``df`` to ``cache_dir/name`` as per-column ``.npy`` files.
+
+    ``key`` must match on load for the entry to be reused; ``meta`` is stored
+    verbatim in the manifest for callers to read back with ``read_manifest``.
+
+    The directory is assembled under a temporary name and swapped into place,
+    so concurrent readers never observe a half-written entry. Raises
+    ``ValueError`` for frames the format cannot represent (non-default index,
+    mixed-type object columns).
+    """
+
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise ValueError("only frames with a default RangeIndex can be cached")
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=cache_dir))
+    try:
+        columns = []
+        for position, column in enumerate(df.columns):
+            series = df[column]
+            stem = f"c{position:04d}"
+            entry: Dict[str, Any] = {"name": str(column), "dtype": str(series.dtype)}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry["kind"] = "category"
+                entry["ordered"] = bool(series.cat.ordered)
+                np.save(staging / f"{stem}.codes.npy", series.cat.codes.to_numpy())
+                np.save(staging / f"{stem}.categories.npy", np.asarray(series.cat.categories, dtype=str))
+            elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+                entry["kind"] = "array"
+                np.save(staging / f"{stem}.npy", series.to_numpy())
+            else:
+                entry["kind"] = "dictionary"
+                encoded = _encode_strings(series)
+                np.save(staging / f"{stem}.codes.npy", encoded["codes"])
+                np.save(staging / f"{stem}.categories.npy", encoded["categories"])
+            entry["stem"] = stem
+            columns.append(entry)
+
+        manifest = {
+            "format": CACHE_FORMAT_VERSION,
+            "key": key or {},
+            "meta": meta or {},
+            "rows": int(len(df)),
+            "sources": describe_sources(sources),
+            "columns": columns,
+        }
+        (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+
+        target = cache_dir / name
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return cache_dir / name
+
+
+def _decode_column(entry_dir: Path, entry: Dict[str, Any], mmap: bool) -> Any:
+    stem = entry["stem"]
+    mmap_mode = "r" if mmap else None
+    if entry["kind"] == "array":
+        return np.load(entry_dir / f"{stem}.npy", mmap_mode=mmap_mode)
+
+    codes = np.load(entry_dir / f"{stem}.codes.npy", mmap_mode=mmap_mode)
+    categories = np.load(entry_dir / f"{stem}.categories.npy")
+    categorical = pd.Categorical.from_codes(codes, categories=categories, ordered=entry.get("ordered", False))
+    if entry["kind"] == "category" or mmap:
+        # Decoding strings would materialise a private object array per
+        # process, so mapped frames keep them as categoricals over shared codes.
+        return categorical
+    return pd.Series(categorical).astype(entry["dtype"]).to_numpy()
+
+
+def read_manifest(cache_dir: Path, name: str) -> Optional[Dict[str, Any]]:
+    """Return the manifest of a cache entry, or ``None`` if it is absent or unreadable."""
+
+    manifest_path = cache_dir / name / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def cached_frame_shape(
+    cache_dir: Path,
+    name: str,
+    sources: List[Path],
+    key: Optional[Dict[str, Any]] = None,
+) -> Optional[Tuple[int, int]]:
+    """Return ``(rows, columns)`` of a valid cache entry from its manifest alone."""
+
+    manifest = read_manifest(cache_dir, name)
+    if manifest is None:
+        return None
+    if manifest.get("format") != CACHE_FORMAT_VERSION or manifest.get("key", {}) != (key or {}):
+        return None
+    try:
+        if not sources_match(manifest["sources"], sources):
+            return None
+        return int(manifest["rows"]), len(manifest["columns"])
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+
+
+def load_cached_frame(
+    cache_dir: Path,
+    name: str,
+    sources: List[Path],
+    key: Optional[Dict[str, Any]] = None,
+    mmap: bool = False,
+) -> Optional[pd.DataFrame]:
+    """Load a cached frame if it exists and is still valid for ``sources``.
+
+    With ``mmap=True`` the column files are mapped read-only instead of read
+    into private memory, and string columns come back as categoricals.
+    Returns ``None`` on any miss: absent entry, format or key mismatch,
+    changed source files, or a damaged column file.
+    """
+
+    manifest = read_manifest(cache_dir, name)
+    if manifest is None:
+        return None
+    if manifest.get("format") != CACHE_FORMAT_VERSION or manifest.get("key", {}) != (key or {}):
+        return None
+    try:
+        if not sources_match(manifest["sources"], sources):
+            return None
+        entry_dir = cache_dir / name
+        data = {entry["name"]: _decode_column(entry_dir, entry, mmap) for entry in manifest["columns"]}
+    except (OSError, ValueError, KeyError):
+        return None
+
+    # copy=False keeps each column as its own block over the loaded (or mapped)
+    # array instead of consolidating everything into fresh 2-D blocks.
+    df = pd.DataFrame(data, copy=False)
+    if len(df) != manifest.get("rows"):
+        return None
+    return df
@@ -0,0 +1,131 @@
+"""Registry of derived census indicators.
+
+Every indicator is declared once in ``DERIVED_METRICS`` as
+``offset + scale * sum(numerator) / sum(denominator)`` over base columns. The
+same definition drives both granularities:
+
+* ``compute_derived_metrics`` evaluates it per row (district), reading each
+  base column into NumPy once however many indicators share it;
+* ``aggregate_derived_metrics`` evaluates it per group from the sums of an
+  ``AggregationCube`` level (sum-then-divide, e.g. a population-weighted
+  state literacy rate rather than the mean of district rates).
+
+Only the requested indicators are computed, so adding an entry costs nothing
+for consumers that do not ask for it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.aggregation_cube import AggregationCube
+
+
+@dataclass(frozen=True)
+class DerivedMetric:
+    """``offset + scale * sum(numerator) / sum(denominator)``."""
+
+    name: str
+    numerator: Tuple[str, ...]
+    denominator: Tuple[str, ...]
+    scale: float = 100.0
+    offset: float = 0.0
+    label: str = ""
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Base columns the metric reads."""
+
+        return tuple(dict.fromkeys(self.numerator + self.denominator))
+
+
+DERIVED_METRICS: Dict[str, DerivedMetric] = {
+    metric.name: metric
+    for metric in (
+        DerivedMetric("Sex_Ratio", ("Female",), ("Male",), scale=1000.0, label="Females per 1000 males"),
+        DerivedMetric("Literacy_Rate", ("Literate",), ("Population",), label="Literacy rate (%)"),
+        DerivedMetric("Worker_Participation_Rate", ("Workers",), ("Population",), label="Worker participation (%)"),
+        DerivedMetric("Urbanisation_Rate", ("Urban_Households",), ("Households",), label="Urban households (%)"),
+        DerivedMetric("Internet_Penetration", ("Households_with_Internet",), ("Households",), label="Internet penetration (%)"),
+        DerivedMetric(
+            "Mobile_Phone_Access", ("Households_with_Telephone_Mobile_Phone",), ("Households",),
+            label="Mobile phone access (%)",
+        ),
+        DerivedMetric(
+            "Sanitation_Gap", ("Having_latrine_facility_within_the_premises_Total_Households",), ("Households",),
+            scale=-100.0, offset=100.0, label="Sanitation gap (%)",
+        ),
+    )
+}
+
+
+def get_derived_metric(name: str) -> DerivedMetric:
+    try:
+        return DERIVED_METRICS[name]
+    except KeyError:
+        raise KeyError(f"unknown derived metric {name!r}; available: {', '.join(DERIVED_METRICS)}") from None
+
+
+def _resolve(names: Optional[Iterable[str]]) -> Sequence[DerivedMetric]:
+    if names is None:
+        return list(DERIVED_METRICS.values())
+    return [get_derived_metric(name) for name in dict.fromkeys(names)]
+
+
+def _combine(metric: DerivedMetric, numerator, denominator):
+    values = numerator / denominator
+    if metric.scale != 1.0:
+        values = metric.scale * values
+    if metric.offset != 0.0:
+        values = metric.offset + values
+    return values
+
+
+def compute_derived_metrics(df: pd.DataFrame, names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Per-row values of the requested metrics (default: all), indexed like ``df``.
+
+    ``df`` is only read: each base column is converted to a NumPy array once
+    and shared by every metric that uses it, and numerator/denominator sums
+    are memoised across metrics.
+    """
+
+    metrics = _resolve(names)
+    arrays: Dict[str, np.ndarray] = {}
+    sums: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    def column_sum(columns: Tuple[str, ...]) -> np.ndarray:
+        if columns not in sums:
+            for column in columns:
+                if column not in arrays:
+                    arrays[column] = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            total = arrays[columns[0]]
+            for column in columns[1:]:
+                total = total + arrays[column]
+            sums[columns] = total
+        return sums[columns]
+
+    derived = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for metric in metrics:
+            derived[metric.name] = _combine(metric, column_sum(metric.numerator), column_sum(metric.denominator))
+    return pd.DataFrame(derived, index=df.index)
+
+
+def aggregate_derived_metrics(
+    cube: AggregationCube,
+    level: str,
+    names: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Sum-then-divide values of the requested metrics for every group of ``level``."""
+
+    sums = cube.level(level).sums
+    derived = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for metric in _resolve(names):
+            derived[metric.name] = _combine(
+                metric, sums[list(metric.numerator)].sum(axis=1), sums[list(metric.denominator)].sum(axis=1)
+            )
+    return pd.DataFrame(derived, index=sums.index)
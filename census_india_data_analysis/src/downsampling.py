@@ -0,0 +1,100 @@
+"""Deterministic point-budget downsampling for scatter charts.
+
+``grid_downsample`` reduces a 2-D point cloud to a fixed budget while keeping
+its shape: the points holding the minimum and maximum of each axis are always
+kept, the remaining budget is split across the cells of a regular grid in
+proportion to how many points fall into each cell (every occupied cell gets at
+least one point while the budget allows). Within a cell the points are ranked
+by distance from the cell's centroid: a single pick is the most central point,
+and larger quotas take evenly spaced ranks from the most central to the
+outermost, so a cell's spread is kept as well as its centre. The same input
+always yields the same selection, so charts built from it can be cached.
+"""
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+import numpy as np
+
+
+def _normalise(values: np.ndarray) -> np.ndarray:
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.zeros_like(values)
+    return (values - low) / (high - low)
+
+
+def _allocate(counts: np.ndarray, budget: int) -> np.ndarray:
+    """Largest-remainder split of ``budget`` over cells, at least one per cell."""
+
+    if budget <= len(counts):
+        # Not enough room for every cell: keep one point from the densest ones.
+        order = np.lexsort((np.arange(len(counts)), -counts))
+        quota = np.zeros(len(counts), dtype=np.int64)
+        quota[order[:budget]] = 1
+        return quota
+
+    quota = np.ones(len(counts), dtype=np.int64)
+    spare = counts - 1
+    remaining = budget - len(counts)
+    if spare.sum() <= remaining:
+        return counts.astype(np.int64)
+    share = spare * (remaining / spare.sum())
+    extra = np.floor(share).astype(np.int64)
+    leftover = remaining - int(extra.sum())
+    order = np.lexsort((np.arange(len(counts)), -(share - extra)))
+    extra[order[:leftover]] += 1
+    return quota + np.minimum(extra, spare)
+
+
+def grid_downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    budget: int,
+    grid_size: Optional[int] = None,
+) -> np.ndarray:
+    """Return sorted row positions of at most ``budget`` representative points.
+
+    Rows where either coordinate is missing are never selected. ``grid_size``
+    defaults to ``ceil(sqrt(budget))`` cells per axis.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(valid) <= budget:
+        return valid
+    if budget <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    xs, ys = _normalise(x[valid]), _normalise(y[valid])
+    extremes = {int(np.argmin(xs)), int(np.argmax(xs)), int(np.argmin(ys)), int(np.argmax(ys))}
+    chosen = sorted(extremes)[:budget]
+
+    grid = grid_size or max(1, math.ceil(math.sqrt(budget)))
+    cell_x = np.minimum((xs * grid).astype(np.int64), grid - 1)
+    cell_y = np.minimum((ys * grid).astype(np.int64), grid - 1)
+    cells = cell_x * grid + cell_y
+
+    candidates = np.setdiff1d(np.arange(len(valid)), chosen)
+    occupied, inverse, counts = np.unique(cells[candidates], return_inverse=True, return_counts=True)
+    quotas = _allocate(counts, budget - len(chosen))
+
+    # Rank each cell's candidates by distance from its centroid, then take
+    # evenly spaced ranks (just the most central one for a quota of 1).
+    by_cell = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    for cell, quota in enumerate(quotas):
+        if quota == 0:
+            continue
+        members = candidates[by_cell[starts[cell]:starts[cell] + counts[cell]]]
+        distance = (xs[members] - xs[members].mean()) ** 2 + (ys[members] - ys[members].mean()) ** 2
+        ranked = members[np.lexsort((members, distance))]
+        if quota == 1:
+            chosen.append(int(ranked[0]))
+        else:
+            picks = np.unique(np.linspace(0, len(ranked) - 1, quota).round().astype(np.int64))
+            chosen.extend(int(position) for position in ranked[picks])
+
+    return np.sort(valid[np.asarray(chosen, dtype=np.intp)])
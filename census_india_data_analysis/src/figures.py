@@ -0,0 +1,200 @@
+"""Content-addressed rendering of the report figures.
+
+A figure is described by a ``FigureSpec``: the small series or frame it plots,
+the kind of chart and its options (labels, palette, size, dpi). Rendering
+draws on an object-oriented ``matplotlib.figure.Figure`` with an Agg canvas,
+never through the pyplot state machine, so specs can be rendered in worker
+processes independently of each other.
+
+Each spec is keyed by a SHA-256 over its data, options and the plotting
+library versions. ``render_figures`` records the key of every PNG it writes
+in a ``.figures.json`` manifest next to the images and skips specs whose key
+and file are unchanged, so a rerun over the same data draws nothing.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import matplotlib
+import pandas as pd
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.tracing import call_traced, get_tracer, span, traced
+
+FIGURE_FORMAT_VERSION = 1
+FIGURE_MANIFEST = ".figures.json"
+DEFAULT_DPI = 150
+
+# Applied at import so pool workers draw with the same theme as the parent.
+sns.set_theme(style="whitegrid")
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """Everything needed to draw one PNG.
+
+    ``caption`` is the report's name for the figure; ``options`` holds the
+    axis labels, title, palette and kind-specific settings.
+    """
+
+    filename: str
+    caption: str
+    kind: str
+    data: Union[pd.Series, pd.DataFrame]
+    options: Dict[str, Any] = field(default_factory=dict)
+    figsize: tuple = (8, 6)
+    dpi: int = DEFAULT_DPI
+
+
+@dataclass(frozen=True)
+class RenderedFigure:
+    """Outcome of ``render_figures`` for one spec."""
+
+    spec: FigureSpec
+    path: Path
+    key: str
+    rendered: bool
+    seconds: float = 0.0
+
+
+def _draw_barh(ax, data: pd.Series, options: Dict[str, Any]) -> None:
+    sns.barplot(x=data.values, y=data.index, palette=options.get("palette"), ax=ax)
+
+
+def _draw_scatter(ax, data: pd.DataFrame, options: Dict[str, Any]) -> None:
+    sns.scatterplot(
+        data=data,
+        x=options["x"],
+        y=options["y"],
+        hue=options.get("hue"),
+        palette=options.get("palette"),
+        alpha=options.get("alpha", 1.0),
+        ax=ax,
+    )
+    if options.get("legend_title"):
+        ax.legend(title=options["legend_title"], loc=options.get("legend_loc", "best"), frameon=True)
+
+
+FIGURE_KINDS = {
+    "barh": _draw_barh,
+    "scatter": _draw_scatter,
+}
+
+
+def figure_key(spec: FigureSpec) -> str:
+    """Content hash of what ``spec`` draws and how."""
+
+    frame = spec.data if isinstance(spec.data, pd.DataFrame) else spec.data.to_frame()
+    settings = {
+        "format": FIGURE_FORMAT_VERSION,
+        "matplotlib": matplotlib.__version__,
+        "seaborn": sns.__version__,
+        "kind": spec.kind,
+        "options": spec.options,
+        "figsize": list(spec.figsize),
+        "dpi": spec.dpi,
+    }
+    digest = hashlib.sha256()
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(json.dumps([str(column) for column in frame.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def draw_figure(spec: FigureSpec) -> Figure:
+    """Draw ``spec`` on a new Agg-backed ``Figure`` (no pyplot involved)."""
+
+    try:
+        draw = FIGURE_KINDS[spec.kind]
+    except KeyError:
+        raise ValueError(f"unknown figure kind {spec.kind!r}; available: {', '.join(FIGURE_KINDS)}") from None
+
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    draw(ax, spec.data, spec.options)
+    ax.set_xlabel(spec.options.get("xlabel", ""))
+    ax.set_ylabel(spec.options.get("ylabel", ""))
+    ax.set_title(spec.options.get("title", ""))
+    fig.tight_layout()
+    return fig
+
+
+def save_figure(spec: FigureSpec, path: Path) -> float:
+    """Render ``spec`` to ``path``; returns the wall time in seconds."""
+
+    started = time.perf_counter()
+    with span(spec.filename, "figure"):
+        draw_figure(spec).savefig(path, dpi=spec.dpi)
+    return time.perf_counter() - started
+
+
+def read_figure_manifest(output_dir: Path) -> Dict[str, str]:
+    try:
+        return json.loads((output_dir / FIGURE_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_figure_manifest(output_dir: Path, manifest: Dict[str, str]) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=output_dir, prefix=FIGURE_MANIFEST, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_name, output_dir / FIGURE_MANIFEST)
+
+
+@traced()
+def render_figures(
+    specs: List[FigureSpec],
+    output_dir: Path,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> List[RenderedFigure]:
+    """Write every spec to ``output_dir``, skipping figures that are up to date.
+
+    With ``max_workers`` greater than 1 (default: the CPU count) and more than
+    one figure to draw, figures are rendered in a process pool. ``force``
+    redraws every figure regardless of the manifest.
+    """
+
+    manifest = read_figure_manifest(output_dir)
+    keys = [figure_key(spec) for spec in specs]
+    pending = [
+        position for position, (spec, key) in enumerate(zip(specs, keys))
+        if force or manifest.get(spec.filename) != key or not (output_dir / spec.filename).exists()
+    ]
+
+    seconds: Dict[int, float] = {}
+    workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                position: pool.submit(call_traced, save_figure, specs[position], output_dir / specs[position].filename)
+                for position in pending
+            }
+            for position, future in futures.items():
+                seconds[position], events = future.result()
+                get_tracer().merge(events)
+    else:
+        for position in pending:
+            seconds[position] = save_figure(specs[position], output_dir / specs[position].filename)
+
+    if pending:
+        for position in pending:
+            manifest[specs[position].filename] = keys[position]
+        _write_figure_manifest(output_dir, manifest)
+
+    return [
+        RenderedFigure(spec, output_dir / spec.filename, key, position in seconds, round(seconds.get(position, 0.0), 3))
+        for position, (spec, key) in enumerate(zip(specs, keys))
+    ]
@@ -0,0 +1,136 @@
+"""Name and code lookup index over the district metrics frame.
+
+Built once per loaded dataset, the index maps state names, district names
+and district codes to row positions, and keeps a pre-sliced frame per state
+so per-entity endpoints do not rescan the whole table on every request.
+
+Names typed by users are resolved in three steps: exact match, then a
+case- and punctuation-insensitive match, then a fuzzy match on character
+trigrams (so "Tamilnadu" or "kerla" still find their state).
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MIN_SIMILARITY = 0.4
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name: str) -> str:
+    """Casefold and collapse punctuation/whitespace runs to single spaces."""
+
+    return _NON_ALNUM.sub(" ", str(name).casefold()).strip()
+
+
+def trigrams(name: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded at the word edges."""
+
+    padded = f"  {normalize_name(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Resolve user-typed names to canonical ones among a fixed set of names."""
+
+    def __init__(self, names: List[str]):
+        self.names = list(dict.fromkeys(names))
+        self._exact: Set[str] = set(self.names)
+        self._normalized: Dict[str, str] = {}
+        for name in self.names:
+            self._normalized.setdefault(normalize_name(name), name)
+
+        self._grams: Dict[str, Set[str]] = {name: trigrams(name) for name in self.names}
+        self._postings: Dict[str, List[str]] = defaultdict(list)
+        for name, grams in self._grams.items():
+            for gram in grams:
+                self._postings[gram].append(name)
+
+    def similar(self, query: str, limit: int = 5, min_similarity: float = DEFAULT_MIN_SIMILARITY) -> List[Tuple[str, float]]:
+        """Names sharing trigrams with ``query``, ranked by Jaccard similarity."""
+
+        query_grams = trigrams(query)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for name in self._postings.get(gram, ()):
+                shared[name] += 1
+
+        scored = []
+        for name, overlap in shared.items():
+            score = overlap / (len(query_grams) + len(self._grams[name]) - overlap)
+            if score >= min_similarity:
+                scored.append((name, round(score, 3)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def resolve(self, query: str, fuzzy: bool = True, min_similarity: float = DEFAULT_MIN_SIMILARITY) -> Optional[str]:
+        """Canonical name for ``query``, or ``None`` if nothing matches closely enough."""
+
+        if query in self._exact:
+            return query
+        normalized = self._normalized.get(normalize_name(query))
+        if normalized is not None or not fuzzy:
+            return normalized
+        best = self.similar(query, limit=1, min_similarity=min_similarity)
+        return best[0][0] if best else None
+
+
+class DistrictLookupIndex:
+    """Row positions and per-state views of a district-level frame."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        state_col: str = "State name",
+        district_col: str = "District name",
+        code_col: str = "District code",
+    ):
+        self.df = df
+        state_values = df[state_col].astype(object).to_numpy()
+        district_values = df[district_col].astype(object).to_numpy()
+
+        self.state_positions = self._group_positions(state_values)
+        self.district_positions = self._group_positions(district_values)
+        self.code_positions: Dict[int, int] = {}
+        if code_col in df.columns:
+            for position, code in enumerate(df[code_col].to_numpy()):
+                self.code_positions.setdefault(int(code), position)
+
+        self.states = NameIndex(list(self.state_positions))
+        self.districts = NameIndex(list(self.district_positions))
+        self._state_frames = {
+            state: df.iloc[positions] for state, positions in self.state_positions.items()
+        }
+
+    @staticmethod
+    def _group_positions(values: np.ndarray) -> Dict[str, np.ndarray]:
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for position, value in enumerate(values):
+            groups[value].append(position)
+        return {value: np.asarray(positions, dtype=np.intp) for value, positions in groups.items()}
+
+    def resolve_state(self, name: str, fuzzy: bool = True) -> Optional[str]:
+        return self.states.resolve(name, fuzzy=fuzzy)
+
+    def resolve_district(self, name: str, fuzzy: bool = True) -> Optional[str]:
+        return self.districts.resolve(name, fuzzy=fuzzy)
+
+    def state_frame(self, name: str) -> Optional[pd.DataFrame]:
+        """Pre-sliced rows of a state (name resolved as in ``resolve_state``)."""
+
+        state = self.resolve_state(name)
+        return self._state_frames[state] if state is not None else None
+
+    def district_rows(self, name: str) -> Optional[pd.DataFrame]:
+        """All rows for a district name; several states share some names."""
+
+        district = self.resolve_district(name)
+        return self.df.iloc[self.district_positions[district]] if district is not None else None
+
+    def district_by_code(self, code: int) -> Optional[pd.Series]:
+        position = self.code_positions.get(int(code))
+        return self.df.iloc[position] if position is not None else None
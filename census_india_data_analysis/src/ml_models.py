@@ -17,19 +17,139 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score, classification_report, silhouette_score
 from sklearn.decomposition import PCA
 import joblib
+import hashlib
+import json
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import warnings
+
+from src.tracing import call_traced, get_tracer, span, traced
 warnings.filterwarnings('ignore')
 
 
+# Hyperparameters for every estimator, keyed by model name. The model
+# registry hashes this table, so any change here invalidates saved models.
+SPLIT_PARAMS: Dict[str, Any] = {'test_size': 0.2, 'random_state': 42}
+
+MODEL_HYPERPARAMS: Dict[str, Dict[str, Any]] = {
+    'literacy_predictor': {'n_estimators': 100, 'random_state': 42, 'max_depth': 10},
+    'internet_predictor': {'n_estimators': 100, 'random_state': 42, 'max_depth': 10},
+    'sanitation_classifier': {'n_estimators': 100, 'random_state': 42, 'max_depth': 10},
+    'district_clustering': {'random_state': 42, 'n_init': 10},
+    'anomaly_detector': {'contamination': 0.05, 'random_state': 42},
+    'pca': {'n_components': 3},
+}
+
+
+# Threshold rules for policy recommendations. A rule fires when all of its
+# (column, operator, threshold) conditions hold; ``score`` is added to the
+# district's priority score and ``reason`` is formatted with the row's values.
+POLICY_RULES: List[Dict[str, Any]] = [
+    {
+        'category': 'Education',
+        'priority': 'High',
+        'intervention': 'Adult Literacy Programs',
+        'conditions': [('Literacy_Rate', '<', 70)],
+        'reason': "Literacy rate is {Literacy_Rate:.1f}%, below national average",
+        'expected_impact': 'Improve workforce quality and economic opportunities',
+        'score': 3
+    },
+    {
+        'category': 'Digital Infrastructure',
+        'priority': 'High',
+        'intervention': 'Broadband Expansion Program',
+        'conditions': [('Internet_Penetration', '<', 15)],
+        'reason': "Internet penetration is only {Internet_Penetration:.1f}%",
+        'expected_impact': 'Enable digital education, e-governance, and economic growth',
+        'score': 3
+    },
+    {
+        'category': 'Sanitation',
+        'priority': 'Critical',
+        'intervention': 'Swachh Bharat Mission - Toilet Construction',
+        'conditions': [('Sanitation_Gap', '>', 30)],
+        'reason': "Sanitation gap is {Sanitation_Gap:.1f}%, indicating poor latrine coverage",
+        'expected_impact': 'Improve public health, reduce disease burden, enhance dignity',
+        'score': 4
+    },
+    {
+        'category': 'Infrastructure',
+        'priority': 'Medium',
+        'intervention': 'Rural Connectivity and Electrification',
+        'conditions': [('Urbanisation_Rate', '<', 20), ('Mobile_Phone_Access', '<', 50)],
+        'reason': "Low urbanization ({Urbanisation_Rate:.1f}%) with poor mobile access",
+        'expected_impact': 'Bridge urban-rural divide, improve communication',
+        'score': 2
+    },
+    {
+        'category': 'Employment',
+        'priority': 'Medium',
+        'intervention': 'Skill Development and Job Creation Programs',
+        'conditions': [('Worker_Participation_Rate', '<', 35)],
+        'reason': "Worker participation is {Worker_Participation_Rate:.1f}%, below optimal levels",
+        'expected_impact': 'Increase household income and economic productivity',
+        'score': 2
+    },
+]
+
+_POLICY_OPERATORS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+
+# Estimators that accept scikit-learn's ``n_jobs`` parallelism setting.
+PARALLEL_ESTIMATORS = ('literacy_predictor', 'internet_predictor', 'sanitation_classifier', 'anomaly_detector')
+
+
 class MLModelManager:
-    """Central manager for all ML models and predictions."""
+    """Central manager for all ML models and predictions.
+    
+    ``n_jobs`` is passed to the estimators that support it (random forests and
+    the isolation forest); ``None`` keeps scikit-learn's single-threaded default.
     
-    def __init__(self):
+    Cleaned, scaled feature matrices and their fitted scalers are memoised per
+    source frame, keyed by (row mask, feature list), so models that train on
+    the same rows and columns share one pass over the data. The store is
+    LRU-evicted once it holds more than ``feature_cache_bytes`` of matrices,
+    and reset whenever a different source frame is passed in; source frames
+    are treated as immutable.
+    """
+    
+    def __init__(self, n_jobs: Optional[int] = None, feature_cache_bytes: int = 256 * 1024 * 1024):
         self.models = {}
         self.scalers = {}
         self.feature_names = {}
+        self.n_jobs = n_jobs
+        self.feature_cache_bytes = feature_cache_bytes
+        self.feature_cache_hits = 0
+        self.feature_cache_misses = 0
+        self._feature_cache: 'OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[np.ndarray, np.ndarray, StandardScaler]]' = OrderedDict()
+        self._feature_cache_size = 0
+        self._feature_source: Optional[weakref.ref] = None
+        self._policy_table: Optional[Dict[str, Any]] = None
+        self._policy_source: Optional[weakref.ref] = None
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the memoised tables, which are tied to a live frame."""
+        state = self.__dict__.copy()
+        state.update(
+            _feature_cache=OrderedDict(), _feature_cache_size=0, _feature_source=None,
+            _policy_table=None, _policy_source=None
+        )
+        return state
+    
+    def estimator_params(self, model_name: str) -> Dict[str, Any]:
+        """Hyperparameters for ``model_name`` plus this manager's ``n_jobs``."""
+        params = dict(MODEL_HYPERPARAMS[model_name])
+        if self.n_jobs is not None and model_name in PARALLEL_ESTIMATORS:
+            params['n_jobs'] = self.n_jobs
+        return params
         
     def prepare_features(self, df: pd.DataFrame, feature_cols: List[str]) -> Tuple[np.ndarray, StandardScaler]:
         """Prepare and scale features for ML models."""
@@ -42,6 +162,52 @@ class MLModelManager:
         
         return X_scaled, scaler
     
+    def clear_feature_cache(self):
+        """Drop all memoised feature matrices."""
+        self._feature_cache.clear()
+        self._feature_cache_size = 0
+        self._feature_source = None
+    
+    def prepare_cached_features(
+        self,
+        df: pd.DataFrame,
+        feature_cols: List[str],
+        required_cols: List[str] = ()
+    ) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
+        """Drop incomplete rows, then prepare and scale features, with memoisation.
+        
+        Rows missing any of ``required_cols`` or ``feature_cols`` are dropped.
+        Returns the boolean row mask over ``df``, the scaled (read-only) matrix
+        and its fitted scaler; repeated requests for the same rows and columns
+        of the same frame reuse the stored matrix and scaler.
+        """
+        source = self._feature_source() if self._feature_source is not None else None
+        if source is not df:
+            self.clear_feature_cache()
+            self._feature_source = weakref.ref(df)
+        
+        check_cols = list(dict.fromkeys(list(required_cols) + list(feature_cols)))
+        mask = df[check_cols].notna().all(axis=1).to_numpy()
+        mask_digest = hashlib.blake2b(np.packbits(mask).tobytes() + str(mask.size).encode(), digest_size=16).hexdigest()
+        key = (mask_digest, tuple(feature_cols))
+        
+        cached = self._feature_cache.get(key)
+        if cached is not None:
+            self._feature_cache.move_to_end(key)
+            self.feature_cache_hits += 1
+            return cached
+        
+        self.feature_cache_misses += 1
+        X, scaler = self.prepare_features(df.loc[mask, feature_cols], feature_cols)
+        X.flags.writeable = False
+        entry = (mask, X, scaler)
+        self._feature_cache[key] = entry
+        self._feature_cache_size += X.nbytes + mask.nbytes
+        while self._feature_cache_size > self.feature_cache_bytes and len(self._feature_cache) > 1:
+            _, (old_mask, old_X, _) = self._feature_cache.popitem(last=False)
+            self._feature_cache_size -= old_X.nbytes + old_mask.nbytes
+        return entry
+    
     def train_literacy_predictor(self, district_df: pd.DataFrame) -> Dict[str, Any]:
         """Train model to predict literacy rates."""
         feature_cols = [
@@ -51,15 +217,14 @@ class MLModelManager:
         ]
         
         # Prepare data
-        df_clean = district_df.dropna(subset=['Literacy_Rate'] + feature_cols)
-        X, scaler = self.prepare_features(df_clean, feature_cols)
-        y = df_clean['Literacy_Rate'].values
+        mask, X, scaler = self.prepare_cached_features(district_df, feature_cols, ['Literacy_Rate'])
+        y = district_df.loc[mask, 'Literacy_Rate'].values
         
         # Train-test split
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, **SPLIT_PARAMS)
         
         # Train model
-        model = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
+        model = RandomForestRegressor(**self.estimator_params('literacy_predictor'))
         model.fit(X_train, y_train)
         
         # Evaluate
@@ -92,13 +257,12 @@ class MLModelManager:
             'Worker_Participation_Rate', 'Population'
         ]
         
-        df_clean = district_df.dropna(subset=['Internet_Penetration'] + feature_cols)
-        X, scaler = self.prepare_features(df_clean, feature_cols)
-        y = df_clean['Internet_Penetration'].values
+        mask, X, scaler = self.prepare_cached_features(district_df, feature_cols, ['Internet_Penetration'])
+        y = district_df.loc[mask, 'Internet_Penetration'].values
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, **SPLIT_PARAMS)
         
-        model = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
+        model = RandomForestRegressor(**self.estimator_params('internet_predictor'))
         model.fit(X_train, y_train)
         
         y_pred = model.predict(X_test)
@@ -127,22 +291,19 @@ class MLModelManager:
             'Worker_Participation_Rate', 'Internet_Penetration'
         ]
         
-        # Create risk categories based on sanitation gap
-        df_clean = district_df.dropna(subset=['Sanitation_Gap'] + feature_cols).copy()
+        mask, X, scaler = self.prepare_cached_features(district_df, feature_cols, ['Sanitation_Gap'])
         
         # Define risk levels: Low (0-20%), Medium (20-50%), High (>50%)
-        df_clean['Sanitation_Risk'] = pd.cut(
-            df_clean['Sanitation_Gap'],
+        sanitation_risk = pd.cut(
+            district_df.loc[mask, 'Sanitation_Gap'],
             bins=[0, 20, 50, 100],
             labels=['Low', 'Medium', 'High']
         )
+        y = sanitation_risk.values
         
-        X, scaler = self.prepare_features(df_clean, feature_cols)
-        y = df_clean['Sanitation_Risk'].values
+        X_train, X_test, y_train, y_test = train_test_split(X, y, **SPLIT_PARAMS)
         
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        model = RandomForestClassifier(n_estimators=100, random_state=42, max_depth=10)
+        model = RandomForestClassifier(**self.estimator_params('sanitation_classifier'))
         model.fit(X_train, y_train)
         
         y_pred = model.predict(X_test)
@@ -174,11 +335,11 @@ class MLModelManager:
             'Sex_Ratio'
         ]
         
-        df_clean = district_df.dropna(subset=feature_cols).copy()
-        X, scaler = self.prepare_features(df_clean, feature_cols)
+        mask, X, scaler = self.prepare_cached_features(district_df, feature_cols)
+        df_clean = district_df.loc[mask, feature_cols + ['District name']].copy()
         
         # K-Means clustering
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        kmeans = KMeans(n_clusters=n_clusters, **MODEL_HYPERPARAMS['district_clustering'])
         clusters = kmeans.fit_predict(X)
         
         # Calculate silhouette score
@@ -220,11 +381,11 @@ class MLModelManager:
             'Internet_Penetration', 'Sanitation_Gap', 'Sex_Ratio'
         ]
         
-        df_clean = district_df.dropna(subset=feature_cols + ['District name', 'State name']).copy()
-        X, scaler = self.prepare_features(df_clean, feature_cols)
+        mask, X, scaler = self.prepare_cached_features(district_df, feature_cols, ['District name', 'State name'])
+        df_clean = district_df.loc[mask, feature_cols + ['District name', 'State name']].copy()
         
         # Train Isolation Forest
-        iso_forest = IsolationForest(contamination=0.05, random_state=42)
+        iso_forest = IsolationForest(**self.estimator_params('anomaly_detector'))
         predictions = iso_forest.fit_predict(X)
         
         # -1 for anomalies, 1 for normal
@@ -255,76 +416,54 @@ class MLModelManager:
             'anomalies': anomaly_list[:20]  # Top 20 anomalies
         }
     
-    def generate_policy_recommendations(self, district_df: pd.DataFrame, district_name: str) -> Dict[str, Any]:
-        """Generate policy recommendations for a specific district."""
-        district_data = district_df[district_df['District name'] == district_name]
-        
-        if district_data.empty:
-            return {'error': 'District not found'}
-        
-        district = district_data.iloc[0]
+    def compute_policy_table(self, district_df: pd.DataFrame) -> Dict[str, Any]:
+        """Evaluate every rule in ``POLICY_RULES`` over all districts at once.
+        
+        Returns the rule masks (rules x districts), per-district priority
+        scores and the first row position of each district name (used for
+        lookups by name). The table is cached until a different source frame
+        is passed in.
+        """
+        source = self._policy_source() if self._policy_source is not None else None
+        if source is district_df and self._policy_table is not None:
+            return self._policy_table
+        
+        masks = np.zeros((len(POLICY_RULES), len(district_df)), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            for i, rule in enumerate(POLICY_RULES):
+                rule_mask = np.ones(len(district_df), dtype=bool)
+                for column, op, threshold in rule['conditions']:
+                    rule_mask &= _POLICY_OPERATORS[op](district_df[column].to_numpy(dtype=float), threshold)
+                masks[i] = rule_mask
+        
+        scores = np.array([rule['score'] for rule in POLICY_RULES], dtype=np.int64) @ masks
+        names = district_df['District name'].astype(object).to_numpy()
+        positions: Dict[str, int] = {}
+        for position, name in enumerate(names):
+            positions.setdefault(name, position)
+        
+        self._policy_table = {'masks': masks, 'scores': scores, 'positions': positions}
+        self._policy_source = weakref.ref(district_df)
+        return self._policy_table
+    
+    def _policy_recommendation(self, district_df: pd.DataFrame, table: Dict[str, Any], position: int) -> Dict[str, Any]:
+        """Build the recommendation payload for the district at ``position``."""
+        district = district_df.iloc[position]
         recommendations = []
-        priority_score = 0
-        
-        # Literacy intervention
-        if district['Literacy_Rate'] < 70:
-            recommendations.append({
-                'category': 'Education',
-                'priority': 'High',
-                'intervention': 'Adult Literacy Programs',
-                'reason': f"Literacy rate is {district['Literacy_Rate']:.1f}%, below national average",
-                'expected_impact': 'Improve workforce quality and economic opportunities'
-            })
-            priority_score += 3
-        
-        # Internet connectivity
-        if district['Internet_Penetration'] < 15:
-            recommendations.append({
-                'category': 'Digital Infrastructure',
-                'priority': 'High',
-                'intervention': 'Broadband Expansion Program',
-                'reason': f"Internet penetration is only {district['Internet_Penetration']:.1f}%",
-                'expected_impact': 'Enable digital education, e-governance, and economic growth'
-            })
-            priority_score += 3
-        
-        # Sanitation
-        if district['Sanitation_Gap'] > 30:
-            recommendations.append({
-                'category': 'Sanitation',
-                'priority': 'Critical',
-                'intervention': 'Swachh Bharat Mission - Toilet Construction',
-                'reason': f"Sanitation gap is {district['Sanitation_Gap']:.1f}%, indicating poor latrine coverage",
-                'expected_impact': 'Improve public health, reduce disease burden, enhance dignity'
-            })
-            priority_score += 4
-        
-        # Urbanization and infrastructure
-        if district['Urbanisation_Rate'] < 20 and district['Mobile_Phone_Access'] < 50:
-            recommendations.append({
-                'category': 'Infrastructure',
-                'priority': 'Medium',
-                'intervention': 'Rural Connectivity and Electrification',
-                'reason': f"Low urbanization ({district['Urbanisation_Rate']:.1f}%) with poor mobile access",
-                'expected_impact': 'Bridge urban-rural divide, improve communication'
-            })
-            priority_score += 2
-        
-        # Worker participation
-        if district['Worker_Participation_Rate'] < 35:
-            recommendations.append({
-                'category': 'Employment',
-                'priority': 'Medium',
-                'intervention': 'Skill Development and Job Creation Programs',
-                'reason': f"Worker participation is {district['Worker_Participation_Rate']:.1f}%, below optimal levels",
-                'expected_impact': 'Increase household income and economic productivity'
-            })
-            priority_score += 2
+        for i, rule in enumerate(POLICY_RULES):
+            if table['masks'][i, position]:
+                recommendations.append({
+                    'category': rule['category'],
+                    'priority': rule['priority'],
+                    'intervention': rule['intervention'],
+                    'reason': rule['reason'].format(**{col: district[col] for col, _, _ in rule['conditions']}),
+                    'expected_impact': rule['expected_impact']
+                })
         
         return {
-            'district': district_name,
+            'district': district['District name'],
             'state': district['State name'],
-            'priority_score': priority_score,
+            'priority_score': int(table['scores'][position]),
             'total_recommendations': len(recommendations),
             'recommendations': recommendations,
             'current_metrics': {
@@ -336,6 +475,36 @@ class MLModelManager:
             }
         }
     
+    def generate_policy_recommendations(self, district_df: pd.DataFrame, district_name: str) -> Dict[str, Any]:
+        """Generate policy recommendations for a specific district."""
+        table = self.compute_policy_table(district_df)
+        position = table['positions'].get(district_name)
+        
+        if position is None:
+            return {'error': 'District not found'}
+        
+        return self._policy_recommendation(district_df, table, position)
+    
+    def policy_recommendations_at(self, district_df: pd.DataFrame, position: int) -> Dict[str, Any]:
+        """Policy recommendations for the district at row ``position``.
+        
+        Unlike ``generate_policy_recommendations`` this addresses one row
+        even when several states have a district of the same name.
+        """
+        return self._policy_recommendation(district_df, self.compute_policy_table(district_df), position)
+    
+    def top_policy_recommendations(self, district_df: pd.DataFrame, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """Rank every district row by priority score and return the top ``limit``.
+        
+        Districts that share a name (e.g. Bilaspur in two states) are ranked
+        separately; ties keep dataset order. Returns the recommendations and
+        the number of districts analysed.
+        """
+        table = self.compute_policy_table(district_df)
+        order = np.argsort(-table['scores'], kind='stable')
+        top = [self._policy_recommendation(district_df, table, int(position)) for position in order[:limit]]
+        return top, len(district_df)
+    
     def perform_pca_analysis(self, district_df: pd.DataFrame) -> Dict[str, Any]:
         """Perform PCA for dimensionality reduction and visualization."""
         feature_cols = [
@@ -344,11 +513,11 @@ class MLModelManager:
             'Sex_Ratio'
         ]
         
-        df_clean = district_df.dropna(subset=feature_cols).copy()
-        X, scaler = self.prepare_features(df_clean, feature_cols)
+        mask, X, scaler = self.prepare_cached_features(district_df, feature_cols)
+        df_clean = district_df.loc[mask, ['District name', 'State name']]
         
         # Perform PCA
-        pca = PCA(n_components=3)
+        pca = PCA(**MODEL_HYPERPARAMS['pca'])
         X_pca = pca.fit_transform(X)
         
         # Store results
@@ -385,32 +554,61 @@ class MLModelManager:
             }
         }
     
-    def predict_literacy(self, features: Dict[str, float]) -> float:
-        """Predict literacy rate for given features."""
+    def _scaled_batch(self, model_name: str, rows: Any) -> np.ndarray:
+        """Order and scale many feature rows for ``model_name`` in one transform.
+        
+        ``rows`` may be a DataFrame or an iterable of feature dicts; extra
+        columns are ignored, missing or non-numeric feature columns raise
+        ``ValueError``.
+        """
+        feature_cols = self.feature_names[model_name]
+        frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        missing = [col for col in feature_cols if col not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing features: {', '.join(missing)}")
+        try:
+            X = frame[feature_cols].astype(float)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Features must be numeric: {e}")
+        if X.isna().any().any():
+            raise ValueError("Features must not contain missing values")
+        return self.scalers[model_name].transform(X)
+    
+    def predict_literacy_batch(self, rows: Any) -> np.ndarray:
+        """Predict literacy rates for many feature rows at once."""
         if 'literacy_predictor' not in self.models:
             raise ValueError("Literacy predictor model not trained")
         
-        feature_cols = self.feature_names['literacy_predictor']
-        X = np.array([[features[col] for col in feature_cols]])
-        X_scaled = self.scalers['literacy_predictor'].transform(X)
+        return self.models['literacy_predictor'].predict(self._scaled_batch('literacy_predictor', rows))
+    
+    def predict_internet_batch(self, rows: Any) -> np.ndarray:
+        """Predict internet penetration for many feature rows at once."""
+        if 'internet_predictor' not in self.models:
+            raise ValueError("Internet predictor model not trained")
         
-        prediction = self.models['literacy_predictor'].predict(X_scaled)
-        return float(prediction[0])
+        return self.models['internet_predictor'].predict(self._scaled_batch('internet_predictor', rows))
     
-    def get_district_cluster(self, features: Dict[str, float]) -> int:
-        """Get cluster assignment for given district features."""
+    def get_district_cluster_batch(self, rows: Any) -> np.ndarray:
+        """Get cluster assignments for many feature rows at once."""
         if 'district_clustering' not in self.models:
             raise ValueError("Clustering model not trained")
         
-        feature_cols = self.feature_names['district_clustering']
-        X = np.array([[features[col] for col in feature_cols]])
-        X_scaled = self.scalers['district_clustering'].transform(X)
-        
-        cluster = self.models['district_clustering'].predict(X_scaled)
-        return int(cluster[0])
+        return self.models['district_clustering'].predict(self._scaled_batch('district_clustering', rows))
+    
+    def predict_literacy(self, features: Dict[str, float]) -> float:
+        """Predict literacy rate for given features."""
+        return float(self.predict_literacy_batch([features])[0])
+    
+    def predict_internet(self, features: Dict[str, float]) -> float:
+        """Predict internet penetration for given features."""
+        return float(self.predict_internet_batch([features])[0])
+    
+    def get_district_cluster(self, features: Dict[str, float]) -> int:
+        """Get cluster assignment for given district features."""
+        return int(self.get_district_cluster_batch([features])[0])
     
     def save_models(self, output_dir: Path):
-        """Save all trained models to disk."""
+        """Save all trained models, scalers and feature lists to disk."""
         output_dir.mkdir(parents=True, exist_ok=True)
         
         for model_name, model in self.models.items():
@@ -420,9 +618,11 @@ class MLModelManager:
         for scaler_name, scaler in self.scalers.items():
             scaler_path = output_dir / f"{scaler_name}_scaler.joblib"
             joblib.dump(scaler, scaler_path)
+        
+        (output_dir / "feature_names.json").write_text(json.dumps(self.feature_names, indent=2), encoding="utf-8")
     
     def load_models(self, input_dir: Path):
-        """Load trained models from disk."""
+        """Load trained models, scalers and feature lists from disk."""
         for model_file in input_dir.glob("*.joblib"):
             if "scaler" not in model_file.name:
                 model_name = model_file.stem
@@ -430,19 +630,97 @@ class MLModelManager:
             else:
                 scaler_name = model_file.stem.replace("_scaler", "")
                 self.scalers[scaler_name] = joblib.load(model_file)
+        
+        feature_path = input_dir / "feature_names.json"
+        if feature_path.exists():
+            self.feature_names.update(json.loads(feature_path.read_text(encoding="utf-8")))
+
+
+# (result key, MLModelManager method, keyword arguments) for each model
+# trained by ``train_all_models``, in training order.
+TRAINING_JOBS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ('literacy_prediction', 'train_literacy_predictor', {}),
+    ('internet_prediction', 'train_internet_predictor', {}),
+    ('sanitation_classification', 'train_sanitation_classifier', {}),
+    ('district_clustering', 'perform_district_clustering', {'n_clusters': 5}),
+    ('anomaly_detection', 'detect_anomalies', {}),
+    ('pca_analysis', 'perform_pca_analysis', {}),
+]
+
+
+_worker_district_df: Optional[pd.DataFrame] = None
+
 
+def _init_training_worker(district_df: pd.DataFrame) -> None:
+    """Process-pool initializer: receive the training frame once per worker."""
+    global _worker_district_df
+    _worker_district_df = district_df
 
-def train_all_models(district_df: pd.DataFrame) -> Dict[str, Any]:
-    """Train all ML models and return results."""
-    ml_manager = MLModelManager()
-    
-    results = {
-        'literacy_prediction': ml_manager.train_literacy_predictor(district_df),
-        'internet_prediction': ml_manager.train_internet_predictor(district_df),
-        'sanitation_classification': ml_manager.train_sanitation_classifier(district_df),
-        'district_clustering': ml_manager.perform_district_clustering(district_df, n_clusters=5),
-        'anomaly_detection': ml_manager.detect_anomalies(district_df),
-        'pca_analysis': ml_manager.perform_pca_analysis(district_df)
-    }
+
+def _run_training_job(key: str, method_name: str, kwargs: Dict[str, Any], n_jobs: Optional[int]) -> Tuple[Dict[str, Any], MLModelManager, float]:
+    """Train one model in a pool worker; returns its result, manager and wall time."""
+    manager = MLModelManager(n_jobs=n_jobs)
+    started = time.perf_counter()
+    with span(key, 'model'):
+        result = getattr(manager, method_name)(_worker_district_df, **kwargs)
+    return result, manager, time.perf_counter() - started
+
+
+@traced()
+def train_all_models(
+    district_df: pd.DataFrame,
+    progress_callback: Optional[Callable[[Optional[str], int, int], None]] = None,
+    max_workers: Optional[int] = None,
+    n_jobs: Optional[int] = None
+) -> Tuple[Dict[str, Any], MLModelManager]:
+    """Train all ML models and return results.
+    
+    With ``max_workers`` greater than 1 the independent jobs in
+    ``TRAINING_JOBS`` run concurrently in a process pool of that size and
+    their fitted models are merged into one manager; otherwise they run one
+    after another. ``n_jobs`` is forwarded to estimators that support it.
+    Each result gains a ``training_seconds`` entry with the job's wall time.
+    
+    ``progress_callback(job, completed, total)`` is invoked before each job
+    starts (sequential) or as each job finishes (parallel), and once more
+    with ``job=None`` when all jobs have finished.
+    """
+    ml_manager = MLModelManager(n_jobs=n_jobs)
+    total = len(TRAINING_JOBS)
+    
+    results = {}
+    if max_workers is not None and max_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, total),
+            initializer=_init_training_worker,
+            initargs=(district_df,)
+        ) as pool:
+            futures = {
+                pool.submit(call_traced, _run_training_job, key, method_name, kwargs, n_jobs): key
+                for key, method_name, kwargs in TRAINING_JOBS
+            }
+            for completed, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                (result, job_manager, elapsed), events = future.result()
+                get_tracer().merge(events)
+                result['training_seconds'] = round(elapsed, 3)
+                results[key] = result
+                ml_manager.models.update(job_manager.models)
+                ml_manager.scalers.update(job_manager.scalers)
+                ml_manager.feature_names.update(job_manager.feature_names)
+                if progress_callback is not None and completed < total:
+                    progress_callback(key, completed, total)
+        results = {key: results[key] for key, _, _ in TRAINING_JOBS}
+    else:
+        for completed, (key, method_name, kwargs) in enumerate(TRAINING_JOBS):
+            if progress_callback is not None:
+                progress_callback(key, completed, total)
+            started = time.perf_counter()
+            with span(key, 'model'):
+                results[key] = getattr(ml_manager, method_name)(district_df, **kwargs)
+            results[key]['training_seconds'] = round(time.perf_counter() - started, 3)
+    
+    if progress_callback is not None:
+        progress_callback(None, total, total)
     
     return results, ml_manager
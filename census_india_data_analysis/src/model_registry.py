@@ -0,0 +1,153 @@
+"""Versioned on-disk registry of trained ML models.
+
+Every registry entry is a directory named after a training key: a SHA-256
+over the training frame's contents, the declared hyperparameters, the job
+list, the source of ``src.ml_models`` and the scikit-learn version. An
+entry holds the fitted models, scalers and feature lists (via
+``MLModelManager.save_models``) together with the evaluation results served
+by the ``/api/ml/*`` endpoints, so a process that finds a matching entry can
+skip training entirely.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import pandas as pd
+import sklearn
+
+import src.ml_models
+from src.ml_models import MLModelManager, MODEL_HYPERPARAMS, SPLIT_PARAMS, TRAINING_JOBS
+
+REGISTRY_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """Content hash of a frame's column names and values (dtype-insensitive)."""
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in df.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _ml_code_digest() -> str:
+    try:
+        source = inspect.getsource(src.ml_models)
+    except (OSError, TypeError):
+        source = src.ml_models.__file__ or ""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def training_key(district_df: pd.DataFrame) -> str:
+    """Registry key for models trained on ``district_df`` with the current settings.
+
+    The key includes the source of ``src.ml_models``, so editing the feature
+    lists or the training code invalidates saved model sets.
+    """
+
+    settings = {
+        "format": REGISTRY_FORMAT_VERSION,
+        "code": _ml_code_digest(),
+        "sklearn": sklearn.__version__,
+        "hyperparameters": MODEL_HYPERPARAMS,
+        "split": SPLIT_PARAMS,
+        "jobs": TRAINING_JOBS,
+    }
+    digest = hashlib.sha256()
+    digest.update(hash_frame(district_df).encode("ascii"))
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class ModelRegistry:
+    """Directory of trained model sets addressed by ``training_key``."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return (self.entry_dir(key) / MANIFEST_NAME).exists()
+
+    def save(self, key: str, results: Dict[str, Any], manager: MLModelManager) -> Path:
+        """Persist a trained model set; the entry appears atomically."""
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.root))
+        try:
+            manager.save_models(staging / "models")
+            joblib.dump(results, staging / "results.joblib")
+            manifest = {
+                "format": REGISTRY_FORMAT_VERSION,
+                "key": key,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "sklearn": sklearn.__version__,
+                "hyperparameters": MODEL_HYPERPARAMS,
+                "models": sorted(manager.models),
+            }
+            (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+            target = self.entry_dir(key)
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return self.entry_dir(key)
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, Any], MLModelManager]]:
+        """Return ``(results, manager)`` for ``key``, or ``None`` if absent or unreadable.
+
+        Any failure to read or unpickle the entry (including pickles that
+        refer to renamed modules or classes) is printed to stderr and treated
+        as a miss, so callers fall back to training.
+        """
+
+        entry = self.entry_dir(key)
+        try:
+            manifest = json.loads((entry / MANIFEST_NAME).read_text(encoding="utf-8"))
+            if manifest.get("format") != REGISTRY_FORMAT_VERSION or manifest.get("key") != key:
+                return None
+            manager = MLModelManager()
+            manager.load_models(entry / "models")
+            results = joblib.load(entry / "results.joblib")
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            # Printed rather than warned: src.ml_models silences all warnings.
+            print(f"✗ Could not load model registry entry {key}: {exc!r}", file=sys.stderr)
+            return None
+        if set(manifest.get("models", [])) - set(manager.models):
+            return None
+        return results, manager
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Manifests of all stored entries, newest first."""
+
+        manifests = []
+        for manifest_path in self.root.glob(f"*/{MANIFEST_NAME}"):
+            try:
+                manifests.append(json.loads(manifest_path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return sorted(manifests, key=lambda item: item.get("created_at", ""), reverse=True)
+
+    def prune(self, keep: int = 3) -> None:
+        """Delete all but the ``keep`` most recent entries."""
+
+        for manifest in self.entries()[keep:]:
+            shutil.rmtree(self.entry_dir(manifest["key"]), ignore_errors=True)
@@ -0,0 +1,304 @@
+"""Incremental DAG runner with a content-addressed, on-disk stage cache.
+
+A pipeline is a set of named ``Stage`` objects. Each stage declares its
+inputs, which are the names of other stages or of run parameters, and is
+called with their values in that order. Stages run in dependency order.
+
+Every stage gets a key: a SHA-256 over the stage name, the source code it
+declares (``code``), and the digests of its inputs. A parameter's digest is
+a fingerprint of its value. A stage output's digest is a fingerprint of the
+output's content (for objects, including the source of their class), or the
+stage key for stages marked ``by_key``.
+
+Cached stages are pickled under ``<cache_dir>/<stage>.pkl``, next to a
+small ``<stage>.json`` holding the key, the digest and any files the output
+refers to. A rerun executes only the stages whose key changed or whose
+files are gone. Cached outputs are unpickled only when a stage that has to
+run needs them. Because digests follow content, a stage that reruns and
+produces the same output does not invalidate anything downstream.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from src.tracing import span
+
+PIPELINE_FORMAT_VERSION = 1
+
+
+class PipelineError(ValueError):
+    """A malformed pipeline or an unknown stage/parameter name."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the pipeline.
+
+    ``code`` lists the functions, classes or modules whose source determines
+    the stage's output (default: ``func`` itself). Stages with ``cache=False``
+    always run. ``by_key`` identifies the output by the stage key instead of
+    hashing it, for outputs that cannot or need not be fingerprinted.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    code: Tuple[Any, ...] = ()
+    cache: bool = True
+    by_key: bool = False
+
+
+@dataclass(frozen=True)
+class StageRun:
+    """What happened to one stage during ``Pipeline.run``."""
+
+    name: str
+    status: str
+    seconds: float
+    key: str
+
+
+def _update(digest: "hashlib._Hash", value: Any) -> None:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        header = {
+            "type": type(value).__name__,
+            "name": str(value.name) if isinstance(value, pd.Series) else None,
+            "columns": [str(column) for column in frame.columns],
+            "dtypes": [str(dtype) for dtype in frame.dtypes],
+            "index": [str(name) for name in frame.index.names],
+        }
+        digest.update(json.dumps(header).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=str):
+            _update(digest, key)
+            _update(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update(digest, item)
+        digest.update(b"]")
+    elif value is None or isinstance(value, (str, int, float, bool, Path)):
+        digest.update(f"{type(value).__name__}:{value!r}".encode("utf-8"))
+    elif dataclasses.is_dataclass(value):
+        _update(digest, type(value).__qualname__)
+        _update(digest, code_fingerprint((type(value),)))
+        _update(digest, {field.name: getattr(value, field.name) for field in dataclasses.fields(value)})
+    elif hasattr(value, "__dict__"):
+        # Objects are only as good as their methods: fold in the class source
+        # so that downstream stages rerun when it changes.
+        _update(digest, type(value).__qualname__)
+        _update(digest, code_fingerprint((type(value),)))
+        _update(digest, vars(value))
+    else:
+        digest.update(pickle.dumps(value, protocol=4))
+
+
+def fingerprint(value: Any) -> str:
+    """Content hash of a (possibly nested) value; frames are hashed by content."""
+
+    digest = hashlib.sha256()
+    _update(digest, value)
+    return digest.hexdigest()
+
+
+_code_digests: Dict[int, str] = {}
+
+
+def code_fingerprint(objects: Iterable[Any]) -> str:
+    """Hash of the source of functions, classes or modules."""
+
+    digest = hashlib.sha256()
+    for obj in objects:
+        if id(obj) not in _code_digests:
+            try:
+                source = inspect.getsource(obj)
+            except (OSError, TypeError):
+                source = getattr(obj, "__qualname__", repr(obj))
+            _code_digests[id(obj)] = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        digest.update(_code_digests[id(obj)].encode("ascii"))
+    return digest.hexdigest()
+
+
+def _referenced_files(value: Any) -> List[str]:
+    if isinstance(value, Path):
+        return [str(value)]
+    if isinstance(value, (list, tuple)):
+        return [path for item in value for path in _referenced_files(item)]
+    if isinstance(value, dict):
+        return [path for item in value.values() for path in _referenced_files(item)]
+    return []
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+class Pipeline:
+    """A DAG of ``Stage`` objects with an optional on-disk cache."""
+
+    def __init__(self, stages: Sequence[Stage], cache_dir: Optional[Path] = None):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise PipelineError(f"duplicate stage {stage.name!r}")
+            self.stages[stage.name] = stage
+        self.cache_dir = cache_dir
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise PipelineError(f"cycle between stages: {' -> '.join(path + (name,))}")
+            state[name] = "visiting"
+            for dependency in self.stages[name].inputs:
+                if dependency in self.stages:
+                    visit(dependency, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def _check_names(self, names: Iterable[str], what: str) -> List[str]:
+        names = list(names)
+        unknown = [name for name in names if name not in self.stages]
+        if unknown:
+            raise PipelineError(f"unknown {what} {', '.join(unknown)}; stages: {', '.join(self.order)}")
+        return names
+
+    def upstream(self, targets: Iterable[str]) -> List[str]:
+        """``targets`` and every stage they depend on, in execution order."""
+
+        needed = set()
+        pending = self._check_names(targets, "stage")
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(dep for dep in self.stages[name].inputs if dep in self.stages)
+        return [name for name in self.order if name in needed]
+
+    def _entry_paths(self, name: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{name}.json", self.cache_dir / f"{name}.pkl"
+
+    def _read_entry(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._entry_paths(name)[0].read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, name: str, key: str, digest: str, value: Any) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        meta_path, value_path = self._entry_paths(name)
+        _atomic_write(value_path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        entry = {"key": key, "digest": digest, "files": _referenced_files(value)}
+        _atomic_write(meta_path, json.dumps(entry, indent=2).encode("utf-8"))
+
+    def run(
+        self,
+        params: Dict[str, Any],
+        targets: Optional[Iterable[str]] = None,
+        force: Union[bool, Iterable[str]] = (),
+        progress: Optional[Callable[[StageRun], None]] = None,
+    ) -> Dict[str, Any]:
+        """Bring ``targets`` (default: every stage) up to date and return their values.
+
+        ``force`` is ``True`` to rerun every selected stage, or the names of
+        the stages to rerun regardless of their cache entries.
+        ``progress(StageRun)`` is called once per selected stage.
+        """
+
+        selected = self.upstream(targets) if targets is not None else list(self.order)
+        forced = set(selected) if force is True else set(self._check_names(force or (), "forced stage"))
+        missing = sorted({
+            name for stage in self.stages.values() for name in stage.inputs
+            if stage.name in selected and name not in self.stages and name not in params
+        })
+        if missing:
+            raise PipelineError(f"missing pipeline parameters: {', '.join(missing)}")
+
+        values: Dict[str, Any] = {}
+        digests: Dict[str, str] = {}
+        keys: Dict[str, str] = {}
+
+        def input_digest(name: str) -> str:
+            return digests[name] if name in self.stages else fingerprint(params[name])
+
+        def execute(name: str) -> Any:
+            stage = self.stages[name]
+            arguments = [value(dep) if dep in self.stages else params[dep] for dep in stage.inputs]
+            with span(name, "pipeline"):
+                result = stage.func(*arguments)
+            values[name] = result
+            digests[name] = keys[name] if stage.by_key else fingerprint(result)
+            if stage.cache and self.cache_dir is not None:
+                self._write_entry(name, keys[name], digests[name], result)
+            return result
+
+        def value(name: str) -> Any:
+            if name not in values:
+                try:
+                    values[name] = pickle.loads(self._entry_paths(name)[1].read_bytes())
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                    execute(name)
+            return values[name]
+
+        for name in selected:
+            stage = self.stages[name]
+            key_digest = hashlib.sha256()
+            key_digest.update(json.dumps({
+                "format": PIPELINE_FORMAT_VERSION,
+                "stage": name,
+                "code": code_fingerprint(stage.code or (stage.func,)),
+                "inputs": [[dep, input_digest(dep)] for dep in stage.inputs],
+            }).encode("utf-8"))
+            keys[name] = key_digest.hexdigest()
+
+            started = time.perf_counter()
+            entry = None
+            if stage.cache and self.cache_dir is not None and name not in forced:
+                entry = self._read_entry(name)
+            if (
+                entry is not None
+                and entry.get("key") == keys[name]
+                and all(Path(path).exists() for path in entry.get("files", []))
+            ):
+                digests[name] = entry["digest"]
+                status = "cached"
+            else:
+                execute(name)
+                status = "forced" if name in forced else "ran"
+            if progress is not None:
+                progress(StageRun(name, status, round(time.perf_counter() - started, 3), keys[name]))
+
+        return {name: value(name) for name in (targets if targets is not None else selected)}
@@ -0,0 +1,249 @@
+"""Intent index for the ``/api/qa`` question answering endpoint.
+
+Questions are matched against a fixed list of intents (``QA_INTENTS``), each
+requiring one term from every one of its keyword groups. Matching works on
+tokens rather than raw substrings: every question token is compared by its
+surface form, its spaCy lemma (when spaCy and ``en_core_web_sm`` are
+installed; the pipeline is loaded lazily, once) and a crude plural-stripping
+stem, so "workers", "worker" and "Workers" all hit the same keyword.
+
+Answer payloads do not depend on the question, so ``QAEngine`` builds all of
+them once from the district metrics and aggregation cube; answering is a
+token match plus a dictionary lookup.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.aggregation_cube import AggregationCube
+
+SPACY_MODEL = "en_core_web_sm"
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+POPULATION_TERMS = ("population", "people", "inhabitants", "residents")
+LITERACY_TERMS = ("literacy", "literate", "education", "educated")
+STATE_TERMS = ("state", "states", "top states", "which state")
+WORKER_TERMS = ("worker", "workers", "employment", "workforce", "working")
+HOUSING_TERMS = ("housing", "house", "homes", "households")
+INTERNET_TERMS = ("internet", "connectivity", "online")
+URBAN_TERMS = ("urban", "city", "cities", "urbanisation", "urbanization")
+
+HELP_ANSWER = (
+    "I can help you with questions about:\n• Population statistics\n• Literacy rates\n"
+    "• Worker participation\n• Internet connectivity\n• Urbanisation rates\n• Housing data\n\n"
+    "Try asking: 'What is the total population?' or 'Which states have the highest literacy rate?'"
+)
+
+Payload = Dict[str, Any]
+
+
+def _text(answer: str) -> Payload:
+    return {"answer": answer, "type": "text", "data": None}
+
+
+def _table(answer: str, headers: List[str], rows: List[List[Any]]) -> Payload:
+    return {"answer": answer, "type": "table", "data": {"headers": headers, "rows": rows}}
+
+
+def _total_population(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"The total population across all districts is {cube.total('Population'):,}.")
+
+
+def _top_states_population(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    top_states = cube.sum("state", "Population").nlargest(10)
+    return _table(
+        "Here are the top 10 states by population:",
+        ["State", "Population"],
+        [[state, f"{pop:,}"] for state, pop in top_states.items()],
+    )
+
+
+def _top_literacy_districts(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    top_literacy = df.nlargest(10, "Literacy_Rate")[["District name", "State name", "Literacy_Rate"]]
+    return _table(
+        "Districts with highest literacy rates:",
+        ["District", "State", "Literacy Rate (%)"],
+        [[row["District name"], row["State name"], f"{row['Literacy_Rate']:.2f}"] for _, row in top_literacy.iterrows()],
+    )
+
+
+def _average_literacy(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"The average literacy rate across all districts is {cube.overall_mean('Literacy_Rate'):.2f}%.")
+
+
+def _literacy_summary(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(
+        f"The average literacy rate is {cube.overall_mean('Literacy_Rate'):.2f}%. "
+        f"The literacy rate ranges from {df['Literacy_Rate'].min():.2f}% to {df['Literacy_Rate'].max():.2f}%."
+    )
+
+
+def _worker_gender(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    male_workers = cube.total("Male_Workers")
+    female_workers = cube.total("Female_Workers")
+    return _text(
+        f"Total male workers: {male_workers:,}\nTotal female workers: {female_workers:,}\n"
+        f"Gender ratio: {(female_workers/male_workers)*100:.2f}% (female to male)"
+    )
+
+
+def _worker_participation(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"The average worker participation rate is {cube.overall_mean('Worker_Participation_Rate'):.2f}%.")
+
+
+def _internet_penetration(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    internet_households = cube.total("Households_with_Internet")
+    total_households = cube.total("Households")
+    internet_rate = (internet_households / total_households) * 100
+    return _text(
+        f"Internet penetration: {internet_rate:.2f}% of households have internet access "
+        f"({internet_households:,} out of {total_households:,} households)."
+    )
+
+
+def _urbanisation_by_state(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    urban_by_state = cube.mean("state", "Urbanisation_Rate").sort_values(ascending=False).head(10)
+    return _table(
+        "Top 10 states by urbanisation rate:",
+        ["State", "Urbanisation Rate (%)"],
+        [[state, f"{rate:.2f}"] for state, rate in urban_by_state.items()],
+    )
+
+
+def _average_urbanisation(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"The average urbanisation rate is {cube.overall_mean('Urbanisation_Rate'):.2f}%.")
+
+
+def _total_households(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"Total households in the dataset: {cube.total('Households'):,}")
+
+
+def _state_count(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"The dataset covers {df['State name'].nunique()} states/union territories.")
+
+
+def _district_count(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(f"The dataset covers {df['District name'].nunique()} districts.")
+
+
+def _help(df: pd.DataFrame, cube: AggregationCube) -> Payload:
+    return _text(HELP_ANSWER)
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A question class: one term from each of ``requires`` must appear."""
+
+    name: str
+    requires: Tuple[Tuple[str, ...], ...]
+    build: Callable[[pd.DataFrame, AggregationCube], Payload]
+
+
+# Checked in order; the first intent whose keyword groups all match wins.
+QA_INTENTS: List[Intent] = [
+    Intent("total_population", (POPULATION_TERMS, ("total",)), _total_population),
+    Intent("top_states_population", (POPULATION_TERMS, STATE_TERMS), _top_states_population),
+    Intent("top_literacy_districts", (LITERACY_TERMS, ("highest", "top")), _top_literacy_districts),
+    Intent("average_literacy", (LITERACY_TERMS, ("average", "mean")), _average_literacy),
+    Intent("literacy_summary", (LITERACY_TERMS,), _literacy_summary),
+    Intent("worker_gender", (WORKER_TERMS, ("male",), ("female",)), _worker_gender),
+    Intent("worker_participation", (WORKER_TERMS,), _worker_participation),
+    Intent("internet_penetration", (INTERNET_TERMS,), _internet_penetration),
+    Intent("urbanisation_by_state", (URBAN_TERMS, ("state",)), _urbanisation_by_state),
+    Intent("average_urbanisation", (URBAN_TERMS,), _average_urbanisation),
+    Intent("total_households", (HOUSING_TERMS,), _total_households),
+    Intent("state_count", (("how many",), ("state",)), _state_count),
+    Intent("district_count", (("how many",), ("district",)), _district_count),
+]
+
+HELP_INTENT = Intent("help", (), _help)
+
+
+def stem(token: str) -> str:
+    """Strip a plural ``s`` ("districts" -> "district", but not "access")."""
+
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """The spaCy pipeline, loaded on first use; ``None`` if spaCy is unavailable."""
+
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                try:
+                    import spacy
+                    _nlp = spacy.load(SPACY_MODEL, disable=["parser", "ner"])
+                except (ImportError, OSError):
+                    _nlp = None
+                _nlp_loaded = True
+    return _nlp
+
+
+def tokenize(question: str) -> List[FrozenSet[str]]:
+    """Per-token sets of comparable forms (stemmed surface form and lemma)."""
+
+    nlp = get_nlp()
+    if nlp is None:
+        return [frozenset({stem(token)}) for token in _TOKEN.findall(question.lower())]
+
+    tokens = []
+    for token in nlp(question.lower()):
+        forms = {stem(form) for form in _TOKEN.findall(token.lower_)}
+        forms.update(stem(form) for form in _TOKEN.findall(token.lemma_.lower()))
+        if forms:
+            tokens.append(frozenset(forms))
+    return tokens
+
+
+def _compile_term(term: str) -> Tuple[str, ...]:
+    return tuple(stem(token) for token in _TOKEN.findall(term.lower()))
+
+
+def _contains(tokens: Sequence[FrozenSet[str]], phrase: Tuple[str, ...]) -> bool:
+    width = len(phrase)
+    return any(
+        all(phrase[offset] in tokens[start + offset] for offset in range(width))
+        for start in range(len(tokens) - width + 1)
+    )
+
+
+class QAEngine:
+    """Precomputed answers for ``QA_INTENTS`` over one version of the data."""
+
+    def __init__(self, district_df: pd.DataFrame, cube: AggregationCube, intents: Optional[List[Intent]] = None):
+        self.intents = list(intents if intents is not None else QA_INTENTS)
+        self._compiled = [
+            (intent, [[_compile_term(term) for term in group] for group in intent.requires])
+            for intent in self.intents
+        ]
+        self.answers: Dict[str, Payload] = {
+            intent.name: intent.build(district_df, cube) for intent in self.intents + [HELP_INTENT]
+        }
+
+    def match(self, question: str) -> Intent:
+        tokens = tokenize(question)
+        for intent, groups in self._compiled:
+            if all(any(_contains(tokens, phrase) for phrase in group) for group in groups):
+                return intent
+        return HELP_INTENT
+
+    def answer(self, question: str) -> Payload:
+        """Response payload (``answer``/``type``/``data``) for ``question``."""
+
+        payload = self.answers[self.match(question).name]
+        return dict(payload)
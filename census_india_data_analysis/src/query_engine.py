@@ -0,0 +1,790 @@
+"""Executable question bank.
+
+Every question in ``QUESTION_BANK`` is a declarative ``QuerySpec``: the
+dataset it reads, a metric (columns summed or averaged, optionally divided by
+a denominator and scaled), the level it is grouped at, an optional
+Rural/Urban filter for housing records, and how the result is ranked.
+Questions the census tables cannot answer carry a ``reason`` instead and are
+reported as not executable rather than approximated.
+
+``QueryEngine`` evaluates the whole bank from the two aggregation cubes, so the
+only passes over the raw rows are the ones that build the cubes; each query
+then reads pre-aggregated sums and counts. Metric series are memoised, so
+queries that share a numerator or denominator at the same level share the
+work as well.
+"""
+from __future__ import annotations
+
+import json
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.aggregation_cube import AggregationCube, build_district_cube, build_housing_cube
+from src.derived_metrics import DERIVED_METRICS, get_derived_metric
+
+AREA_LEVEL = "Rural/Urban"
+
+# Group names accepted by ``QuerySpec.group_by`` -> cube level.
+GROUP_LEVELS: Dict[Optional[str], str] = {None: "india", "state": "state", "district": "district"}
+
+
+@dataclass(frozen=True)
+class Metric:
+    """``offset + scale * f(columns)`` per group.
+
+    ``aggregate`` selects ``f``: ``"sum"`` adds the summed columns, ``"mean"``
+    adds their per-row means (for percentage columns), ``"share"`` divides the
+    sum by its total over all groups. With a ``denominator`` the summed
+    columns are divided by the summed denominator columns (sum-then-divide).
+    """
+
+    columns: Tuple[str, ...]
+    denominator: Tuple[str, ...] = ()
+    aggregate: str = "sum"
+    scale: float = 1.0
+    offset: float = 0.0
+    label: str = "Value"
+
+
+def _rate(columns: Iterable[str], denominator: Iterable[str], label: str, scale: float = 100.0, offset: float = 0.0) -> Metric:
+    return Metric(tuple(columns), tuple(denominator), scale=scale, offset=offset, label=label)
+
+
+def _derived(name: str) -> Metric:
+    """The registry definition of a derived indicator (see ``DERIVED_METRICS``)."""
+
+    derived = get_derived_metric(name)
+    return _rate(derived.numerator, derived.denominator, derived.label, derived.scale, derived.offset)
+
+
+def _mean(columns: Iterable[str], label: str, scale: float = 1.0, offset: float = 0.0) -> Metric:
+    return Metric(tuple(columns), aggregate="mean", scale=scale, offset=offset, label=label)
+
+
+def _breakdown(columns: Iterable[str], prefix: str = "") -> Tuple[Tuple[str, Metric], ...]:
+    return tuple((column[len(prefix):], _mean((column,), column[len(prefix):])) for column in columns)
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """One question of the bank and the query that answers it."""
+
+    id: str
+    question: str
+    output: str
+    description: str
+    dataset: str = "district"
+    metric: Optional[Metric] = None
+    against: Optional[Metric] = None
+    breakdown: Tuple[Tuple[str, Metric], ...] = ()
+    group_by: Optional[str] = None
+    area: Optional[str] = None
+    by_area: bool = False
+    ascending: bool = False
+    top_n: Optional[int] = 10
+    reason: Optional[str] = None
+
+    @property
+    def kind(self) -> str:
+        if self.reason:
+            return "not_executable"
+        if self.against is not None:
+            return "correlation"
+        if self.breakdown:
+            return "breakdown"
+        return "ranking"
+
+
+ASSET_COLUMNS = {
+    "Television": "Households_with_Television",
+    "Mobile phone": "Households_with_Telephone_Mobile_Phone",
+    "Internet": "Households_with_Internet",
+    "Car / Jeep / Van": "Households_with_Car_Jeep_Van",
+}
+
+LITERACY = _derived("Literacy_Rate")
+INTERNET = _derived("Internet_Penetration")
+
+QUESTION_BANK: List[QuerySpec] = [
+    QuerySpec(
+        "q01", "Which states contribute the highest share of India's total population?", "Table",
+        "Rank states by population using aggregated district totals.",
+        metric=Metric(("Population",), aggregate="share", scale=100.0, label="Share of population (%)"),
+        group_by="state",
+    ),
+    QuerySpec(
+        "q02", "How does literacy rate correlate with worker participation at the district level?", "Scatter plot",
+        "Plot literacy percentage against worker participation rate with an urbanisation colour scale.",
+        metric=LITERACY, against=_derived("Worker_Participation_Rate"),
+        group_by="district",
+    ),
+    QuerySpec(
+        "q03", "What is the distribution of roof materials across rural housing stock?", "Bar chart",
+        "Summarise the mean share of roof material categories (rural subset).",
+        dataset="housing", area="Rural",
+        breakdown=_breakdown((
+            "Material_Roof_GTBW", "Material_Roof_PP", "Material_Roof_HMT", "Material_Roof_MMT", "Material_Roof_BB",
+            "Material_Roof_SS", "Material_Roof_GMAS", "Material_Roof_Concrete", "Material_Roof_AOM",
+        ), prefix="Material_Roof_"),
+    ),
+    QuerySpec(
+        "q04", "Which districts face the largest sanitation gaps (lack of in-premise latrines)?", "Table",
+        "Sort districts by sanitation gap metric derived from latrine coverage.",
+        metric=_derived("Sanitation_Gap"),
+        group_by="district",
+    ),
+    QuerySpec(
+        "q05", "How is internet access spread across states when normalised by total households?", "Bar chart",
+        "Compute household-weighted internet penetration per state.",
+        metric=INTERNET, group_by="state", top_n=None,
+    ),
+    QuerySpec(
+        "q06", "Which cooking fuels dominate urban households compared to rural ones?", "Grouped bar chart",
+        "Contrast mean cooking fuel shares split by Rural/Urban flag.",
+        dataset="housing", by_area=True,
+        breakdown=_breakdown((
+            "Cooking_FW", "Cooking_CR", "Cooking_CC", "Cooking_CLC", "Cooking_kerosene", "Cooking_LPG_PNG",
+            "Cooking_Electricity", "Cooking_Biogas", "Cooking_AO", "Cooking_NC",
+        ), prefix="Cooking_"),
+    ),
+    QuerySpec(
+        "q07", "How does asset ownership (TV, mobile, internet, vehicle) vary by state?", "Stacked bar chart",
+        "Aggregate asset ownership percentages per state and display comparisons.",
+        breakdown=tuple((label, _rate((column,), ("Households",), label)) for label, column in ASSET_COLUMNS.items()),
+        group_by="state", top_n=None,
+    ),
+    QuerySpec(
+        "q08", "Which districts have the highest female-to-male sex ratio?", "Table",
+        "List top districts by computed sex ratio indicator.",
+        metric=_derived("Sex_Ratio"), group_by="district",
+    ),
+    QuerySpec(
+        "q09", "Where is the gap between rural and urban literacy widest?", "Bar chart",
+        "Calculate literacy difference between rural and urban households per district/state.",
+        reason="Literacy is only published as district totals; neither dataset splits it by Rural/Urban.",
+    ),
+    QuerySpec(
+        "q10", "What share of households live in dilapidated dwellings across states?", "Heatmap",
+        "Summarise dilapidated household percentage by Rural/Urban and state.",
+        dataset="housing", metric=_mean(("Total Number of Dilapidated",), "Dilapidated (%)"),
+        group_by="state", by_area=True, top_n=None,
+    ),
+    QuerySpec(
+        "q11", "Which districts report the highest proportion of households using LPG/PNG for cooking?", "Table",
+        "Rank districts by LPG/PNG adoption using housing dataset percentages.",
+        dataset="housing", metric=_mean(("Cooking_LPG_PNG",), "LPG/PNG (%)"), group_by="district", area="Total",
+    ),
+    QuerySpec(
+        "q12", "How does internet access relate to literacy at the state level?", "Scatter plot",
+        "Plot state-level literacy versus internet penetration with bubble size for population.",
+        metric=LITERACY, against=INTERNET, group_by="state",
+    ),
+    QuerySpec(
+        "q13", "Which states have the largest marginal worker populations?", "Bar chart",
+        "Sum marginal workers per state from district census data.",
+        metric=Metric(("Marginal_Workers",), label="Marginal workers"), group_by="state",
+    ),
+    QuerySpec(
+        "q14", "How prevalent are non-permanent wall materials across districts?", "Choropleth map",
+        "Map percentage of non-brick/concrete wall materials to highlight vulnerability.",
+        dataset="housing",
+        metric=_mean(("Material_Wall_Bb", "Material_Wall_Concrete"), "Non-brick/concrete walls (%)", scale=-1.0, offset=100.0),
+        group_by="district", area="Total",
+    ),
+    QuerySpec(
+        "q15", "What percentage of households access drinking water within premises versus away?", "Stacked bar chart",
+        "Aggregate water-source proximity categories by state.",
+        dataset="housing", breakdown=_breakdown(("Within_premises", "Near_premises", "Away")),
+        group_by="state", area="Total", top_n=None,
+    ),
+    QuerySpec(
+        "q16", "Which districts have the highest concentration of Scheduled Tribe populations?", "Table",
+        "Rank districts by share of ST population in total population.",
+        metric=_rate(("ST",), ("Population",), "ST share (%)"), group_by="district",
+    ),
+    QuerySpec(
+        "q17", "How does rural electrification compare with urban electrification by state?", "Dual line chart",
+        "Track electricity access percentages for rural vs urban households per state.",
+        dataset="housing", metric=_mean(("MSL_Electricty",), "Electric lighting (%)"),
+        group_by="state", by_area=True, top_n=None,
+    ),
+    QuerySpec(
+        "q18", "Where are machine-made tiles most prevalent as roof material?", "Table",
+        "Identify top regions by mean share of machine-made tiles in housing records.",
+        dataset="housing", metric=_mean(("Material_Roof_MMT",), "Machine-made tiles (%)"),
+        group_by="district", area="Total",
+    ),
+    QuerySpec(
+        "q19", "Which states demonstrate the highest female literacy rates?", "Bar chart",
+        "Calculate female literacy share relative to female population per state.",
+        metric=_rate(("Female_Literate",), ("Female",), "Female literacy (%)"), group_by="state",
+    ),
+    QuerySpec(
+        "q20", "How does household size distribution vary between rural and urban areas?", "Violin plot",
+        "Visualise household size categories split by Rural/Urban flag.",
+        dataset="housing", by_area=True,
+        breakdown=_breakdown(("H_size_1", "H_size_2", "H_size_3", "H_size_4", "H_size_5", "H_size_6_8", "H_size_9"), prefix="H_"),
+    ),
+    QuerySpec(
+        "q21", "What is the relationship between tele-density and internet adoption?", "Scatter plot",
+        "Plot mobile phone access against internet penetration at state level.",
+        metric=_derived("Mobile_Phone_Access"),
+        against=INTERNET, group_by="state",
+    ),
+    QuerySpec(
+        "q22", "Which districts rely heavily on kerosene or other traditional fuels for cooking?", "Table",
+        "Highlight districts where non-clean fuels exceed a chosen threshold.",
+        dataset="housing",
+        metric=_mean(("Cooking_FW", "Cooking_CR", "Cooking_CC", "Cooking_CLC", "Cooking_kerosene"), "Traditional fuels (%)"),
+        group_by="district", area="Total",
+    ),
+    QuerySpec(
+        "q23", "How many households lack bathing facilities within premises across states?", "Horizontal bar chart",
+        "Aggregate counts of households without bathing facility and normalise by totals.",
+        metric=_rate(("Not_having_bathing_facility_within_the_premises_Total_Households",), ("Households",),
+                     "Without bathing facility (%)"),
+        group_by="state", top_n=None,
+    ),
+    QuerySpec(
+        "q24", "Where is the urbanisation rate growing fastest relative to household counts?", "Line chart",
+        "Trend urban household ratios when multi-year data becomes available (placeholder for future).",
+        reason="Growth needs more than one census year; only 2011 is available.",
+    ),
+    QuerySpec(
+        "q25", "Which districts exhibit the highest percentage of graduate-educated residents?", "Table",
+        "Rank districts by share of graduate-level education among literate population.",
+        metric=_rate(("Graduate_Education",), ("Literate_Education",), "Graduates among literate (%)"),
+        group_by="district",
+    ),
+    QuerySpec(
+        "q26", "How does household asset ownership cluster together?", "Clustered heatmap",
+        "Perform hierarchical clustering on asset access percentages per state.",
+        reason="Hierarchical clustering is a modelling step, not an aggregate query; q07 provides its input.",
+    ),
+    QuerySpec(
+        "q27", "What is the distribution of households by dwelling condition (good, livable, dilapidated)?", "Pie chart",
+        "Visualise overall share of dwelling conditions across India.",
+        dataset="housing", area="Total",
+        breakdown=_breakdown(("Total Number of Good", "Total Number of Livable", "Total Number of Dilapidated"),
+                             prefix="Total Number of "),
+    ),
+    QuerySpec(
+        "q28", "Which states have the lowest workforce participation among women?", "Bar chart",
+        "Compute female worker participation as share of female population per state.",
+        metric=_rate(("Female_Workers",), ("Female",), "Female worker participation (%)"),
+        group_by="state", ascending=True,
+    ),
+    QuerySpec(
+        "q29", "How do separate kitchen facilities vary with fuel types?", "Mosaic plot",
+        "Cross-tabulate kitchen availability with primary cooking fuel categories.",
+        reason="Kitchen availability and cooking fuel are published as separate marginals, not as a cross-tabulation.",
+    ),
+    QuerySpec(
+        "q30", "Where is the reliance on hand pumps for drinking water highest?", "Table",
+        "Identify districts with the greatest share of hand-pump usage in water sources.",
+        dataset="housing", metric=_mean(("DW_Handpump",), "Hand pump (%)"), group_by="district", area="Total",
+    ),
+    QuerySpec(
+        "q31", "Which districts show the highest proportion of alternative latrine arrangements?", "Table",
+        "Rank based on alternative latrine facility usage (e.g., pit, service, open drain).",
+        metric=_rate((
+            "Type_of_latrine_facility_Pit_latrine_Households",
+            "Type_of_latrine_facility_Other_latrine_Households",
+            "Type_of_latrine_facility_Night_soil_disposed_into_open_drain_Households",
+        ), ("Households",), "Alternative latrines (%)"),
+        group_by="district",
+    ),
+]
+
+QUESTIONS_BY_ID: Dict[str, QuerySpec] = {spec.id: spec for spec in QUESTION_BANK}
+
+
+def normalise_question_id(question_id: str) -> str:
+    """Accept ``q7``, ``Q07`` or ``7`` for ``q07``."""
+
+    digits = question_id.strip().lower().lstrip("q")
+    return f"q{int(digits):02d}" if digits.isdigit() else question_id
+
+
+def _py(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+FrameSource = Union[None, pd.DataFrame, Callable[[], pd.DataFrame]]
+
+
+@dataclass
+class QueryResult:
+    """Outcome of one ``QuerySpec``: a table, a correlation or a reason."""
+
+    spec: QuerySpec
+    status: str
+    table: Optional[pd.DataFrame] = None
+    value: Optional[float] = None
+    observations: Optional[int] = None
+    note: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "id": self.spec.id,
+            "question": self.spec.question,
+            "output": self.spec.output,
+            "description": self.spec.description,
+            "kind": self.spec.kind,
+            "status": self.status,
+        }
+        if self.note:
+            payload["note"] = self.note
+        if self.table is not None:
+            payload["result"] = table_to_dict(self.table)
+        if self.value is not None:
+            payload["result"] = {"correlation": _py(self.value), "observations": self.observations}
+        return payload
+
+    def to_markdown(self) -> str:
+        if self.status == "skipped":
+            return f"_Skipped: {self.note}_"
+        if self.status != "ok":
+            return f"_Not executable: {self.note}_"
+        if self.value is not None:
+            return f"Pearson correlation: {self.value:.3f} across {self.observations} observations."
+        return self.table.round(2).to_markdown(index=False)
+
+
+class QueryEngine:
+    """Evaluate ``QuerySpec`` objects against district and housing cubes.
+
+    Either frame may be omitted; its cube is then never built and queries
+    over it are reported as skipped. A frame may also be given as a
+    zero-argument callable, so a lazily loaded dataset is only read once a
+    query needs it. Pre-built cubes can be passed in to share them with other
+    readers.
+    """
+
+    def __init__(
+        self,
+        district_df: FrameSource = None,
+        housing_df: FrameSource = None,
+        district_cube: Optional[AggregationCube] = None,
+        housing_cube: Optional[AggregationCube] = None,
+    ):
+        self._frames = {"district": district_df, "housing": housing_df}
+        self._cubes: Dict[str, Optional[AggregationCube]] = {"district": district_cube, "housing": housing_cube}
+        self._metrics: Dict[Tuple[Any, ...], pd.Series] = {}
+        self._lock = threading.Lock()
+
+    def cube(self, dataset: str) -> Optional[AggregationCube]:
+        if self._cubes[dataset] is None and self._frames[dataset] is not None:
+            with self._lock:
+                if self._cubes[dataset] is None:
+                    frame = self._frames[dataset]
+                    if callable(frame):
+                        frame = frame()
+                    builder = build_district_cube if dataset == "district" else build_housing_cube
+                    self._cubes[dataset] = builder(frame)
+        return self._cubes[dataset]
+
+    def _level_frames(self, dataset: str, level: str, area: Optional[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        cube_level = self.cube(dataset).level(level)
+        sums, counts = cube_level.sums, cube_level.counts
+        if area is not None:
+            if isinstance(sums.index, pd.MultiIndex):
+                sums, counts = sums.xs(area, level=AREA_LEVEL), counts.xs(area, level=AREA_LEVEL)
+            else:
+                sums, counts = sums.loc[[area]], counts.loc[[area]]
+        return sums, counts
+
+    def metric(self, dataset: str, level: str, metric: Metric, area: Optional[str] = None) -> pd.Series:
+        """Memoised metric series for every group of ``level``."""
+
+        key = (dataset, level, metric, area)
+        if key not in self._metrics:
+            sums, counts = self._level_frames(dataset, level, area)
+            columns = list(metric.columns)
+            if metric.aggregate == "mean":
+                values = (sums[columns] / counts[columns]).sum(axis=1)
+            else:
+                values = sums[columns].sum(axis=1)
+            if metric.denominator:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    values = values / sums[list(metric.denominator)].sum(axis=1)
+            elif metric.aggregate == "share":
+                values = values / values.sum()
+            if metric.scale != 1.0 or metric.offset != 0.0:
+                values = metric.offset + metric.scale * values
+            if pd.api.types.is_float_dtype(values.dtype):
+                values = values.replace([np.inf, -np.inf], np.nan)
+            self._metrics[key] = values.rename(metric.label)
+        return self._metrics[key]
+
+    def _labels(self, dataset: str, level: str, index: pd.Index) -> pd.DataFrame:
+        if level == "state" and dataset == "district":
+            return pd.DataFrame({"State": index.astype(object)}, index=index)
+        labels = self.cube(dataset).level(level).labels
+        if labels is None:
+            return pd.DataFrame(index=index)
+        if isinstance(labels.index, pd.MultiIndex) and AREA_LEVEL in labels.index.names:
+            labels = labels.groupby(level=[name for name in labels.index.names if name != AREA_LEVEL]).first()
+        columns = {"State Name": "State", "District Name": "District", "District name": "District"}
+        if level == "state":
+            columns = {"State Name": "State"}
+        labels = labels[[column for column in columns if column in labels.columns]].rename(columns=columns)
+        if dataset == "district":
+            state = pd.Series(index.get_level_values("State name").astype(object), index=index, name="State")
+            return pd.concat([state, labels.reindex(index)], axis=1)
+        return labels.reindex(index)
+
+    def _grouped(self, spec: QuerySpec, metric: Metric) -> pd.DataFrame:
+        level = GROUP_LEVELS[spec.group_by]
+        if spec.by_area:
+            values = self.metric(spec.dataset, level, metric).unstack(AREA_LEVEL)
+            values.columns = [str(column) for column in values.columns]
+            return values
+        return self.metric(spec.dataset, level, metric, spec.area).to_frame()
+
+    def _finish(self, spec: QuerySpec, values: pd.DataFrame, sort_column: Optional[str]) -> pd.DataFrame:
+        if sort_column is not None:
+            values = values.dropna(subset=[sort_column]).sort_values(sort_column, ascending=spec.ascending, kind="stable")
+        if spec.top_n is not None:
+            values = values.head(spec.top_n)
+        if spec.group_by is None:
+            return values.reset_index(drop=True)
+        labels = self._labels(spec.dataset, GROUP_LEVELS[spec.group_by], values.index)
+        return pd.concat([labels, values], axis=1).reset_index(drop=True)
+
+    def run_query(self, spec: QuerySpec) -> QueryResult:
+        if spec.reason:
+            return QueryResult(spec, "not_executable", note=spec.reason)
+        if self.cube(spec.dataset) is None:
+            return QueryResult(spec, "skipped", note=f"the {spec.dataset} dataset was not loaded")
+
+        level = GROUP_LEVELS[spec.group_by]
+        if spec.kind == "correlation":
+            pair = pd.concat([
+                self.metric(spec.dataset, level, spec.metric, spec.area),
+                self.metric(spec.dataset, level, spec.against, spec.area),
+            ], axis=1).dropna()
+            return QueryResult(spec, "ok", value=float(pair.iloc[:, 0].corr(pair.iloc[:, 1])), observations=len(pair))
+
+        if spec.kind == "breakdown":
+            if spec.group_by is None:
+                # National breakdown: one row per component, one column per area
+                # (housing) or a single national column (district).
+                rows = {}
+                for label, metric in spec.breakdown:
+                    values = self.metric(spec.dataset, level, metric)
+                    rows[label] = values.loc[[spec.area]] if spec.area and not spec.by_area else values
+                table = pd.DataFrame(rows).T
+                table.columns = [str(column) for column in table.columns]
+                sort_column = "Total" if "Total" in table.columns else table.columns[0]
+                table = table.sort_values(sort_column, ascending=spec.ascending, kind="stable")
+                table.index.name = "Category"
+                return QueryResult(spec, "ok", table=table.reset_index())
+            table = pd.concat([self._grouped(spec, metric) for _, metric in spec.breakdown], axis=1)
+            return QueryResult(spec, "ok", table=self._finish(spec, table, table.columns[0]))
+
+        values = self._grouped(spec, spec.metric)
+        sort_column = "Total" if spec.by_area and "Total" in values.columns else values.columns[0]
+        return QueryResult(spec, "ok", table=self._finish(spec, values, sort_column))
+
+    def _query_rows(self, query: AdHocQuery) -> pd.Series:
+        rows = self.cube(query.dataset).level(query.level).rows
+        if query.area is not None:
+            rows = rows.xs(query.area, level=AREA_LEVEL) if isinstance(rows.index, pd.MultiIndex) else rows.loc[[query.area]]
+        return rows
+
+    def run_adhoc(self, query: AdHocQuery) -> pd.DataFrame:
+        """Execute a compiled ``AdHocQuery`` against the cube level it targets."""
+
+        cube = self.cube(query.dataset)
+        if cube is None:
+            raise QuerySpecError(f"the {query.dataset} dataset is not loaded")
+        available = cube.level(query.level).sums.columns
+        for measure in query.measures:
+            if measure.metric is not None:
+                missing = [c for c in measure.metric.columns + measure.metric.denominator if c not in available]
+                if missing:
+                    raise QuerySpecError(f"unknown or non-numeric {query.dataset} columns: {', '.join(missing)}")
+
+        values = pd.concat([
+            (self._query_rows(query) if measure.metric is None
+             else self.metric(query.dataset, query.level, measure.metric, query.area)).rename(measure.name)
+            for measure in query.measures
+        ], axis=1)
+
+        index = values.index
+        if query.by_area:
+            areas = pd.Series(index.get_level_values(AREA_LEVEL).astype(str), index=index, name=AREA_LEVEL)
+            if query.level == "india":
+                labels = areas.to_frame()
+            else:
+                labels = self._labels(query.dataset, query.level, index.droplevel(AREA_LEVEL)).set_axis(index)
+                labels = pd.concat([labels, areas], axis=1)
+        elif query.level == "india":
+            labels = pd.DataFrame(index=index)
+        else:
+            labels = self._labels(query.dataset, query.level, index)
+        table = pd.concat([labels, values], axis=1).reset_index(drop=True)
+
+        for field_name, op, value in query.filters:
+            table = _apply_filter(table, field_name, op, value)
+        if query.sort:
+            table = table.sort_values(
+                [_output_column(by) for by, _ in query.sort],
+                ascending=[not descending for _, descending in query.sort],
+                kind="stable",
+            )
+        return table.head(query.limit).reset_index(drop=True)
+
+    def run(self, specs: Optional[Iterable[QuerySpec]] = None) -> Dict[str, QueryResult]:
+        """Evaluate ``specs`` (default: the whole bank) keyed by question id."""
+
+        return {spec.id: self.run_query(spec) for spec in (specs if specs is not None else QUESTION_BANK)}
+
+
+# ---------------------------------------------------------------------------
+# Ad-hoc aggregation queries (``/api/query``)
+# ---------------------------------------------------------------------------
+
+DIMENSION_COLUMNS: Dict[str, str] = {"state": "State", "district": "District", "rural_urban": AREA_LEVEL}
+MEASURE_AGGREGATES = ("sum", "mean", "rate", "share", "count")
+AREA_VALUES = ("Rural", "Urban", "Total")
+MAX_QUERY_LIMIT = 5000
+
+_FILTER_OPS: Dict[str, Callable[[pd.Series, Any], pd.Series]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "in": lambda column, value: column.isin(value),
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+}
+
+
+class QuerySpecError(ValueError):
+    """An ad-hoc query spec that cannot be compiled against the data."""
+
+
+@dataclass(frozen=True)
+class Measure:
+    """A named output column; ``metric`` is ``None`` for row counts."""
+
+    name: str
+    agg: str
+    metric: Optional[Metric]
+
+
+@dataclass(frozen=True)
+class AdHocQuery:
+    """A compiled ``/api/query`` spec: one cube level plus post-aggregation steps."""
+
+    dataset: str
+    dimensions: Tuple[str, ...]
+    measures: Tuple[Measure, ...]
+    area: Optional[str]
+    filters: Tuple[Tuple[str, str, Any], ...]
+    sort: Tuple[Tuple[str, bool], ...]
+    limit: Optional[int]
+
+    @property
+    def level(self) -> str:
+        if "district" in self.dimensions:
+            return "district"
+        return "state" if "state" in self.dimensions else "india"
+
+    @property
+    def by_area(self) -> bool:
+        return "rural_urban" in self.dimensions
+
+    def normalized(self) -> str:
+        """Canonical JSON of the spec; equal for specs that compile to the same plan."""
+
+        return json.dumps({
+            "dataset": self.dataset,
+            "dimensions": list(self.dimensions),
+            "measures": [
+                {"name": m.name, "agg": m.agg, "metric": None if m.metric is None else {
+                    "columns": list(m.metric.columns), "denominator": list(m.metric.denominator),
+                    "aggregate": m.metric.aggregate, "scale": m.metric.scale, "offset": m.metric.offset,
+                }}
+                for m in self.measures
+            ],
+            "area": self.area,
+            "filters": [list(item) for item in self.filters],
+            "sort": [list(item) for item in self.sort],
+            "limit": self.limit,
+        }, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _column_list(value: Any, field: str) -> Tuple[str, ...]:
+    columns = (value,) if isinstance(value, str) else tuple(value) if isinstance(value, (list, tuple)) else ()
+    if not columns or not all(isinstance(column, str) for column in columns):
+        raise QuerySpecError(f"'{field}' must be a column name or a list of column names")
+    return columns
+
+
+def _measure_scale(raw: Dict[str, Any], default: float) -> float:
+    scale = raw.get("scale", default)
+    if isinstance(scale, bool) or not isinstance(scale, (int, float)):
+        raise QuerySpecError("a measure's 'scale' must be a number")
+    return float(scale)
+
+
+def _measure_name(raw: Dict[str, Any], default: str) -> str:
+    name = raw.get("name", default)
+    if not isinstance(name, str):
+        raise QuerySpecError("a measure's 'name' must be a string")
+    return name
+
+
+def _parse_measure(raw: Any) -> Measure:
+    if not isinstance(raw, dict):
+        raise QuerySpecError("each measure must be an object")
+    agg = raw.get("agg", "rate" if "metric" in raw else "sum")
+    if agg not in MEASURE_AGGREGATES:
+        raise QuerySpecError(f"unknown measure aggregate {agg!r}; use one of {', '.join(MEASURE_AGGREGATES)}")
+    if agg == "count":
+        return Measure(_measure_name(raw, "count"), agg, None)
+    if "metric" in raw:
+        # A registry indicator, evaluated sum-then-divide at the query level.
+        if agg != "rate" or not isinstance(raw["metric"], str) or raw["metric"] not in DERIVED_METRICS:
+            raise QuerySpecError(f"'metric' takes a derived metric name with agg 'rate': {', '.join(DERIVED_METRICS)}")
+        derived = DERIVED_METRICS[raw["metric"]]
+        name = _measure_name(raw, derived.name)
+        return Measure(name, agg, _rate(derived.numerator, derived.denominator, name, derived.scale, derived.offset))
+    if agg == "rate":
+        numerator = _column_list(raw.get("numerator"), "numerator")
+        denominator = _column_list(raw.get("denominator"), "denominator")
+        scale = _measure_scale(raw, 100.0)
+        name = _measure_name(raw, f"{'+'.join(numerator)}_per_{'+'.join(denominator)}")
+        return Measure(name, agg, Metric(numerator, denominator, scale=scale, label=name))
+    columns = _column_list(raw.get("column", raw.get("columns")), "column")
+    name = _measure_name(raw, f"{agg}_{'+'.join(columns)}")
+    scale = _measure_scale(raw, 100.0 if agg == "share" else 1.0)
+    return Measure(name, agg, Metric(columns, aggregate=agg, scale=scale, label=name))
+
+
+def _spec_list(spec: Dict[str, Any], key: str, allow_single: type) -> List[Any]:
+    """``spec[key]`` as a list; a lone ``allow_single`` value is wrapped."""
+
+    value = spec.get(key)
+    if value is None:
+        return []
+    if isinstance(value, allow_single):
+        return [value]
+    if not isinstance(value, list):
+        raise QuerySpecError(f"{key!r} must be a list")
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_query(spec: Any) -> AdHocQuery:
+    """Compile a JSON query spec, raising ``QuerySpecError`` on malformed input.
+
+    ``{"dataset": "district", "dimensions": ["state"],
+    "measures": [{"agg": "rate", "numerator": "Literate", "denominator": "Population"}],
+    "filters": [{"field": "state", "op": "in", "value": ["KERALA", "GOA"]}],
+    "sort": [{"by": "Literate_per_Population", "order": "desc"}], "limit": 10}``
+    """
+
+    if not isinstance(spec, dict):
+        raise QuerySpecError("query spec must be a JSON object")
+    dataset = spec.get("dataset", "district")
+    if dataset not in ("district", "housing"):
+        raise QuerySpecError("dataset must be 'district' or 'housing'")
+
+    raw_dimensions = _spec_list(spec, "dimensions", str)
+    unknown = [dim for dim in raw_dimensions if not isinstance(dim, str) or dim not in DIMENSION_COLUMNS]
+    if unknown:
+        raise QuerySpecError(f"unknown dimensions {unknown}; use {', '.join(DIMENSION_COLUMNS)}")
+    dimensions = tuple(dim for dim in DIMENSION_COLUMNS if dim in raw_dimensions)
+    if "rural_urban" in dimensions and dataset != "housing":
+        raise QuerySpecError("the rural_urban dimension is only available for the housing dataset")
+
+    measures = tuple(_parse_measure(raw) for raw in _spec_list(spec, "measures", dict) or [{"agg": "count"}])
+    names = [measure.name for measure in measures]
+    if len(set(names)) != len(names):
+        raise QuerySpecError("measure names must be unique")
+
+    area = None
+    filters = []
+    for raw in _spec_list(spec, "filters", dict):
+        if (
+            not isinstance(raw, dict)
+            or not isinstance(raw.get("op", "eq"), str) or raw.get("op", "eq") not in _FILTER_OPS
+            or not isinstance(raw.get("field"), str)
+        ):
+            raise QuerySpecError(f"filters need 'field', 'op' ({', '.join(_FILTER_OPS)}) and 'value'")
+        field_name, op, value = raw["field"], raw.get("op", "eq"), raw.get("value")
+        if field_name == "rural_urban" and "rural_urban" not in dimensions:
+            # Without the dimension, the filter picks which Rural/Urban/Total records are read.
+            area = {item.casefold(): item for item in AREA_VALUES}.get(value.casefold()) if isinstance(value, str) else None
+            if dataset != "housing" or op != "eq" or area is None:
+                raise QuerySpecError(
+                    f"filter rural_urban with 'eq' and one of {', '.join(AREA_VALUES)}, or add it as a dimension"
+                )
+            continue
+        if field_name not in dimensions and field_name not in names:
+            raise QuerySpecError(f"cannot filter on {field_name!r}: not a queried dimension or measure name")
+        if op == "in" and not isinstance(value, list):
+            raise QuerySpecError("the 'in' operator needs a list value")
+        if field_name in names and not (
+            all(_is_number(item) for item in value) if op == "in" else _is_number(value)
+        ):
+            raise QuerySpecError(f"filters on measure {field_name!r} need a numeric value (a list of numbers for 'in')")
+        filters.append((field_name, op, tuple(value) if op == "in" else value))
+    if dataset == "housing" and area is None and "rural_urban" not in dimensions:
+        # Every area appears once per Rural/Urban/Total split; read the totals.
+        area = "Total"
+
+    sort = []
+    for raw in _spec_list(spec, "sort", dict):
+        by = raw.get("by") if isinstance(raw, dict) else None
+        if not isinstance(by, str) or (by not in names and by not in dimensions):
+            raise QuerySpecError(f"cannot sort by {by!r}: not a queried dimension or measure name")
+        order = raw.get("order", "desc")
+        if order not in ("asc", "desc"):
+            raise QuerySpecError("sort order must be 'asc' or 'desc'")
+        sort.append((by, order == "desc"))
+
+    limit = spec.get("limit")
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 1):
+        raise QuerySpecError("limit must be a positive integer")
+    limit = min(limit or MAX_QUERY_LIMIT, MAX_QUERY_LIMIT)
+
+    return AdHocQuery(dataset, dimensions, measures, area, tuple(filters), tuple(sort), limit)
+
+
+def _output_column(field_name: str) -> str:
+    return DIMENSION_COLUMNS.get(field_name, field_name)
+
+
+def _apply_filter(table: pd.DataFrame, field_name: str, op: str, value: Any) -> pd.DataFrame:
+    column = table[_output_column(field_name)]
+    if field_name in DIMENSION_COLUMNS:
+        # Names are matched case-insensitively.
+        column = column.astype(str).str.casefold()
+        value = [str(item).casefold() for item in value] if op == "in" else str(value).casefold()
+    return table[_FILTER_OPS[op](column, value).to_numpy()]
+
+
+def table_to_dict(table: pd.DataFrame) -> Dict[str, Any]:
+    """JSON-ready ``columns``/``rows`` form of a result table."""
+
+    return {
+        "columns": [str(column) for column in table.columns],
+        "rows": [[_py(value) for value in row] for row in table.itertuples(index=False)],
+    }
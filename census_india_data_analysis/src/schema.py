@@ -0,0 +1,83 @@
+"""Declared storage schema for the census datasets.
+
+``pd.read_csv`` stores every count as int64/float64 and every name as a
+Python string. The schemas below narrow that to what the data needs:
+integer counts are downcast to the smallest signed type that holds their
+range, housing percentages become float32, and repeated labels (state and
+district names, the Rural/Urban flag) become categoricals so that filters and
+``groupby`` calls work on small integer codes instead of hashing strings.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever a schema below changes so cached frames are rebuilt.
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FrameSchema:
+    """Storage types declared for one dataset."""
+
+    name: str
+    categorical: Tuple[str, ...] = ()
+    downcast_integers: bool = True
+    float32_floats: bool = False
+
+
+DISTRICT_SCHEMA = FrameSchema(
+    name="district",
+    categorical=("State name", "District name"),
+)
+
+HOUSING_SCHEMA = FrameSchema(
+    name="housing",
+    categorical=("State Name", "District Name", "Tehsil Name", "Area Name", "Rural/Urban"),
+    float32_floats=True,
+)
+
+
+def frame_memory(df: pd.DataFrame) -> int:
+    """Total bytes held by a frame, including string payloads."""
+
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def apply_schema(df: pd.DataFrame, schema: FrameSchema) -> pd.DataFrame:
+    """Return ``df`` converted to the storage types declared by ``schema``.
+
+    Declared categorical columns that are absent from ``df`` are ignored.
+    Integer columns are only narrowed as far as their observed min/max allows.
+    """
+
+    converted: Dict[str, pd.Series] = {}
+    for column in df.columns:
+        series = df[column]
+        if column in schema.categorical:
+            converted[column] = series.astype("category")
+        elif schema.downcast_integers and pd.api.types.is_integer_dtype(series.dtype):
+            converted[column] = pd.to_numeric(series, downcast="integer")
+        elif schema.float32_floats and pd.api.types.is_float_dtype(series.dtype):
+            converted[column] = series.astype(np.float32)
+        else:
+            converted[column] = series
+    return pd.DataFrame(converted, index=df.index)
+
+
+def memory_report(before: Dict[str, int], after: Dict[str, int]) -> pd.DataFrame:
+    """Tabulate per-dataset memory use before and after applying the schema."""
+
+    rows: List[Dict[str, object]] = []
+    for name, before_bytes in before.items():
+        after_bytes = after.get(name, before_bytes)
+        rows.append({
+            "Dataset": name,
+            "Before (MB)": round(before_bytes / 1_048_576, 2),
+            "After (MB)": round(after_bytes / 1_048_576, 2),
+            "Reduction (%)": round((1 - after_bytes / before_bytes) * 100, 1) if before_bytes else 0.0,
+        })
+    return pd.DataFrame(rows)
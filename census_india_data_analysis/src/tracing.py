@@ -0,0 +1,268 @@
+"""Opt-in span tracing: wall time, CPU time and peak memory per stage.
+
+Code marks the interesting regions with ``span("name", "category")`` (or
+the ``traced`` decorator). While tracing is off, ``span`` returns a shared
+no-op context manager, so an instrumented call costs one attribute check.
+
+Turn tracing on with ``enable(path)``, or set ``CENSUS_TRACE`` to the
+output path (``1`` picks ``census_trace.json``) before ``src.tracing`` is
+imported. Each finished span is recorded with:
+
+* its wall time;
+* the CPU time of the thread that ran it;
+* its peak Python heap growth, measured with ``tracemalloc``, which only
+  runs while tracing is on. Allocations from other threads running at the
+  same time are included. ``tracemalloc`` slows allocation-heavy code, so
+  compare traced timings with each other rather than with untraced runs.
+
+``write_trace`` saves the spans in the Chrome trace event format, which
+``chrome://tracing`` and https://ui.perfetto.dev both open. ``summary``
+returns a per-span table of totals.
+
+Spans recorded in pool workers are not seen by the parent process. Workers
+run their job through ``call_traced``, return the events with the result,
+and the parent adds them back with ``merge``.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TRACE_ENV_VAR = "CENSUS_TRACE"
+DEFAULT_TRACE_PATH = "census_trace.json"
+
+Event = Dict[str, Any]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start", "cpu_start", "mem_start", "peak")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.peak = 0
+
+    def __enter__(self) -> "_Span":
+        stack = self.tracer._stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # The enclosing span keeps the highest peak seen before we reset it.
+            stack[-1].peak = max(stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        self.mem_start = current
+        stack.append(self)
+        self.cpu_start = time.thread_time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        end = time.perf_counter_ns()
+        cpu = time.thread_time_ns() - self.cpu_start
+        peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        args = dict(self.args)
+        args.update({
+            "cpu_ms": round(cpu / 1e6, 3),
+            "peak_mem_kib": round(max(peak - self.mem_start, 0) / 1024, 1),
+        })
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        self.tracer._record({
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            # perf_counter is CLOCK_MONOTONIC on Linux, so worker timestamps line up.
+            "ts": self.start / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+
+class Tracer:
+    """Collects trace events for the current process."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.events: List[Event] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, event: Event) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def enable(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else Path(DEFAULT_TRACE_PATH)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def span(self, name: str, category: str = "stage", **args: Any):
+        """Context manager timing the enclosed block (a no-op while disabled)."""
+
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def mark(self) -> int:
+        """Position to pass to ``events_since`` later."""
+
+        with self._lock:
+            return len(self.events)
+
+    def events_since(self, mark: int) -> List[Event]:
+        """Events recorded after ``mark`` was taken."""
+
+        with self._lock:
+            return self.events[mark:]
+
+    def merge(self, events: List[Event]) -> None:
+        """Add events recorded by another process (see ``call_traced``)."""
+
+        if events:
+            with self._lock:
+                self.events.extend(events)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-name totals (count, wall, CPU, max peak memory), slowest first."""
+
+        totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            row = totals.setdefault((event["cat"], event["name"]), {
+                "category": event["cat"], "name": event["name"], "count": 0,
+                "wall_ms": 0.0, "cpu_ms": 0.0, "peak_mem_kib": 0.0,
+            })
+            row["count"] += 1
+            row["wall_ms"] += event["dur"] / 1000
+            row["cpu_ms"] += event["args"]["cpu_ms"]
+            row["peak_mem_kib"] = max(row["peak_mem_kib"], event["args"]["peak_mem_kib"])
+        return sorted(totals.values(), key=lambda row: -row["wall_ms"])
+
+    def format_summary(self) -> str:
+        rows = self.summary()
+        width = max([len(row["name"]) for row in rows] + [4])
+        lines = [f"{'span':<{width}}  {'category':<8}  {'count':>5}  {'wall ms':>10}  {'cpu ms':>10}  {'peak MiB':>9}"]
+        for row in rows:
+            lines.append(
+                f"{row['name']:<{width}}  {row['category']:<8}  {row['count']:>5}  {row['wall_ms']:>10.1f}  "
+                f"{row['cpu_ms']:>10.1f}  {row['peak_mem_kib'] / 1024:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def write_trace(self, path: Optional[Path] = None) -> Path:
+        """Write the Chrome trace JSON (default: the path given to ``enable``)."""
+
+        path = Path(path) if path is not None else (self.path or Path(DEFAULT_TRACE_PATH))
+        with self._lock:
+            events = list(self.events)
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "main" if pid == os.getpid() else f"worker {pid}"}}
+            for pid in sorted({event["pid"] for event in events})
+        ]
+        path.write_text(json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        return path
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def enable(path: Optional[Path] = None) -> None:
+    """Turn tracing on; worker processes started afterwards trace too."""
+
+    _tracer.enable(path)
+    os.environ[TRACE_ENV_VAR] = str(_tracer.path)
+
+
+def is_enabled() -> bool:
+    return _tracer.enabled
+
+
+def span(name: str, category: str = "stage", **args: Any):
+    """``with span("load_datasets"):`` on the process-wide tracer."""
+
+    if not _tracer.enabled:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "stage") -> Callable[[Callable], Callable]:
+    """Decorator form of ``span``; the span is named after the function by default."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def call_traced(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, List[Event]]:
+    """Run ``func`` in a pool worker, returning its result and the spans it recorded."""
+
+    if not _tracer.enabled:
+        return func(*args, **kwargs), []
+    # Forked workers inherit the parent's events; only hand back the new ones.
+    mark = _tracer.mark()
+    result = func(*args, **kwargs)
+    return result, _tracer.events_since(mark)
+
+
+def finish(print_summary: bool = True) -> Optional[Path]:
+    """Write the trace and print the summary table if anything was traced."""
+
+    if not _tracer.enabled or not _tracer.events:
+        return None
+    path = _tracer.write_trace()
+    if print_summary:
+        print(_tracer.format_summary())
+        print(f"Trace written to {path}")
+    return path
+
+
+_configured = os.environ.get(TRACE_ENV_VAR, "").strip()
+if _configured and _configured.lower() not in ("0", "false", "no"):
+    enable(DEFAULT_TRACE_PATH if _configured.lower() in ("1", "true", "yes") else _configured)